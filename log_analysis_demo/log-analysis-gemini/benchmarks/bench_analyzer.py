@@ -0,0 +1,214 @@
+# filepath: log-analysis-gemini/benchmarks/bench_analyzer.py
+"""
+End-to-end benchmark of the LogAnalyzer hot path on synthetic 5G logs.
+Each size runs in a fresh process (so peak RSS is per size). The benchmark
+reports the best-of-N time per stage (read, classify, context, save, prompt
+build), lines/s, MB/s and peak RSS as JSON.
+Usage: python benchmarks/bench_analyzer.py [--sizes 1MB,10MB,100MB] [--error-rate 0.01]
+       [--seed 42] [--scanner stream] [--format json] [--output results.json]
+       [--baseline previous.json --tolerance 0.15]
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from generate_logs import generate_log, parse_size
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+# Stages compared against a baseline; the rest are reported only
+COMPARED_STAGES = ("read", "classify", "context", "save", "prompt_build", "total")
+MIN_COMPARED_SECONDS = 0.05  # Shorter stages are too noisy to flag
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def dataset_path(size_bytes, error_rate, seed):
+    """Generate (once) and return the synthetic log file for these parameters."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"synthetic-{size_bytes}-{error_rate}-{seed}.log")
+    if not os.path.exists(path):
+        generate_log(path + ".tmp", size_bytes, error_rate, seed)
+        os.replace(path + ".tmp", path)
+    return path
+
+def run_one(log_file_path, scanner, output_format, context_lines, repeat=3):
+    """Measure every stage on one file in this process (best of `repeat` runs) and return the result dict."""
+    from analyzer import LogAnalyzer
+
+    analyzer = LogAnalyzer()
+    runs = [measure_stages(analyzer, log_file_path, scanner, output_format, context_lines) for _ in range(repeat)]
+    stages = {
+        name: min(run["stages"][name] for run in runs) if runs[0]["stages"][name] is not None else None
+        for name in runs[0]["stages"]
+    }
+    result = runs[0]["counts"]
+    file_bytes = os.path.getsize(log_file_path)
+    scan = stages["scan"]
+    result.update({
+        "file_bytes": file_bytes,
+        "stages": {name: (round(seconds, 4) if seconds is not None else None) for name, seconds in stages.items()},
+        "lines_per_second": round(result["lines"] / scan) if scan else None,
+        "mb_per_second": round(file_bytes / (1024 * 1024) / scan, 2) if scan else None,
+        "peak_rss_mb": peak_rss_mb()
+    })
+    return result
+
+def measure_stages(analyzer, log_file_path, scanner, output_format, context_lines):
+    from clustering import cluster_errors
+    from log_sources import open_log_text
+
+    stages = {}
+
+    # read: decode and split lines only
+    start = time.perf_counter()
+    with open_log_text(log_file_path) as file:
+        line_count = sum(1 for _ in file)
+    stages["read"] = time.perf_counter() - start
+
+    # classify: read + error matching on every line
+    is_error_line = analyzer._is_error_line
+    start = time.perf_counter()
+    with open_log_text(log_file_path) as file:
+        matches = sum(1 for line in file if is_error_line(line.rstrip('\n\r')))
+    read_and_classify = time.perf_counter() - start
+    stages["classify"] = max(read_and_classify - stages["read"], 0.0)
+
+    # context: the full scanner (read + classify + context windows + records)
+    start = time.perf_counter()
+    if scanner == "stream":
+        errors = list(analyzer.iter_errors(log_file_path, context_lines))
+    else:
+        errors = list(analyzer._scan_errors(log_file_path, context_lines, 1, scanner))
+    scan = time.perf_counter() - start
+    stages["scan"] = scan
+    stages["context"] = max(scan - read_and_classify, 0.0) if scanner == "stream" else None
+
+    data = {"total_errors_found": len(errors), "log_file": log_file_path, "errors": errors}
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        save_result = analyzer._save_results(data, output_format, output_dir)
+        stages["save"] = time.perf_counter() - start
+        if "error" in save_result:
+            raise RuntimeError(save_result["error"])
+
+    start = time.perf_counter()
+    clusters = cluster_errors(errors)
+    llm_input = analyzer.build_llm_input(data, clusters, max_chars=400000)
+    stages["prompt_build"] = time.perf_counter() - start
+
+    stages["total"] = stages["scan"] + stages["save"] + stages["prompt_build"]
+    return {
+        "stages": stages,
+        "counts": {
+            "lines": line_count,
+            "errors": len(errors),
+            "matched_lines": matches,
+            "clusters": len(clusters),
+            "prompt_chars": llm_input["chars"]
+        }
+    }
+
+def compare(results, baseline, tolerance):
+    """List stages that got slower than the baseline by more than `tolerance` (a fraction)."""
+    previous = {result["size"]: result for result in baseline.get("results", [])}
+    regressions = []
+    for result in results:
+        old = previous.get(result["size"])
+        if not old:
+            continue
+        for stage in COMPARED_STAGES:
+            new_seconds = result["stages"].get(stage)
+            old_seconds = old["stages"].get(stage)
+            if not new_seconds or not old_seconds or old_seconds < MIN_COMPARED_SECONDS:
+                continue
+            if new_seconds > old_seconds * (1 + tolerance):
+                regressions.append({
+                    "size": result["size"],
+                    "stage": stage,
+                    "baseline_seconds": old_seconds,
+                    "seconds": new_seconds,
+                    "slowdown": round(new_seconds / old_seconds, 2)
+                })
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LogAnalyzer on synthetic 5G logs.")
+    parser.add_argument("--sizes", default="1MB,10MB,100MB", help="Comma-separated file sizes (1MB up to 10GB)")
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scanner", default="stream", choices=["stream", "mmap", "index"])
+    parser.add_argument("--format", default="json", help="Output format timed in the save stage")
+    parser.add_argument("--context-lines", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the fastest time per stage is kept")
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="Earlier results file to check for regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown per stage (0.15 = 15%%)")
+    parser.add_argument("--run-one", help=argparse.SUPPRESS)  # Internal: benchmark one file in this process
+    args = parser.parse_args()
+
+    if args.run_one:
+        print(json.dumps(run_one(args.run_one, args.scanner, args.format, args.context_lines, args.repeat)))
+        return
+
+    results = []
+    for size in args.sizes.split(","):
+        log_file_path = dataset_path(parse_size(size), args.error_rate, args.seed)
+        print(f"Benchmarking {size} ({os.path.basename(log_file_path)})", file=sys.stderr)
+        completed = subprocess.run(
+            [sys.executable, __file__, "--run-one", log_file_path, "--scanner", args.scanner,
+             "--format", args.format, "--context-lines", str(args.context_lines), "--repeat", str(args.repeat)],
+            check=True, capture_output=True, text=True
+        )
+        result = {"size": size.strip()}
+        result.update(json.loads(completed.stdout))
+        results.append(result)
+
+    report = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scanner": args.scanner,
+            "format": args.format,
+            "context_lines": args.context_lines,
+            "repeat": args.repeat,
+            "error_rate": args.error_rate,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            report["regressions"] = compare(results, json.load(f), args.tolerance)
+        for regression in report["regressions"]:
+            print(f"REGRESSION {regression['size']} {regression['stage']}: {regression['baseline_seconds']}s -> "
+                  f"{regression['seconds']}s ({regression['slowdown']}x)", file=sys.stderr)
+        exit_code = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    sys.exit(exit_code)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# filepath: log-analysis-gemini/benchmarks/bench_matchers.py
+"""
+Micro-benchmark for the error line matchers.
+Usage: python benchmarks/bench_matchers.py [log_file] [repeat]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from matchers import MATCHERS
+
+def load_lines(log_file_path):
+    with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as file:
+        return [line.rstrip('\n\r') for line in file]
+
+def main():
+    default_log = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+    log_file_path = sys.argv[1] if len(sys.argv) > 1 else default_log
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    lines = load_lines(log_file_path)
+    print(f"Benchmarking {len(lines)} lines from {os.path.basename(log_file_path)} ({repeat} runs)")
+
+    baseline = None
+    reference = None
+    for name in MATCHERS:
+        try:
+            is_error_line = LogAnalyzer(matcher=name)._is_error_line
+        except ImportError as e:
+            print(f"  {name:<14} skipped ({e})")
+            continue
+
+        results = [is_error_line(line) for line in lines]
+        if reference is None:
+            reference = results
+        elif results != reference:
+            print(f"  {name:<14} MISMATCH against substring matcher")
+            continue
+
+        best = min(timeit.repeat(lambda: [is_error_line(line) for line in lines], number=1, repeat=repeat))
+        ns_per_line = best / max(len(lines), 1) * 1e9
+        if baseline is None:
+            baseline = ns_per_line
+        print(f"  {name:<14} {ns_per_line:8.1f} ns/line  ({baseline / ns_per_line:.2f}x vs substring)")
+
+if __name__ == "__main__":
+    main()
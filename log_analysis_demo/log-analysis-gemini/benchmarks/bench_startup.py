@@ -0,0 +1,89 @@
+# filepath: log-analysis-gemini/benchmarks/bench_startup.py
+"""
+Startup-time benchmark of the command line entry point.
+Times, in fresh processes: the bare interpreter, importing the CLI modules,
+and a full `start.py <log> --no-llm` run on a small log. It also lists the
+slowest imports (from python -X importtime). Reports best and median
+milliseconds as JSON; run it on two commits to compare them.
+Usage: python benchmarks/bench_startup.py [--log logs/simulator_test.txt] [--repeat 20] [--output startup.json]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+DEFAULT_LOG = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+IMPORT_CLI = f"import sys; sys.path.insert(0, {SRC_DIR!r}); import start"
+
+def time_command(command, repeat, env=None):
+    """Run `command` `repeat` times; returns best and median wall time in ms, or the error of a failed run."""
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        completed = subprocess.run(command, capture_output=True, text=True, env=env, stdin=subprocess.DEVNULL)
+        seconds.append(time.perf_counter() - start)
+        if completed.returncode != 0:
+            return {"error": (completed.stderr.strip().splitlines() or ["exit status %d" % completed.returncode])[-1]}
+    return {
+        "best_ms": round(min(seconds) * 1000, 1),
+        "median_ms": round(statistics.median(seconds) * 1000, 1)
+    }
+
+def slowest_imports(limit=15):
+    """Top modules by cumulative import time (microseconds) when importing the CLI."""
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", IMPORT_CLI],
+                               capture_output=True, text=True)
+    imports = []
+    for line in completed.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports.append({"module": module.strip(), "cumulative_us": int(cumulative)})
+    imports.sort(key=lambda entry: entry["cumulative_us"], reverse=True)
+    return imports[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark CLI startup time.")
+    parser.add_argument("--log", default=DEFAULT_LOG, help="Small log file for the full-run measurement")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write the JSON results here instead of stdout")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        # Keep the run's output files (and any .env API key) away from the real output directory
+        env = dict(os.environ, ANALYSIS_OUTPUT_PATH=os.path.join(output_dir, "report.txt"))
+        report = {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "log": os.path.abspath(args.log),
+                "repeat": args.repeat
+            },
+            "results": {
+                "interpreter": time_command([sys.executable, "-c", "pass"], args.repeat),
+                "import_cli": time_command([sys.executable, "-c", IMPORT_CLI], args.repeat),
+                "run_no_llm": time_command(
+                    [sys.executable, os.path.join(SRC_DIR, "start.py"), args.log, "--no-llm"], args.repeat, env
+                )
+            },
+            "slowest_imports": slowest_imports()
+        }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# filepath: log-analysis-gemini/benchmarks/generate_logs.py
+"""
+Seeded generator of synthetic 5G core (SMF/AMF/UPF/PCF) logs for benchmarks.
+The same seed, size and error rate always produce the same file.
+Usage: python benchmarks/generate_logs.py OUTPUT --size 100MB [--error-rate 0.01]
+       [--seed 42] [--nf SMF] [--start "2025-09-04 08:00:00"] [--lines-per-second 20]
+"""
+
+import argparse
+import gzip
+import os
+import random
+import re
+from datetime import datetime, timedelta, timezone
+
+SIZE_UNITS = {"": 1, "B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+NORMAL_MESSAGES = [
+    ("INFO", "{nf} Session created for UE: imsi-{imsi}, PDU session ID: {session}"),
+    ("INFO", "PDU Session successfully established for UE: imsi-{imsi}"),
+    ("INFO", "Registration accepted for UE: imsi-{imsi}"),
+    ("DEBUG", "Allocated TEID=0x{teid:x} for uplink GTP tunnel"),
+    ("DEBUG", "Allocated IP: {ip} for UE: imsi-{imsi}"),
+    ("DEBUG", "Heartbeat message sent to UPF node upf{node}"),
+    ("DEBUG", "Heartbeat response received from UPF node upf{node}"),
+    ("DEBUG", "UE: imsi-{imsi} requested session, ID: {session}"),
+    ("NOTICE", "QoS flow {session} bound to 5QI 9 for UE: imsi-{imsi}"),
+    ("WARNING", "High error rate detected on N4 interface, retrying"),
+    ("WARNING", "Session ID: {session} released after inactivity timer expiry"),
+]
+
+ERROR_MESSAGES = [
+    ("ERROR", "Failed to allocate IP address from pool {pool}"),
+    ("ERROR", "GTP tunnel establishment failed for UE: imsi-{imsi}, TEID allocation timeout"),
+    ("ERROR", "AMF connection lost during session establishment for UE: imsi-{imsi}"),
+    ("ERROR", "Database connection timeout during session update for UE: imsi-{imsi}"),
+    ("ERROR", "UPF node upf{node} unresponsive, connection timeout after 30 seconds"),
+    ("ERROR", "Policy enforcement failed for UE: imsi-{imsi}, PCF unreachable"),
+    ("CRITICAL", "PFCP association with UPF {ip} lost"),
+    ("FATAL", "{nf} process crashed: Segmentation fault in session handler"),
+    ("ERROR", "N2 message decode failure from gNB ID: 0x{teid:x} Exception: malformed IE"),
+]
+
+def parse_size(text):
+    """Parse sizes like 512KB, 100MB or 10GB into bytes."""
+    match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMG]?B?)\s*', text.upper())
+    if not match:
+        raise ValueError(f"Invalid size: {text}")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+def _render_messages(rng, templates, count, network_function):
+    """Pre-render `count` "[LEVEL] message" strings with random IMSIs, TEIDs, IPs, ..."""
+    pools = ["10.1.0.0/16", "10.2.0.0/16", "10.45.0.0/16"]
+    messages = []
+    for _ in range(count):
+        level, template = rng.choice(templates)
+        messages.append(f"[{level}] " + template.format(
+            nf=network_function,
+            imsi=f"00101{rng.randrange(10 ** 10):010d}",
+            session=rng.randrange(1, 100000),
+            teid=rng.randrange(1 << 32),
+            ip=f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+            node=rng.randrange(1, 5),
+            pool=rng.choice(pools)
+        ))
+    return messages
+
+def generate_log(output_path, size_bytes, error_rate=0.01, seed=42, network_function="SMF",
+                 start="2025-09-04 08:00:00", lines_per_second=20):
+    """
+    Write about `size_bytes` of log lines (never stopping mid-line); a `.gz`
+    path is gzip-compressed. About `error_rate` of the lines are errors.
+    Messages are drawn from pre-rendered pools so multi-GB files are quick
+    to produce. Returns the number of lines written.
+    """
+    rng = random.Random(seed)
+    normal_messages = _render_messages(rng, NORMAL_MESSAGES, 4096, network_function)
+    error_messages = _render_messages(rng, ERROR_MESSAGES, 1024, network_function)
+    timestamp = datetime.strptime(start, "%Y-%m-%d %H:%M:%S").replace(tzinfo=timezone.utc)
+    prefix = f"{timestamp:%Y-%m-%d %H:%M:%S} "
+    opener = gzip.open if output_path.endswith(".gz") else open
+    random_value = rng.random
+    next_second = 1.0 / lines_per_second
+
+    written = 0
+    line_count = 0
+    with opener(output_path, 'wt', encoding='utf-8', newline='\n') as file:
+        while written < size_bytes:
+            batch = []
+            for _ in range(10000):
+                # Several lines share each second, as in the simulator logs
+                if random_value() < next_second:
+                    timestamp += timedelta(seconds=1)
+                    prefix = f"{timestamp:%Y-%m-%d %H:%M:%S} "
+                messages = error_messages if random_value() < error_rate else normal_messages
+                line = prefix + messages[int(random_value() * len(messages))] + "\n"
+                batch.append(line)
+                written += len(line)
+                if written >= size_bytes:
+                    break
+            file.write("".join(batch))
+            line_count += len(batch)
+    return line_count
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic 5G core log file.")
+    parser.add_argument("output", help="Output path (.gz to compress)")
+    parser.add_argument("--size", default="10MB", help="Approximate uncompressed size, e.g. 1MB, 10GB")
+    parser.add_argument("--error-rate", type=float, default=0.01, help="Fraction of error lines")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--nf", default="SMF", help="Network function name used in messages")
+    parser.add_argument("--start", default="2025-09-04 08:00:00", help="Timestamp of the first line")
+    parser.add_argument("--lines-per-second", type=int, default=20)
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    line_count = generate_log(args.output, parse_size(args.size), args.error_rate, args.seed,
+                              args.nf, args.start, args.lines_per_second)
+    print(f"Wrote {line_count} lines to {args.output}")
+
+if __name__ == "__main__":
+    main()
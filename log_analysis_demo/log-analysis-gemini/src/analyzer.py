@@ -1,10 +1,111 @@
 import json
-import csv
+import hashlib
+import mmap
 import os
+from array import array
 from collections import deque
+from itertools import islice
+from columnar import write_columnar, write_parquet
+from entities import EntityIndex
+from line_index import default_index_path, load_or_build_index
+from log_formats import detect_file_format, get_log_format, read_sample_lines
+from log_sources import is_compressed, open_log_text
+from matchers import create_matcher
+from metrics import Metrics
+from prompt_builder import assemble_prompt, severity_of
+from records import ErrorRecord, record_to_json
+from result_writers import STREAMING_WRITERS, CsvWriter
+from signatures import error_signature
+from timestamps import extract_timestamp
+
+def _decode_lines(raw_line):
+    """Decode one newline-terminated byte line, splitting on lone '\\r' the way text mode does."""
+    text = raw_line.decode('utf-8', errors='ignore')
+    if text.endswith('\n'):
+        text = text[:-1]
+    if text.endswith('\r'):
+        text = text[:-1]
+    if '\r' in text:
+        return text.split('\r')
+    return [text]
+
+def _decode_raw_line(raw_line):
+    """Decode one line of bytes without its newline (used by the mmap scanner)."""
+    line = raw_line.decode('utf-8', errors='ignore')
+    return line[:-1] if line.endswith('\r') else line
+
+def _read_lines_before(file, start, context_lines):
+    """Read up to `context_lines` decoded lines ending at byte offset `start` (a line boundary)."""
+    if start == 0 or context_lines == 0:
+        return []
+
+    data = b''
+    position = start
+    while position > 0 and data.count(b'\n') <= context_lines:
+        block_size = min(64 * 1024, position)
+        position -= block_size
+        file.seek(position)
+        data = file.read(block_size) + data
+
+    raw_lines = data.split(b'\n')[:-1]
+    if position > 0:
+        raw_lines = raw_lines[1:]  # First piece may be a partial line
+
+    lines = [line for raw_line in raw_lines[-context_lines:] for line in _decode_lines(raw_line)]
+    lines = lines[-context_lines:]
+    # Number them relative to the chunk: the line just before the chunk is line 0
+    return list(zip(range(1 - len(lines), 1), lines))
+
+def _shift_lines(lines, offset, shifted):
+    """Renumber context (line_number, content) pairs by `offset`, reusing pairs already shifted."""
+    result = []
+    for line in lines:
+        new_line = shifted.get(id(line))
+        if new_line is None:
+            new_line = shifted[id(line)] = (line[0] + offset, line[1])
+        result.append(new_line)
+    return result
+
+def _analyze_chunk(analyzer, log_file_path, start, end, context_lines, log_format=None):
+    """
+    Worker: find errors in the byte range [start, end) of a log file.
+    Context may reach outside the range. Line numbers are relative to the
+    chunk (its first line is 1); returns (errors, line_count).
+    """
+    line_count = 0
+
+    with open(log_file_path, 'rb') as file:
+        lines_before = _read_lines_before(file, start, context_lines)
+        file.seek(start)
+
+        def chunk_lines():
+            nonlocal line_count
+            position = start
+            while position < end:
+                raw_line = file.readline()
+                if not raw_line:
+                    break
+                position += len(raw_line)
+                for line in _decode_lines(raw_line):
+                    line_count += 1
+                    yield line_count, line
+
+        def lines_after():
+            line_number = line_count
+            for raw_line in file:
+                for line in _decode_lines(raw_line):
+                    line_number += 1
+                    yield line_number, line
+
+        context_before = deque(lines_before, maxlen=context_lines)
+        errors = list(analyzer._stream_errors(
+            chunk_lines(), context_lines, context_before, lines_after=lines_after(), log_format=log_format
+        ))
+
+    return errors, line_count
 
 class LogAnalyzer:
-    def __init__(self):
+    def __init__(self, matcher="regex", metrics=None, log_format="auto", correlate=False, index_dir=None):
         # Updated error patterns to match log level formats and avoid false positives
         self.error_patterns = [
             "[error]", "[exception]", "[fail]", "[fatal]", "[critical]",
@@ -12,136 +113,464 @@ class LogAnalyzer:
         ]
         # Non-error log levels to exclude
         self.non_error_levels = ["[warning]", "[info]", "[debug]", "[notice]"]
-
-    def analyze_large_log_file(self, log_file_path, context_lines=3, output_format="json"):
+        # Compiled matcher engine ("regex", "substring" or "aho-corasick")
+        self.matcher = create_matcher(matcher, self.error_patterns, self.non_error_levels)
+        # Log layout ("bracketed", "syslog", "json", "keyvalue", see log_formats.py) or "auto" to detect per file
+        self.log_format = log_format
+        if log_format != "auto":
+            get_log_format(log_format)  # Fail early on unknown names
+        # Stage timers and counters (see metrics.py); disabled unless a Metrics instance is passed
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        # Attach earlier lines for the same IMSI / session / TEID / IP to each error (see entities.py)
+        self.correlate = correlate
+        # Where scanner="index" keeps its line indexes; None stores them next to each log file
+        self.index_dir = index_dir
+
+    def analyze_large_log_file(self, log_file_path, context_lines=3, output_format="json", workers=1,
+                               scanner="stream", output_dir=None, max_errors=None):
         """
         Analyze large log files efficiently without loading entire file into memory.
         Detects errors and extracts context around them.
+        With workers > 1 (or None for all CPU cores) the file is split into
+        chunks that are analyzed in parallel processes. scanner="mmap" uses
+        the bytes-level memory-mapped scanner instead, and scanner="index"
+        reuses a persistent sidecar line index across runs.
+        Streaming formats ("ndjson", "csv") write each error to the output
+        file as soon as its trailing context is complete. With max_errors
+        the scan stops after that many errors (see triage.py for counts
+        and sampling without a full scan).
         """
         if not os.path.exists(log_file_path):
             return {"error": f"Log file not found: {log_file_path}"}
 
-        errors_with_context = []
-        all_lines = []  # Store all lines for context extraction
-
         try:
+            errors = self._scan_errors(log_file_path, context_lines, workers, scanner)
+            if errors is None:
+                return {"error": f"Unsupported scanner: {scanner}"}
+            if max_errors is not None:
+                errors = self._limit(errors, max_errors)
+
+            self.metrics.count("bytes_read", os.path.getsize(log_file_path))
+            save_result = None
+            if output_format.lower() in STREAMING_WRITERS:
+                # Write records while scanning; the file grows as errors are found
+                errors_with_context = []
+                with self.metrics.stage("scan_and_save"):
+                    save_result = self._stream_results(
+                        self._collect(errors, errors_with_context), output_format, output_dir
+                    )
+            else:
+                with self.metrics.stage("scan"):
+                    errors_with_context = list(errors)
+            self.metrics.count("errors_matched", len(errors_with_context))
 
-            #Instead of the two passes, i can use queue to store only context_lines before the error for optimization(not reading the file 2 times)
-
-            # First pass: read all lines
-            with open(log_file_path, 'r', encoding='utf-8', errors='ignore') as file:
-                for line_number, line in enumerate(file, 1):
-                    line = line.rstrip('\n\r')
-                    all_lines.append({
-                        'line_number': line_number,
-                        'content': line
-                    })
-
-            # Second pass: find errors and extract context
-            for i, line_data in enumerate(all_lines):
-                if self._is_error_line(line_data['content']):
-                    error_data = self._extract_error_with_context_from_lines(all_lines, i, context_lines)
-                    if error_data:
-                        errors_with_context.append(error_data)
-
-            # Save results in requested format
             output_data = {
                 "total_errors_found": len(errors_with_context),
                 "log_file": log_file_path,
                 "errors": errors_with_context
             }
 
-            # Save to file and return both data and save results
-            save_result = self._save_results(output_data, output_format)
+            if save_result is None:
+                # Save results in requested format
+                with self.metrics.stage("save"):
+                    save_result = self._save_results(output_data, output_format, output_dir)
+            if not save_result.get("success"):
+                return {"error": f"Error saving results: {save_result.get('error')}"}
             
             # Return combined result with both data and save info
             return {
                 "data": output_data,
                 "save_result": save_result,
                 "total_errors": len(errors_with_context),
-                "output_file": save_result.get("output_file") if save_result.get("success") else None
+                "output_file": save_result["output_file"]
             }
 
         except Exception as e:
             return {"error": f"Error processing log file: {str(e)}"}
 
-    def _is_error_line(self, line):
-        """Check if a line contains error log levels (not just the word 'error' in messages)."""
-        line_lower = line.lower()
-        # Check if line contains error log level AND doesn't contain warning/info/debug levels
-        has_error_level = any(pattern in line_lower for pattern in self.error_patterns)
-        has_non_error_level = any(level in line_lower for level in self.non_error_levels)
+    def stream_log_file(self, log_file_path, context_lines=3, output_format="ndjson", workers=1,
+                        scanner="stream", output_dir=None):
+        """
+        Like analyze_large_log_file, but errors are only written to the output
+        file and never collected, so memory stays flat however many errors
+        the log contains. Returns the save result.
+        """
+        if not os.path.exists(log_file_path):
+            return {"error": f"Log file not found: {log_file_path}"}
+        if output_format.lower() not in STREAMING_WRITERS:
+            return {"error": f"Unsupported streaming output format: {output_format}"}
 
-        return has_error_level and not has_non_error_level
+        try:
+            errors = self._scan_errors(log_file_path, context_lines, workers, scanner)
+            if errors is None:
+                return {"error": f"Unsupported scanner: {scanner}"}
+            self.metrics.count("bytes_read", os.path.getsize(log_file_path))
+            with self.metrics.stage("scan_and_save"):
+                save_result = self._stream_results(errors, output_format, output_dir)
+            self.metrics.count("errors_matched", save_result["total_errors"])
+            return save_result
+        except Exception as e:
+            return {"error": f"Error processing log file: {str(e)}"}
 
-    def _extract_error_with_context_from_lines(self, all_lines, error_index, context_lines):
-        """Extract error line with surrounding context from the full lines list."""
-        if error_index < 0 or error_index >= len(all_lines):
+    def _scan_errors(self, log_file_path, context_lines, workers, scanner):
+        """Return the error iterator for the chosen scanner, or None if it is unknown."""
+        if scanner in ("stream", "mmap", "index") and self.correlate:
+            # The entity index needs every line, in order
+            return self.iter_errors(log_file_path, context_lines)
+        if scanner in ("stream", "mmap", "index") and not self.resolve_log_format(log_file_path).uses_matcher:
+            # Structured formats are classified by their parsed level, in the streaming scanner
+            return self.iter_errors(log_file_path, context_lines)
+        if scanner in ("stream", "mmap", "index") and is_compressed(log_file_path):
+            # Compressed files can only be read front to back
+            return self.iter_errors(log_file_path, context_lines)
+        if scanner == "mmap":
+            return self.iter_errors_mmap(log_file_path, context_lines)
+        if scanner == "index":
+            return self.iter_errors_indexed(log_file_path, context_lines)
+        if scanner != "stream":
             return None
+        if workers == 1:
+            return self.iter_errors(log_file_path, context_lines)
+        return self.iter_errors_parallel(log_file_path, context_lines, workers)
 
-        error_line = all_lines[error_index]
+    @staticmethod
+    def _limit(errors, max_errors):
+        """Yield at most `max_errors` errors, then close the scan (parallel scans cancel their queued chunks)."""
+        try:
+            yield from islice(errors, max_errors)
+        finally:
+            errors.close()
 
-        # Get context lines before and after
-        start_before = max(0, error_index - context_lines)
-        end_after = min(len(all_lines), error_index + context_lines + 1)
+    @staticmethod
+    def _collect(errors, collected):
+        for error in errors:
+            collected.append(error)
+            yield error
 
-        context_before = []
-        context_after = []
+    def iter_errors(self, log_file_path, context_lines=3):
+        """
+        Stream error records from a log file in a single pass.
+        Only the last `context_lines` lines and the errors still waiting for
+        their trailing context are held in memory, so memory use does not
+        grow with the file size. Records are yielded in line order.
+        Compressed files (gzip, bz2, zstd, xz) are decompressed on the fly by
+        a background thread that runs ahead of the scan.
+        Lines are classified according to the file's log format. With
+        correlate=True each error also gets the earlier lines for its entities.
+        """
+        log_format = self.resolve_log_format(log_file_path)
+        entity_index = EntityIndex() if self.correlate else None
+        with open_log_text(log_file_path) as file:
+            numbered_lines = ((line_number, line.rstrip('\n\r')) for line_number, line in enumerate(file, 1))
+            last_line = yield from self._stream_errors(
+                numbered_lines, context_lines, log_format=log_format, entity_index=entity_index
+            )
+        self.metrics.count("lines_scanned", last_line or 0)
+        if entity_index is not None:
+            self.metrics.count("entities_evicted", entity_index.evicted)
+
+    def resolve_log_format(self, log_file_path):
+        """
+        The LogFormat for a file: the configured one, or detected from its
+        first few KB, set up for the file (e.g. its timestamp layout).
+        """
+        if self.log_format == "auto":
+            return detect_file_format(log_file_path)
+        return get_log_format(self.log_format).for_file(read_sample_lines(log_file_path))
 
-        # Extract context before
-        for i in range(start_before, error_index):
-            context_before.append({
-                'line_number': all_lines[i]['line_number'],
-                'content': all_lines[i]['content']
-            })
+    def iter_errors_parallel(self, log_file_path, context_lines=3, workers=None, min_chunk_size=1024 * 1024):
+        """
+        Analyze a file in parallel: split it into byte ranges at line boundaries,
+        scan each range in a ProcessPoolExecutor worker and merge the results.
+        Yields the same records, in the same order, as iter_errors.
+        """
+        workers = workers or os.cpu_count() or 1
+        chunks = self._chunk_boundaries(log_file_path, workers * 4, min_chunk_size)
 
-        # Extract context after
-        for i in range(error_index + 1, end_after):
-            context_after.append({
-                'line_number': all_lines[i]['line_number'],
-                'content': all_lines[i]['content']
-            })
+        if workers == 1 or len(chunks) == 1:
+            yield from self.iter_errors(log_file_path, context_lines)
+            return
 
-        return {
-            "error_line": error_line['content'],
-            "line_number": error_line['line_number'],
-            "context_before": context_before,
-            "context_after": context_after,
-            "timestamp": self._extract_timestamp(error_line['content'])
-        }
+        log_format = self.resolve_log_format(log_file_path)
 
-    def _extract_timestamp(self, line):
-        """Extract timestamp from log line if present."""
-        import re
-        # Common timestamp patterns
-        patterns = [
-            r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}',  # YYYY-MM-DD HH:MM:SS
-            r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}',  # MM/DD/YYYY HH:MM:SS
-            r'\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}',  # YYYY/MM/DD HH:MM:SS
+        from concurrent.futures import ProcessPoolExecutor  # Loaded only when a parallel scan runs
+        executor = ProcessPoolExecutor(max_workers=workers)
+        futures = [
+            executor.submit(_analyze_chunk, self, log_file_path, start, end, context_lines, log_format)
+            for start, end in chunks
         ]
+        try:
+            # Chunk results are read in file order; shift relative line numbers to absolute ones
+            line_offset = 0
+            for future in futures:
+                errors, line_count = future.result()
+                shifted = {}  # id(line) -> shifted line, so overlapping windows stay shared
+                for error_data in errors:
+                    if line_offset:
+                        error_data.line_number += line_offset
+                        error_data.before_lines = _shift_lines(error_data.before_lines, line_offset, shifted)
+                        error_data.after_lines = _shift_lines(error_data.after_lines, line_offset, shifted)
+                    yield error_data
+                line_offset += line_count
+        finally:
+            # A caller that stops early (max_errors) should not wait for chunks nobody will read
+            # (cancelled one by one, as shutdown(cancel_futures=True) needs Python 3.9)
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=True)
+        self.metrics.count("lines_scanned", line_offset)
+
+    def iter_errors_mmap(self, log_file_path, context_lines=3, block_size=8 * 1024 * 1024, start=0, end=None):
+        """
+        Scan a memory-mapped file at the bytes level.
+        Each block is lowercased once and searched for the error patterns with
+        bytes.find; only candidate lines and their context windows are decoded,
+        and line numbers come from counting newlines in bulk. Lines are split
+        on '\\n' only (a trailing '\\r' is dropped), so files that use lone '\\r'
+        line breaks should go through iter_errors instead.
+        `start` and `end` limit the scan to the lines beginning in that byte
+        range (`start` must be a line start); line numbers then count from
+        the line at `start`, while context may reach outside the range.
+        """
+        patterns = [pattern.lower().encode('utf-8') for pattern in self.error_patterns]
+        log_format = self.resolve_log_format(log_file_path)
+
+        with open(log_file_path, 'rb') as file:
+            file_size = os.fstat(file.fileno()).st_size
+            if file_size == 0:
+                return
+
+            scan_end = file_size if end is None else min(end, file_size)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                line_number = 1  # Line number at the start of the current block
+                position = start
+
+                while position < scan_end:
+                    # Blocks always end just after a newline (or at the end of the range)
+                    block_end = mapped.find(b'\n', min(position + block_size, scan_end), scan_end)
+                    block_end = scan_end if block_end == -1 else block_end + 1
+                    block = mapped[position:block_end].lower()
+
+                    # Start offsets (within the block) of lines containing any error pattern
+                    candidate_starts = set()
+                    for pattern in patterns:
+                        index = block.find(pattern)
+                        while index != -1:
+                            candidate_starts.add(block.rfind(b'\n', 0, index) + 1)
+                            index = block.find(pattern, index + 1)
+
+                    counted = 0
+                    for line_start in sorted(candidate_starts):
+                        line_number += block.count(b'\n', counted, line_start)
+                        counted = line_start
+
+                        line_end = block.find(b'\n', line_start)
+                        line_end = len(block) if line_end == -1 else line_end
+                        line = _decode_raw_line(mapped[position + line_start:position + line_end])
+                        if not self._is_error_line(line):
+                            continue
+
+                        context_before = self._mmap_lines_before(
+                            mapped, position + line_start, line_number, context_lines
+                        )
+                        error_data = self._build_error_record(line_number, line, context_before, log_format)
+                        error_data.after_lines = self._mmap_lines_after(
+                            mapped, position + line_end + 1, line_number, context_lines
+                        )
+                        yield error_data
+
+                    line_number += block.count(b'\n', counted)
+                    position = block_end
+
+                # A last line without a newline still counts
+                if scan_end > start:
+                    self.metrics.count("lines_scanned", line_number - 1 + (mapped[scan_end - 1:scan_end] != b'\n'))
+
+    def iter_errors_indexed(self, log_file_path, context_lines=3, index_path=None):
+        """
+        Yield error records using a persistent line-offset index (see line_index.py).
+        The index is rebuilt when the file changed; error line numbers are cached
+        per pattern set, so re-runs with another context_lines only seek to the
+        context windows. Lines are split like iter_errors_mmap.
+        """
+        if index_path is None and self.index_dir is not None:
+            os.makedirs(self.index_dir, exist_ok=True)
+            index_path = default_index_path(log_file_path, self.index_dir)
+        index, index_path = load_or_build_index(log_file_path, index_path)
+
+        signature = self._pattern_signature()
+        error_lines = index.error_lines.get(signature)
+        if error_lines is None:
+            error_lines = array('Q', (e['line_number'] for e in self.iter_errors_mmap(log_file_path, 0)))
+            index.error_lines[signature] = error_lines
+            try:
+                index.save(index_path)
+            except OSError:
+                pass  # Still usable for this run
+
+        log_format = self.resolve_log_format(log_file_path)
+        with open(log_file_path, 'rb') as file:
+            for line_number in error_lines:
+                first_line = max(1, line_number - context_lines)
+                raw_lines = index.read_raw_lines(file, first_line, line_number + context_lines)
+                lines = [_decode_raw_line(raw_line.rstrip(b'\n')) for raw_line in raw_lines]
+
+                error_offset = line_number - first_line
+                context_before = list(zip(range(first_line, line_number), lines[:error_offset]))
+                error_data = self._build_error_record(line_number, lines[error_offset], context_before, log_format)
+                error_data.after_lines = list(enumerate(lines[error_offset + 1:], line_number + 1))
+                yield error_data
+
+    def _pattern_signature(self):
+        """Stable key for the current pattern set, used to cache error lines in the index."""
+        patterns = json.dumps([self.error_patterns, self.non_error_levels])
+        return hashlib.blake2b(patterns.encode('utf-8'), digest_size=8).hexdigest()
+
+    def _mmap_lines_before(self, mapped, line_start, line_number, context_lines):
+        """Decode up to `context_lines` lines before the line starting at byte `line_start`."""
+        lines = []
+        position = line_start
+        while position > 0 and len(lines) < context_lines:
+            previous_start = mapped.rfind(b'\n', 0, position - 1) + 1
+            lines.append((line_number - len(lines) - 1, _decode_raw_line(mapped[previous_start:position - 1])))
+            position = previous_start
+        lines.reverse()
+        return lines
+
+    def _mmap_lines_after(self, mapped, position, line_number, context_lines):
+        """Decode up to `context_lines` lines starting at byte `position`."""
+        context_after = []
+        file_size = len(mapped)
+        while position < file_size and len(context_after) < context_lines:
+            line_end = mapped.find(b'\n', position)
+            line_end = file_size if line_end == -1 else line_end
+            context_after.append((line_number + len(context_after) + 1, _decode_raw_line(mapped[position:line_end])))
+            position = line_end + 1
+        return context_after
+
+    def _chunk_boundaries(self, log_file_path, max_chunks, min_chunk_size):
+        """Split a file into at most `max_chunks` (start, end) byte ranges that begin on line starts."""
+        file_size = os.path.getsize(log_file_path)
+        chunk_count = max(1, min(max_chunks, file_size // max(min_chunk_size, 1)))
+
+        boundaries = [0]
+        with open(log_file_path, 'rb') as file:
+            for i in range(1, chunk_count):
+                file.seek(max(file_size * i // chunk_count, boundaries[-1]))
+                file.readline()  # Move to the start of the next line
+                position = file.tell()
+                if boundaries[-1] < position < file_size:
+                    boundaries.append(position)
+        boundaries.append(file_size)
+
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def _stream_errors(self, numbered_lines, context_lines, context_before=None, pending=None,
+                       lines_after=(), flush=True, log_format=None, entity_index=None):
+        """
+        Core single-pass engine over (line_number, content) pairs.
+        `context_before` (ring buffer of earlier lines) and `pending` (errors
+        still collecting context_after) may be passed in to resume a scan and
+        are left updated. `lines_after` is only used to complete trailing
+        context and is never checked for errors. With flush=False, errors
+        still waiting for context stay in `pending` instead of being yielded.
+        Error records get their timestamp, level and component from
+        `log_format` (bracketed by default); a format that does not use the
+        pattern matcher also classifies the lines. An `entity_index`
+        (see entities.py) is fed every line and annotates each error with
+        the earlier lines that share its entities.
+        Returns the last line number seen (None if there were no lines).
+        """
+        line_number = None
+        if log_format is None:
+            log_format = get_log_format("bracketed")
+        is_error_line = self._is_error_line
+        if not log_format.uses_matcher:
+            matcher = self.matcher
+            is_error_line = lambda line: log_format.is_error_line(line, matcher)
+        build_error_record = self._build_error_record
+        if context_before is None:
+            context_before = deque(maxlen=context_lines)
+        if pending is None:
+            pending = deque()
+
+        # Each (line_number, line) pair is stored as is in the context windows it falls into
+        for numbered_line in numbered_lines:
+            line_number, line = numbered_line
+            if pending:
+                yield from self._feed_pending(pending, numbered_line, context_lines)
+
+            if is_error_line(line):
+                error_data = build_error_record(line_number, line, context_before, log_format)
+                if entity_index is not None:
+                    entity_index.add(numbered_line, entity_index.annotate(error_data, context_lines))
+                if context_lines > 0:
+                    pending.append(error_data)
+                else:
+                    yield error_data
+            elif entity_index is not None:
+                entity_index.add(numbered_line)
+
+            if context_lines > 0:
+                context_before.append(numbered_line)
+
+        for numbered_line in lines_after:
+            if not pending:
+                break
+            yield from self._feed_pending(pending, numbered_line, context_lines)
+
+        # End of input: remaining errors get whatever trailing context exists
+        while flush and pending:
+            yield pending.popleft()
+        return line_number
+
+    def _feed_pending(self, pending, numbered_line, context_lines):
+        """Append a line to every error still waiting for trailing context and yield completed ones."""
+        for error_data in pending:
+            error_data.after_lines.append(numbered_line)
+        # The oldest pending error always completes first
+        while pending and len(pending[0].after_lines) >= context_lines:
+            yield pending.popleft()
+
+    def _build_error_record(self, line_number, line, context_before, log_format):
+        """Create an error record from the error line and the buffered (line_number, content) pairs before it."""
+        timestamp, level, component = log_format.record_fields(line)
+        return ErrorRecord(line, line_number, context_before, timestamp=timestamp, level=level, component=component)
 
-        for pattern in patterns:
-            match = re.search(pattern, line)
-            if match:
-                return match.group()
-        return None
+    def _is_error_line(self, line):
+        """Check if a line contains error log levels (not just the word 'error' in messages)."""
+        # Error log level present AND no warning/info/debug levels, via the compiled matcher
+        return self.matcher.is_error_line(line)
 
-    def _save_results(self, data, output_format, output_dir=None):
-        """Save analysis results in JSON or CSV format."""
-        if output_dir is None:
-            # Default to the main project output directory
-            output_dir = os.path.join(os.path.dirname(__file__), "..", "output")
-        
-        if not os.path.exists(output_dir):
-            os.makedirs(output_dir)
+    def _extract_timestamp(self, line):
+        """Extract timestamp from log line if present."""
+        return extract_timestamp(line)
+
+    def _save_results(self, data, output_format, output_dir=None, extra_fields=()):
+        """
+        Save analysis results in JSON, NDJSON, CSV, columnar or Parquet format.
+        `extra_fields` are record keys added as CSV columns (e.g. the source file).
+        """
+        output_dir = self._output_dir(output_dir)
 
         if output_format.lower() == "json":
             output_file = os.path.join(output_dir, "error_analysis.json")
             with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                json.dump(data, f, indent=2, ensure_ascii=False, default=record_to_json)
         elif output_format.lower() == "csv":
             output_file = os.path.join(output_dir, "error_analysis.csv")
-            self._save_as_csv(data, output_file)
+            self._save_as_csv(data, output_file, extra_fields)
+        elif output_format.lower() in STREAMING_WRITERS:
+            return self._stream_results(data["errors"], output_format, output_dir, extra_fields)
+        elif output_format.lower() == "columnar":
+            output_file = os.path.join(output_dir, "error_analysis.cols")
+            write_columnar(data["errors"], output_file, data.get("log_file"))
+        elif output_format.lower() == "parquet":
+            output_file = os.path.join(output_dir, "error_analysis.parquet")
+            try:
+                write_parquet(data["errors"], output_file)
+            except ImportError as e:
+                return {"error": str(e)}
         else:
             return {"error": f"Unsupported output format: {output_format}"}
 
@@ -152,53 +581,135 @@ class LogAnalyzer:
             "format": output_format
         }
 
-    def _save_as_csv(self, data, output_file):
+    def _stream_results(self, errors, output_format, output_dir=None, extra_fields=()):
+        """Write error records one by one with the streaming writer for output_format."""
+        writer_class = STREAMING_WRITERS[output_format.lower()]
+        output_file = os.path.join(self._output_dir(output_dir), "error_analysis." + writer_class.extension)
+        with writer_class(output_file, extra_fields=extra_fields) as writer:
+            writer.write_all(errors)
+
+        return {
+            "success": True,
+            "output_file": output_file,
+            "total_errors": writer.count,
+            "format": output_format
+        }
+
+    def _output_dir(self, output_dir):
+        if output_dir is None:
+            # Default to the main project output directory
+            output_dir = os.path.join(os.path.dirname(__file__), "..", "output")
+        
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        return output_dir
+
+    def _save_as_csv(self, data, output_file, extra_fields=()):
         """Save error analysis results as CSV."""
-        with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['line_number', 'error_line', 'timestamp', 'context_before', 'context_after']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-
-            for error in data["errors"]:
-                writer.writerow({
-                    'line_number': error['line_number'],
-                    'error_line': error['error_line'],
-                    'timestamp': error.get('timestamp', ''),
-                    'context_before': '; '.join([f"[{item['line_number']}] {item['content']}" for item in error['context_before']]),
-                    'context_after': '; '.join([f"[{item['line_number']}] {item['content']}" for item in error['context_after']])
-                })
-
-    def prepare_for_llm_from_memory(self, analysis_data):
+        with CsvWriter(output_file, extra_fields=extra_fields) as writer:
+            writer.write_all(data["errors"])
+
+    def prepare_for_llm_from_memory(self, analysis_data, start_number=1, max_chars=None):
         """
         Prepare structured error data for LLM API consumption using in-memory data.
         More efficient than loading from saved JSON file.
         Returns formatted text that can be sent to Gemini/OpenAI.
+        start_number keeps error numbering continuous when errors are sent in batches.
         """
-        if not analysis_data or "error" in analysis_data:
-            return f"Error in analysis data: {analysis_data.get('error', 'Unknown error')}"
-
-        total_errors = analysis_data.get('total_errors_found', 0)
-        errors = analysis_data.get('errors', [])
-        log_file = analysis_data.get('log_file', 'unknown')
-
-        formatted_text = f"Log Analysis Summary:\n"
-        formatted_text += f"Total errors found: {total_errors}\n"
-        formatted_text += f"Log file: {log_file}\n\n"
+        return self.build_llm_input(analysis_data, start_number=start_number, max_chars=max_chars)["text"]
 
-        for i, error in enumerate(errors, 1):
-            formatted_text += f"Error #{i} (Line {error['line_number']}):\n"
-            formatted_text += f"Error: {error['error_line']}\n"
+    def prepare_clusters_for_llm(self, analysis_data, clusters, start_number=1, max_chars=None):
+        """
+        Prepare clustered error data for LLM consumption: one entry per error
+        template with its count, time range and a few sample occurrences, so
+        the text grows with the number of distinct failures, not their frequency.
+        """
+        return self.build_llm_input(analysis_data, clusters, start_number, max_chars)["text"]
 
-            if error.get('context_before'):
-                formatted_text += "Context Before:\n"
-                for ctx in error['context_before']:
-                    formatted_text += f"  [{ctx['line_number']}] {ctx['content']}\n"
+    def build_llm_input(self, analysis_data, clusters=None, start_number=1, max_chars=None):
+        """
+        Build the LLM input text, one block per error (or per cluster if given).
+        Blocks are assembled with a single join. When max_chars is set and would
+        be exceeded, blocks are kept by severity, then rarity, then recency and
+        the omitted ones are listed at the end.
+        Returns {"text", "included", "dropped", "chars"} (see prompt_builder).
+        """
+        if not analysis_data or "error" in analysis_data:
+            text = f"Error in analysis data: {analysis_data.get('error', 'Unknown error')}"
+            return {"text": text, "included": [], "dropped": [], "chars": len(text)}
 
-            if error.get('context_after'):
-                formatted_text += "Context After:\n"
-                for ctx in error['context_after']:
-                    formatted_text += f"  [{ctx['line_number']}] {ctx['content']}\n"
+        header = [
+            "Log Analysis Summary:\n",
+            f"Total errors found: {analysis_data.get('total_errors_found', 0)}\n",
+        ]
+        if clusters is not None:
+            header.append(f"Distinct error types: {len(clusters)}\n")
+        header.append(f"Log file: {analysis_data.get('log_file', 'unknown')}\n\n")
 
-            formatted_text += "\n" + "="*50 + "\n"
+        if clusters is not None:
+            items = clusters
+            blocks = [(i, self._format_cluster_block(i, cluster)) for i, cluster in enumerate(clusters, start_number)]
 
-        return formatted_text
\ No newline at end of file
+            def rank_key(index):
+                cluster = clusters[index]
+                return (-severity_of(cluster.samples[0]['error_line']), cluster.count, -cluster.last_line)
+        else:
+            items = analysis_data.get('errors', [])
+            blocks = [(i, self._format_error_block(i, error)) for i, error in enumerate(items, start_number)]
+            signature_counts = {}
+
+            def rank_key(index):
+                if not signature_counts:
+                    for error in items:
+                        signature = error_signature(error['error_line'])
+                        signature_counts[signature] = signature_counts.get(signature, 0) + 1
+                error = items[index]
+                rarity = signature_counts[error_signature(error['error_line'])]
+                return (-severity_of(error['error_line']), rarity, -error['line_number'])
+
+        return assemble_prompt("".join(header), blocks, max_chars, rank_key)
+
+    def _format_error_block(self, number, error):
+        """Format one error with its context as an LLM input block."""
+        parts = [f"Error #{number} (Line {error['line_number']}):\n"]
+        self._append_error_lines(parts, error)
+        parts.append("\n" + "="*50 + "\n")
+        return "".join(parts)
+
+    def _format_cluster_block(self, number, cluster):
+        """Format one error cluster (template, counts, samples) as an LLM input block."""
+        occurrences = f"{cluster.count} occurrence{'s' if cluster.count != 1 else ''}"
+        parts = [
+            f"Error #{number} (Line {cluster.first_line}, {occurrences}):\n",
+            f"Template: {cluster.template}\n"
+        ]
+        if cluster.count > 1:
+            parts.append(f"Lines: {cluster.first_line} - {cluster.last_line}\n")
+            if cluster.first_timestamp:
+                parts.append(f"First seen: {cluster.first_timestamp}\n")
+                parts.append(f"Last seen: {cluster.last_timestamp}\n")
+
+        for sample_number, error in enumerate(cluster.samples, 1):
+            if sample_number > 1:
+                parts.append(f"Sample {sample_number} (Line {error['line_number']}):\n")
+            self._append_error_lines(parts, error)
+
+        parts.append("\n" + "="*50 + "\n")
+        return "".join(parts)
+
+    def _append_error_lines(self, parts, error):
+        """Append the error line and its context lines to a list of text parts."""
+        parts.append(f"Error: {error['error_line']}\n")
+
+        if error.get('context_before'):
+            parts.append("Context Before:\n")
+            parts.extend(f"  [{ctx['line_number']}] {ctx['content']}\n" for ctx in error['context_before'])
+
+        if error.get('context_after'):
+            parts.append("Context After:\n")
+            parts.extend(f"  [{ctx['line_number']}] {ctx['content']}\n" for ctx in error['context_after'])
+
+        if error.get('correlated_context'):
+            entities = ", ".join(f"{kind} {value}" for kind, values in error['entities'].items() for value in values)
+            parts.append(f"Earlier Lines for {entities}:\n")
+            parts.extend(f"  [{ctx['line_number']}] {ctx['content']}\n" for ctx in error['correlated_context'])
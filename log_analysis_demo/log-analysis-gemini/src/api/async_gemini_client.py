@@ -0,0 +1,170 @@
+import asyncio
+import random
+import threading
+import time
+
+DEFAULT_MODEL = 'gemini-1.5-flash'
+
+def estimate_tokens(text):
+    """Rough token estimate (about 4 characters per token) used to size batches."""
+    return len(text) // 4 + 1
+
+def split_into_batches(items, max_tokens, size_fn):
+    """Group items in order into batches whose summed size_fn() stays within max_tokens."""
+    batches = []
+    current = []
+    current_tokens = 0
+    for item in items:
+        tokens = size_fn(item)
+        if current and current_tokens + tokens > max_tokens:
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(item)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+RATE_LIMIT_ERRORS = ('ResourceExhausted', 'TooManyRequests')
+# Server-side and network failures worth retrying (google.api_core and common HTTP client names)
+TRANSIENT_ERRORS = RATE_LIMIT_ERRORS + (
+    'InternalServerError', 'BadGateway', 'ServiceUnavailable', 'GatewayTimeout', 'DeadlineExceeded'
+)
+
+def _status_code(error):
+    code = getattr(error, 'code', None)
+    if callable(code):
+        code = code()
+    return code if isinstance(code, int) else None
+
+def is_rate_limit_error(error):
+    """Detect HTTP 429 / quota errors from the Gemini SDK or a transport, by status code or exception type."""
+    return _status_code(error) == 429 or type(error).__name__ in RATE_LIMIT_ERRORS
+
+def is_transient_error(error):
+    """Rate limits, 5xx responses and timeouts are retried; anything else (auth, invalid arguments) is not."""
+    code = _status_code(error)
+    return (
+        code == 429
+        or code is not None and 500 <= code < 600
+        or isinstance(error, (TimeoutError, asyncio.TimeoutError, ConnectionError))
+        or type(error).__name__ in TRANSIENT_ERRORS
+    )
+
+def _run_loop(loop):
+    asyncio.set_event_loop(loop)
+    loop.run_forever()
+    loop.close()
+
+class GenAITransport:
+    """Transport backed by google.generativeai; one configured model is reused for every request."""
+
+    def __init__(self, api_key, model_name=DEFAULT_MODEL):
+        import google.generativeai as genai
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+
+    async def generate(self, prompt):
+        response = await self.model.generate_content_async(prompt)
+        return response.text
+
+class AsyncGeminiClient:
+    """
+    Send many prompts to Gemini concurrently.
+    At most `max_concurrency` requests are in flight. Transient failures
+    (rate limits, 5xx, timeouts) are retried with exponential backoff and
+    jitter, without holding a concurrency slot while backing off; a
+    rate-limit error pauses all requests on the client, including those of
+    other fetch_all calls, for the cooldown instead of only the one that hit
+    it. Other errors fail the batch at once.
+    Any object with an async generate(prompt) -> str method can be used as
+    the transport, e.g. a stub in tests. fetch_all_sync() runs every call on
+    one background event loop, because google.generativeai binds its async
+    channel to the loop it is first used from; close() stops that loop.
+    """
+
+    def __init__(self, api_key=None, transport=None, max_concurrency=4, max_retries=4,
+                 base_delay=1.0, max_delay=60.0, rate_limit_delay=30.0):
+        self.transport = transport or GenAITransport(api_key)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.rate_limit_delay = rate_limit_delay
+        self._cooldown_until = 0.0
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+    def fetch_all_sync(self, prompts):
+        """Blocking wrapper around fetch_all for synchronous callers (safe to call from any thread)."""
+        return asyncio.run_coroutine_threadsafe(self.fetch_all(prompts), self._event_loop()).result()
+
+    def close(self):
+        """Stop the background event loop, if one was started."""
+        with self._loop_lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+
+    def _event_loop(self):
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=_run_loop, args=(self._loop,), name="gemini-event-loop", daemon=True).start()
+            return self._loop
+
+    async def fetch_all(self, prompts):
+        """
+        Send all prompts and return one result dict per prompt, in order:
+        {"batch", "text", "error", "attempts", "latency"}. "text" is None if
+        every attempt failed.
+        """
+        # The rate-limit cooldown is shared by every call on this client (service jobs run concurrently), so it is not reset here
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(*(
+            self._fetch_one(index, prompt, semaphore) for index, prompt in enumerate(prompts, 1)
+        ))
+
+    async def _fetch_one(self, index, prompt, semaphore):
+        attempts = 0
+        while True:
+            async with semaphore:
+                await self._wait_for_cooldown()
+                attempts += 1
+                started = time.monotonic()
+                try:
+                    text = await self.transport.generate(prompt)
+                    return {
+                        "batch": index,
+                        "text": text,
+                        "error": None,
+                        "attempts": attempts,
+                        "latency": time.monotonic() - started
+                    }
+                except Exception as e:
+                    error = e
+                    latency = time.monotonic() - started
+
+            if attempts > self.max_retries or not is_transient_error(error):
+                return {
+                    "batch": index,
+                    "text": None,
+                    "error": str(error),
+                    "attempts": attempts,
+                    "latency": latency
+                }
+
+            # Back off outside the semaphore so other batches can use the slot meanwhile
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempts - 1))
+            delay *= random.uniform(0.5, 1.0)  # Jitter so retries do not line up
+            if is_rate_limit_error(error):
+                delay = max(delay, getattr(error, 'retry_after', None) or self.rate_limit_delay)
+                self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+            await asyncio.sleep(delay)
+
+    async def _wait_for_cooldown(self):
+        """Block while a rate-limit cooldown is active."""
+        remaining = self._cooldown_until - time.monotonic()
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            remaining = self._cooldown_until - time.monotonic()
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import time
+
+class ResponseCache:
+    """
+    Content-addressed on-disk cache of LLM responses, keyed by error signature.
+    Each entry is one JSON file named after the hash of (namespace, signature).
+    File mtime records the last access for LRU eviction; entries older than
+    `ttl_seconds` since creation are treated as missing.
+    """
+
+    def __init__(self, cache_dir, max_entries=5000, ttl_seconds=7 * 24 * 3600, namespace="gemini"):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.namespace = namespace  # Model / prompt version; changing it invalidates old entries
+
+    def get(self, signature):
+        """Return the cached response text for a signature, or None if missing or expired."""
+        path = self._path(signature)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl_seconds:
+            self._remove(path)
+            return None
+
+        os.utime(path)  # Mark as recently used
+        return entry.get("response")
+
+    def put(self, signature, response, template=None):
+        """Store a response; `template` is kept only to make entries readable."""
+        path = self._path(signature)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "signature": signature,
+                "template": template,
+                "response": response,
+                "created": time.time()
+            }, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def prune(self):
+        """Drop expired entries, then the least recently used ones above max_entries."""
+        now = time.time()
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    last_used = os.path.getmtime(path)
+                except OSError:
+                    continue
+                entries.append((last_used, path))
+
+        entries.sort(reverse=True)  # Most recently used first
+        removed = 0
+        for position, (last_used, path) in enumerate(entries):
+            # mtime is never older than creation, so an old mtime means expired
+            if position >= self.max_entries or now - last_used > self.ttl_seconds:
+                removed += self._remove(path)
+        return removed
+
+    def _path(self, signature):
+        key = hashlib.sha256(f"{self.namespace}\0{signature}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+            return 1
+        except OSError:
+            return 0
@@ -0,0 +1,118 @@
+# filepath: log-analysis-gemini/src/batch.py
+
+import heapq
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+from timestamps import NO_TIMESTAMP, parse_epochs
+
+# Plain, rotated and compressed logs: smf.log, smf.log.1, amf.txt, upf.log.2.gz, pcf.log.zst, ...
+LOG_FILE_PATTERN = re.compile(r'\.(?:txt|log)(?:\.\d+)?(?:\.(?:gz|bz2|zst|xz))?$|\.(?:gz|bz2|zst|xz)$', re.IGNORECASE)
+NETWORK_FUNCTIONS = ("AMF", "SMF", "UPF", "PCF", "NRF", "AUSF", "UDM", "UDR", "NSSF", "NEF", "CHF", "SCP")
+NF_PATTERN = re.compile(r'(?<![A-Za-z])(' + "|".join(NETWORK_FUNCTIONS) + r')(?![A-Za-z])', re.IGNORECASE)
+SOURCE_FIELDS = ['source_file', 'network_function']
+
+def find_log_files(path):
+    """Log files under a directory (recursively), or the path itself if it is a file, sorted by path."""
+    if os.path.isfile(path):
+        return [path]
+
+    log_files = []
+    for root, _, files in os.walk(path):
+        for name in files:
+            if LOG_FILE_PATTERN.search(name):
+                log_files.append(os.path.join(root, name))
+    return sorted(log_files)
+
+def network_function_of(log_file_path):
+    """Guess the network function (AMF, SMF, ...) from a log file name, or None."""
+    match = NF_PATTERN.search(os.path.basename(log_file_path))
+    return match.group(1).upper() if match else None
+
+def _analyze_file(analyzer, log_file_path, context_lines):
+    """
+    Worker: stream one log file and return its errors, each tagged with its
+    source file and network function, plus a parallel list of merge keys.
+    """
+    errors = list(analyzer.iter_errors(log_file_path, context_lines))
+    network_function = network_function_of(log_file_path)
+    for error in errors:
+        error['source_file'] = log_file_path
+        error['network_function'] = network_function
+
+    # Errors without a timestamp keep their place after the previous error of the same file
+    keys = []
+    last_epoch = NO_TIMESTAMP
+    for epoch in parse_epochs(error.get('timestamp') for error in errors):
+        if epoch != NO_TIMESTAMP:
+            last_epoch = epoch
+        keys.append(last_epoch)
+    return errors, keys
+
+def iter_merged_errors(analyzer, log_files, context_lines=3, workers=None, file_counts=None):
+    """
+    Analyze several log files concurrently and yield their errors as one
+    stream ordered by timestamp (a k-way merge of the per-file results, which
+    are each in line order). Ties keep the order of `log_files`.
+    If given, `file_counts` is filled with the number of errors per file.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(log_files) == 1:
+        per_file = list(map(_analyze_file, repeat(analyzer), log_files, repeat(context_lines)))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(log_files))) as executor:
+            per_file = list(executor.map(_analyze_file, repeat(analyzer), log_files, repeat(context_lines)))
+
+    if file_counts is not None:
+        for log_file_path, (errors, _) in zip(log_files, per_file):
+            file_counts[log_file_path] = len(errors)
+
+    streams = [_merge_stream(file_index, errors, keys) for file_index, (errors, keys) in enumerate(per_file)]
+    for _, _, _, error in heapq.merge(*streams):
+        yield error
+
+def _merge_stream(file_index, errors, keys):
+    # (timestamp, file, position) is unique, so the error dicts themselves are never compared
+    for position, (key, error) in enumerate(zip(keys, errors)):
+        yield key, file_index, position, error
+
+def analyze_log_directory(analyzer, path, context_lines=3, workers=None, output_format="json", output_dir=None):
+    """
+    Non-interactive batch mode: analyze every log file under `path` (plain,
+    rotated or compressed, from any number of network functions) in a worker pool
+    and save one time-ordered result. Each error keeps its `source_file` and
+    `network_function`. Returns the same shape as analyze_large_log_file.
+    """
+    log_files = find_log_files(path)
+    if not log_files:
+        return {"error": f"No log files found in: {path}"}
+
+    try:
+        file_counts = {}
+        errors = list(iter_merged_errors(analyzer, log_files, context_lines, workers, file_counts))
+
+        output_data = {
+            "total_errors_found": len(errors),
+            "log_file": path,
+            "log_files": [
+                {"path": log_file_path, "network_function": network_function_of(log_file_path),
+                 "errors": file_counts[log_file_path]}
+                for log_file_path in log_files
+            ],
+            "errors": errors
+        }
+        save_result = analyzer._save_results(output_data, output_format, output_dir, extra_fields=SOURCE_FIELDS)
+        if not save_result.get("success"):
+            return {"error": f"Error saving results: {save_result.get('error')}"}
+
+        return {
+            "data": output_data,
+            "save_result": save_result,
+            "total_errors": len(errors),
+            "output_file": save_result["output_file"]
+        }
+
+    except Exception as e:
+        return {"error": f"Error processing log files: {str(e)}"}
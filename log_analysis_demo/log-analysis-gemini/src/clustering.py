@@ -0,0 +1,123 @@
+# filepath: log-analysis-gemini/src/clustering.py
+
+from signatures import error_signature, normalize_error
+
+WILDCARD = "<*>"
+
+class ErrorCluster:
+    """A group of error records sharing one template, with counts, time range and a few samples."""
+
+    def __init__(self, cluster_id, tokens, error, max_samples):
+        self.cluster_id = cluster_id
+        self.tokens = tokens
+        self.signature = error_signature(error['error_line'])
+        self.count = 0
+        self.first_line = error['line_number']
+        self.last_line = error['line_number']
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.samples = []
+        self.max_samples = max_samples
+        self.add(error)
+
+    @property
+    def template(self):
+        return " ".join(self.tokens)
+
+    def add(self, error):
+        self.count += 1
+        self.first_line = min(self.first_line, error['line_number'])
+        self.last_line = max(self.last_line, error['line_number'])
+        timestamp = error.get('timestamp')
+        if timestamp:
+            if self.first_timestamp is None or timestamp < self.first_timestamp:
+                self.first_timestamp = timestamp
+            if self.last_timestamp is None or timestamp > self.last_timestamp:
+                self.last_timestamp = timestamp
+
+        # Keep the first occurrences and, in the last slot, the most recent one
+        if len(self.samples) < self.max_samples:
+            self.samples.append(error)
+        else:
+            self.samples[-1] = error
+
+    def to_dict(self):
+        return {
+            "cluster_id": self.cluster_id,
+            "template": self.template,
+            "signature": self.signature,
+            "count": self.count,
+            "first_line": self.first_line,
+            "last_line": self.last_line,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "samples": self.samples
+        }
+
+class TemplateMiner:
+    """
+    Drain-style online template miner for error lines.
+    Lines are masked with signatures.normalize_error and tokenized, then routed
+    through a fixed-depth prefix tree (token count, then the first tokens).
+    In the leaf, the most similar cluster above `similarity_threshold` absorbs
+    the line and positions that differ become <*>; otherwise a new cluster starts.
+    """
+
+    def __init__(self, depth=4, similarity_threshold=0.5, max_children=100, max_samples=3):
+        self.depth = depth
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.max_samples = max_samples
+        self.root = {}
+        self.clusters = []
+
+    def add(self, error):
+        """Assign an error record to a cluster and return that cluster."""
+        tokens = normalize_error(error['error_line']).split()
+        leaf = self._leaf(tokens)
+
+        best_cluster = None
+        best_similarity = -1.0
+        for cluster in leaf:
+            similarity = self._similarity(cluster.tokens, tokens)
+            if similarity > best_similarity:
+                best_cluster, best_similarity = cluster, similarity
+
+        if best_cluster is not None and best_similarity >= self.similarity_threshold:
+            best_cluster.tokens = [
+                template_token if template_token == token else WILDCARD
+                for template_token, token in zip(best_cluster.tokens, tokens)
+            ]
+            best_cluster.add(error)
+            return best_cluster
+
+        cluster = ErrorCluster(len(self.clusters) + 1, tokens, error, self.max_samples)
+        self.clusters.append(cluster)
+        leaf.append(cluster)
+        return cluster
+
+    def _leaf(self, tokens):
+        """Walk (and grow) the prefix tree to the list of clusters for these tokens."""
+        node = self.root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 1]:
+            # Tokens with digits are likely parameters; route them through the wildcard branch
+            key = WILDCARD if any(char.isdigit() for char in token) else token
+            if key not in node and len(node) >= self.max_children:
+                key = WILDCARD
+            node = node.setdefault(key, {})
+        return node.setdefault(None, [])
+
+    @staticmethod
+    def _similarity(template_tokens, tokens):
+        if not tokens:
+            return 1.0
+        same = sum(1 for template_token, token in zip(template_tokens, tokens)
+                   if template_token == token or template_token == WILDCARD)
+        return same / len(tokens)
+
+def cluster_errors(errors, **miner_options):
+    """Cluster error records; returns clusters ordered by first occurrence."""
+    miner = TemplateMiner(**miner_options)
+    for error in errors:
+        miner.add(error)
+    return sorted(miner.clusters, key=lambda cluster: cluster.first_line)
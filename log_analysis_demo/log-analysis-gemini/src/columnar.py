@@ -0,0 +1,203 @@
+# filepath: log-analysis-gemini/src/columnar.py
+
+import json
+import os
+import sys
+from array import array
+
+from prompt_builder import SEVERITY_LEVELS
+from timestamps import NO_TIMESTAMP, parse_epochs
+
+COLUMNAR_VERSION = 1
+LEVELS = ("unknown",) + tuple(dict.fromkeys(level for level, _ in SEVERITY_LEVELS))
+CONTEXT_COLUMNS = ("context_before", "context_after")
+# Parsed levels (syslog severities and common spellings) that are not in LEVELS themselves
+LEVEL_ALIASES = {"err": "error", "crit": "critical", "alert": "critical", "emerg": "fatal", "panic": "fatal",
+                 "failure": "fail"}
+
+def level_code(line, level=None):
+    """
+    Code of an error's level (index into LEVELS, 0 if none): its parsed
+    `level` when that is a known level, otherwise the most severe level
+    keyword in the error line.
+    """
+    if level is not None:
+        level = str(level).lower()
+        level = LEVEL_ALIASES.get(level, level)
+        if level in LEVELS[1:]:
+            return LEVELS.index(level)
+    line_lower = line.lower()
+    for code, level in enumerate(LEVELS[1:], 1):
+        if level in line_lower:
+            return code
+    return 0
+
+class _StringColumn:
+    """UTF-8 strings stored as one blob plus an array of row start offsets."""
+
+    def __init__(self):
+        self.offsets = array('Q', [0])
+        self.data = bytearray()
+
+    def append(self, text):
+        self.data += text.encode('utf-8')
+        self.offsets.append(len(self.data))
+
+class _ContextColumn:
+    """Context windows: per-row offsets into flat line number and content columns."""
+
+    def __init__(self):
+        self.offsets = array('Q', [0])
+        self.line_numbers = array('q')
+        self.content = _StringColumn()
+
+    def append(self, context):
+        for item in context:
+            self.line_numbers.append(item['line_number'])
+            self.content.append(item['content'])
+        self.offsets.append(len(self.line_numbers))
+
+def write_columnar(errors, output_file, log_file=None):
+    """
+    Write error records column by column: a JSON header line that maps every
+    buffer to its byte range, followed by the raw buffers. Readers seek to
+    the columns they need and load them with array.fromfile, without parsing.
+    Returns the number of rows written.
+    """
+    line_numbers = array('q')
+    timestamp_strings = []
+    levels = array('B')
+    error_lines = _StringColumn()
+    contexts = {name: _ContextColumn() for name in CONTEXT_COLUMNS}
+
+    for error in errors:
+        line_numbers.append(error['line_number'])
+        timestamp_strings.append(error.get('timestamp'))
+        levels.append(level_code(error['error_line'], error.get('level')))
+        error_lines.append(error['error_line'])
+        for name in CONTEXT_COLUMNS:
+            contexts[name].append(error[name])
+
+    timestamps = parse_epochs(timestamp_strings)  # Format detected once for the whole file
+
+    buffers = [
+        ("line_number", line_numbers),
+        ("timestamp", timestamps),
+        ("level", levels),
+        ("error_line.offsets", error_lines.offsets),
+        ("error_line.data", error_lines.data),
+    ]
+    for name in CONTEXT_COLUMNS:
+        buffers += [
+            (f"{name}.offsets", contexts[name].offsets),
+            (f"{name}.line_number", contexts[name].line_numbers),
+            (f"{name}.content.offsets", contexts[name].content.offsets),
+            (f"{name}.content.data", contexts[name].content.data),
+        ]
+
+    layout = {}
+    position = 0
+    for name, buffer in buffers:
+        typecode = buffer.typecode if isinstance(buffer, array) else 'B'
+        layout[name] = {"typecode": typecode, "offset": position, "count": len(buffer)}
+        position += len(buffer) * (buffer.itemsize if isinstance(buffer, array) else 1)
+
+    header = {
+        "version": COLUMNAR_VERSION,
+        "log_file": log_file,
+        "rows": len(line_numbers),
+        "byteorder": sys.byteorder,
+        "levels": list(LEVELS),
+        "no_timestamp": NO_TIMESTAMP,
+        "buffers": layout
+    }
+    temp_path = output_file + ".tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(json.dumps(header).encode('utf-8') + b"\n")
+        for _, buffer in buffers:
+            file.write(buffer)
+    os.replace(temp_path, output_file)
+    return len(line_numbers)
+
+class ColumnarReader:
+    """Load individual columns from a file written by write_columnar."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            header_line = file.readline()
+        self.header = json.loads(header_line.decode('utf-8'))
+        if self.header.get("version") != COLUMNAR_VERSION:
+            raise ValueError(f"Unsupported columnar file version: {self.header.get('version')}")
+        self.data_start = len(header_line)
+        self.rows = self.header["rows"]
+        self.levels = self.header["levels"]
+
+    def buffer(self, name):
+        """Raw buffer as an array (bytes for string data), read from its own byte range only."""
+        spec = self.header["buffers"][name]
+        with open(self.path, 'rb') as file:
+            file.seek(self.data_start + spec["offset"])
+            if name.endswith(".data"):
+                return file.read(spec["count"])
+            values = array(spec["typecode"])
+            values.fromfile(file, spec["count"])
+        if self.header["byteorder"] != sys.byteorder and values.itemsize > 1:
+            values.byteswap()
+        return values
+
+    def column(self, name):
+        """
+        Decoded column: arrays for line_number/timestamp/level, a list of
+        strings for error_line and lists of {"line_number", "content"} dicts
+        for the context columns.
+        """
+        if name in ("line_number", "timestamp", "level"):
+            return self.buffer(name)
+        if name == "error_line":
+            return self._strings("error_line")
+        if name in CONTEXT_COLUMNS:
+            offsets = self.buffer(f"{name}.offsets")
+            line_numbers = self.buffer(f"{name}.line_number")
+            contents = self._strings(f"{name}.content")
+            return [
+                [{"line_number": line_numbers[i], "content": contents[i]} for i in range(start, end)]
+                for start, end in zip(offsets, offsets[1:])
+            ]
+        raise KeyError(name)
+
+    def _strings(self, name):
+        offsets = self.buffer(f"{name}.offsets")
+        data = self.buffer(f"{name}.data")
+        return [data[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+
+def write_parquet(errors, output_file):
+    """Write error records as Parquet (requires the optional pyarrow package)."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("The 'parquet' output format requires: pip install pyarrow")
+
+    context_type = pa.list_(pa.struct([("line_number", pa.int64()), ("content", pa.string())]))
+    schema = pa.schema([
+        ("line_number", pa.int64()),
+        ("timestamp", pa.timestamp("s", tz="UTC")),
+        ("level", pa.dictionary(pa.int8(), pa.string())),
+        ("error_line", pa.string()),
+        ("context_before", context_type),
+        ("context_after", context_type),
+    ])
+
+    columns = {name: [] for name in schema.names}
+    for error in errors:
+        columns["line_number"].append(error['line_number'])
+        columns["timestamp"].append(error.get('timestamp'))
+        columns["level"].append(LEVELS[level_code(error['error_line'], error.get('level'))])
+        columns["error_line"].append(error['error_line'])
+        for name in CONTEXT_COLUMNS:
+            columns[name].append(error[name])
+
+    columns["timestamp"] = [None if epoch == NO_TIMESTAMP else epoch for epoch in parse_epochs(columns["timestamp"])]
+    pq.write_table(pa.Table.from_pydict(columns, schema=schema), output_file)
+    return len(columns["line_number"])
@@ -1,19 +1,56 @@
 # filepath: log-analysis-gemini/src/config.py
 
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+class _LazySettings(type):
+    def __getattr__(cls, name):
+        # First access: read the environment and .env once and keep the values as class attributes
+        if name.startswith("_") or "_loaded" in cls.__dict__:
+            raise AttributeError(name)
+        for key, value in load_config().items():
+            setattr(cls, key, value)
+        cls._loaded = True
+        return getattr(cls, name)
 
-class Config:
-    GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-    LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", os.path.join(os.path.dirname(__file__), "..", "logs", "default.log"))
-    ANALYSIS_OUTPUT_PATH = os.getenv("ANALYSIS_OUTPUT_PATH", os.path.join(os.path.dirname(__file__), "..", "output", "report.txt"))
+class Config(metaclass=_LazySettings):
+    """
+    The settings of load_config() as class attributes (Config.GEMINI_API_KEY, ...).
+    They are read on first access rather than at import, so importing this module stays cheap.
+    """
 
 def load_config():
+    # Read .env here rather than at import, so importing this module stays cheap
+    from dotenv import load_dotenv
+    load_dotenv()
+
     # Simple helper to return config as a dict for other modules to use
     return {
-        "GEMINI_API_KEY": Config.GEMINI_API_KEY,
-        "LOG_FILE_PATH": Config.LOG_FILE_PATH,
-        "ANALYSIS_OUTPUT_PATH": Config.ANALYSIS_OUTPUT_PATH,
-    }
\ No newline at end of file
+        "GEMINI_API_KEY": os.getenv("GEMINI_API_KEY"),
+        "LOG_FILE_PATH": os.getenv("LOG_FILE_PATH", os.path.join(os.path.dirname(__file__), "..", "logs", "default.log")),
+        "ANALYSIS_OUTPUT_PATH": os.getenv("ANALYSIS_OUTPUT_PATH", os.path.join(os.path.dirname(__file__), "..", "output", "report.txt")),
+        # Format of the saved error analysis: json, ndjson / csv (streamed), columnar or parquet
+        "ANALYSIS_OUTPUT_FORMAT": os.getenv("ANALYSIS_OUTPUT_FORMAT", "json"),
+        # Log layout: auto (detected per file), bracketed, syslog, json or keyvalue
+        "LOG_FORMAT": os.getenv("LOG_FORMAT", "auto"),
+        # Attach earlier lines for the same IMSI / session / TEID / IP to each error (streaming scan)
+        "CORRELATE_ENTITIES": os.getenv("CORRELATE_ENTITIES", "false").lower() in ("1", "true", "yes"),
+        # Worker processes for batch (directory) analysis; 0 means one per CPU core
+        "ANALYSIS_WORKERS": int(os.getenv("ANALYSIS_WORKERS", "0")) or None,
+        # Optional deep-dive capture written next to the results: "cprofile" or "tracemalloc"
+        "PROFILE_MODE": os.getenv("PROFILE_MODE", "").strip().lower(),
+        # Resident HTTP service (python src/start.py serve): bind address, concurrent jobs and queue length
+        "SERVICE_HOST": os.getenv("SERVICE_HOST", "127.0.0.1"),
+        "SERVICE_PORT": int(os.getenv("SERVICE_PORT", "8765")),
+        "SERVICE_MAX_JOBS": int(os.getenv("SERVICE_MAX_JOBS", "2")),
+        "SERVICE_MAX_QUEUED": int(os.getenv("SERVICE_MAX_QUEUED", "32")),
+        # Hard size cap for llm_input.txt; lower-priority errors are dropped beyond it
+        "LLM_MAX_CHARS": int(os.getenv("LLM_MAX_CHARS", "400000")),
+        # Gemini batching: approximate tokens of error data per request and requests in flight
+        "GEMINI_BATCH_TOKENS": int(os.getenv("GEMINI_BATCH_TOKENS", "30000")),
+        "GEMINI_MAX_CONCURRENCY": int(os.getenv("GEMINI_MAX_CONCURRENCY", "4")),
+        "GEMINI_MAX_RETRIES": int(os.getenv("GEMINI_MAX_RETRIES", "4")),
+        # On-disk cache of Gemini analyses keyed by normalized error signature
+        "GEMINI_CACHE_DIR": os.getenv("GEMINI_CACHE_DIR", os.path.join(os.path.dirname(__file__), "..", "cache", "gemini")),
+        "GEMINI_CACHE_MAX_ENTRIES": int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "5000")),
+        "GEMINI_CACHE_TTL_HOURS": float(os.getenv("GEMINI_CACHE_TTL_HOURS", "168")),
+    }
@@ -0,0 +1,100 @@
+# filepath: log-analysis-gemini/src/entities.py
+
+import re
+from collections import OrderedDict, deque
+
+_DIGIT_DOT_DIGIT = re.compile(r'\d\.\d')
+
+def _may_contain_ip(lowered):
+    """Cheap IP pre-check: a '.' alone would send nearly every prose line to the full IP regex."""
+    return '.' in lowered and _DIGIT_DOT_DIGIT.search(lowered) is not None
+
+# (kind, marker, pattern) run on the lowercased line, and only if it contains the marker
+# (a literal, or a pre-check function for IPs).
+# The patterns follow the masks in signatures.py; each starts with a literal so the regex engine can skip ahead.
+ENTITY_PATTERNS = (
+    ("imsi", "imsi-", re.compile(r'imsi-(\d{5,15})\b')),
+    ("session", "session", re.compile(r'session(?:,?\s+id)?\s*[:=#]\s*(\d+)\b')),
+    ("teid", "teid", re.compile(r'teid\s*[=:]?\s*(0x[0-9a-f]+|\d+)\b')),
+    ("ip", _may_contain_ip, re.compile(r'\b(\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})\b(?!\.\d)')),
+)
+MAX_ENTITIES = 20000  # Entities tracked at once; the least recently seen are evicted first
+LINES_PER_ENTITY = 8  # Most recent lines kept per entity
+MAX_RELATED_LINES = 10  # Correlated lines attached to each error
+
+def extract_entities(line):
+    """Return the (kind, value) entities mentioned in a line, grouped by kind and without duplicates."""
+    lowered = line.lower()
+    entities = []
+    for kind, marker, pattern in ENTITY_PATTERNS:
+        if marker in lowered if isinstance(marker, str) else marker(lowered):
+            for value in pattern.findall(lowered):
+                entity = (kind, value)
+                if entity not in entities:
+                    entities.append(entity)
+    return entities
+
+class EntityIndex:
+    """
+    Bounded index from entities (IMSI, PDU session ID, TEID, IPv4 address)
+    to the most recent lines that mention them, built while scanning.
+    The scanner's (line_number, content) pairs are stored as is, so lines
+    also held in context windows are not copied. Memory is capped at
+    `max_entities` x `lines_per_entity` lines: each entity keeps its last
+    `lines_per_entity` lines and the least recently seen entity is evicted
+    when a new one would exceed `max_entities`.
+    """
+
+    def __init__(self, max_entities=MAX_ENTITIES, lines_per_entity=LINES_PER_ENTITY,
+                 max_related=MAX_RELATED_LINES):
+        self.max_entities = max_entities
+        self.lines_per_entity = lines_per_entity
+        self.max_related = max_related
+        self.lines = OrderedDict()  # (kind, value) -> deque of (line_number, content)
+        self.evicted = 0
+
+    def __len__(self):
+        return len(self.lines)
+
+    def add(self, numbered_line, entities=None):
+        """Record a line under each entity it mentions (pass `entities` if already extracted)."""
+        if entities is None:
+            entities = extract_entities(numbered_line[1])
+        for entity in entities:
+            lines = self.lines.get(entity)
+            if lines is None:
+                if len(self.lines) >= self.max_entities:
+                    self.lines.popitem(last=False)
+                    self.evicted += 1
+                lines = self.lines[entity] = deque(maxlen=self.lines_per_entity)
+            else:
+                self.lines.move_to_end(entity)
+            lines.append(numbered_line)
+
+    def related(self, entities, before_line):
+        """The last `max_related` indexed lines for any of `entities` that come before line `before_line`."""
+        related = {}
+        for entity in entities:
+            for numbered_line in self.lines.get(entity, ()):
+                if numbered_line[0] < before_line:
+                    related[numbered_line[0]] = numbered_line
+        return [related[line_number] for line_number in sorted(related)[-self.max_related:]]
+
+    def annotate(self, error_data, context_lines):
+        """
+        Attach the error line's entities and their earlier lines to a record,
+        as 'entities' ({kind: [values]}) and 'correlated_context' (lines
+        before its context_before window, in the context dict form). Returns
+        the extracted entities so the caller can index the line with them.
+        """
+        entities = extract_entities(error_data.error_line)
+        if entities:
+            grouped = {}
+            for kind, value in entities:
+                grouped.setdefault(kind, []).append(value)
+            error_data['entities'] = grouped
+            error_data['correlated_context'] = [
+                {'line_number': line_number, 'content': content}
+                for line_number, content in self.related(entities, error_data.line_number - context_lines)
+            ]
+        return entities
@@ -0,0 +1,164 @@
+# filepath: log-analysis-gemini/src/follow.py
+
+import hashlib
+import json
+import os
+import time
+from collections import deque
+
+from analyzer import _decode_lines
+from entities import EntityIndex
+from records import ErrorRecord, record_to_json
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+TAIL_CHECK_BYTES = 256  # Bytes before the checkpoint offset hashed to detect rewritten files
+FLUSH_AFTER_SECONDS = 60.0  # Errors still waiting for trailing context this long are reported with what they have
+
+class LogFollower:
+    """
+    Incrementally analyze an append-only log file.
+    Each poll() reads only the bytes appended since the last checkpoint and
+    returns the error records completed by them. The checkpoint stores the
+    file's inode, byte offset and line number plus the context ring buffer
+    and the errors still waiting for trailing context, so it survives
+    restarts, log rotation and truncation. An error that has waited
+    `flush_after` seconds for its trailing context (a quiet or crashed
+    service) is reported with the context it has.
+    """
+
+    def __init__(self, analyzer, log_file_path, context_lines=3, checkpoint_path=None,
+                 flush_after=FLUSH_AFTER_SECONDS):
+        self.analyzer = analyzer
+        self.log_file_path = log_file_path
+        self.context_lines = context_lines
+        self.checkpoint_path = checkpoint_path or log_file_path + CHECKPOINT_SUFFIX
+        self.flush_after = flush_after
+        # Kept in memory across polls (not checkpointed); rebuilt from new lines after a restart
+        self.entity_index = EntityIndex() if analyzer.correlate else None
+
+    def poll(self):
+        """Analyze newly appended data and return the list of completed error records."""
+        state = self._load_checkpoint()
+        context_before = deque((tuple(line) for line in state["context_before"]), maxlen=self.context_lines)
+        pending = deque(ErrorRecord.from_dict(error) for error in state["pending"])
+        now = time.time()
+        # When each pending error was found (older checkpoints do not have it)
+        pending_since = state.get("pending_since") or [now] * len(pending)
+        found_at = {id(error): since for error, since in zip(pending, pending_since)}
+        completed = []
+
+        try:
+            stat = os.stat(self.log_file_path)
+        except FileNotFoundError:
+            return completed  # Between rotation and the new file being created
+
+        rotated = state["inode"] is not None and stat.st_ino != state["inode"]
+        # Truncated (possibly already refilled past the old offset, as with copytruncate)
+        truncated = state["inode"] is not None and not rotated and (
+            stat.st_size < state["offset"]
+            or self._tail_hash(self.log_file_path, state["offset"]) != state.get("tail_hash")
+        )
+
+        if rotated:
+            # Finish the rotated file first if it is still in the same directory
+            old_file_path = self._find_rotated_file(state["inode"])
+            if old_file_path:
+                self._scan(old_file_path, state["offset"], state["line_number"], context_before, pending, completed)
+
+        if rotated or truncated:
+            # A new file starts: pending errors keep the trailing context they already have
+            completed.extend(pending)
+            pending.clear()
+            context_before.clear()
+            state["offset"], state["line_number"] = 0, 0
+
+        offset, line_number = self._scan(
+            self.log_file_path, state["offset"], state["line_number"], context_before, pending, completed
+        )
+
+        # Pending errors are in line order, so the ones waiting longest are on the left
+        pending_since = [found_at.get(id(error), now) for error in pending]
+        while pending and now - pending_since[0] >= self.flush_after:
+            completed.append(pending.popleft())
+            pending_since.pop(0)
+
+        self._save_checkpoint({
+            "log_file": self.log_file_path,
+            "inode": stat.st_ino,
+            "offset": offset,
+            "tail_hash": self._tail_hash(self.log_file_path, offset),
+            "line_number": line_number,
+            "context_lines": self.context_lines,
+            "context_before": list(context_before),
+            "pending": list(pending),
+            "pending_since": pending_since
+        })
+        return completed
+
+    def follow(self, interval=5.0, max_polls=None):
+        """Poll forever (or max_polls times), yielding each non-empty batch of new errors."""
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            errors = self.poll()
+            if errors:
+                yield errors
+            polls += 1
+            if max_polls is None or polls < max_polls:
+                time.sleep(interval)
+
+    def _scan(self, log_file_path, offset, line_number, context_before, pending, completed):
+        """Scan complete lines from `offset`; returns the new (offset, line_number)."""
+        position = offset
+
+        def new_lines():
+            nonlocal position, line_number
+            with open(log_file_path, 'rb') as file:
+                file.seek(offset)
+                for raw_line in file:
+                    if not raw_line.endswith(b'\n'):
+                        break  # Partial line still being written; read it next time
+                    position += len(raw_line)
+                    for line in _decode_lines(raw_line):
+                        line_number += 1
+                        yield line_number, line
+
+        completed.extend(self.analyzer._stream_errors(
+            new_lines(), self.context_lines, context_before, pending, flush=False,
+            log_format=self.analyzer.resolve_log_format(log_file_path), entity_index=self.entity_index
+        ))
+        return position, line_number
+
+    def _tail_hash(self, log_file_path, offset):
+        """Hash of the bytes just before `offset`, to check the file was only appended to."""
+        start = max(0, offset - TAIL_CHECK_BYTES)
+        with open(log_file_path, 'rb') as file:
+            file.seek(start)
+            return hashlib.blake2b(file.read(offset - start), digest_size=8).hexdigest()
+
+    def _find_rotated_file(self, inode):
+        """Look for the file that used to be the log (e.g. renamed to app.log.1) by its inode."""
+        log_dir = os.path.dirname(os.path.abspath(self.log_file_path))
+        for name in os.listdir(log_dir):
+            path = os.path.join(log_dir, name)
+            try:
+                if os.path.isfile(path) and os.stat(path).st_ino == inode:
+                    return path
+            except OSError:
+                continue
+        return None
+
+    def _load_checkpoint(self):
+        """Load the saved state, or a fresh state that starts at the beginning of the file."""
+        if os.path.exists(self.checkpoint_path):
+            try:
+                with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                pass  # Corrupt checkpoint: start over
+        return {"inode": None, "offset": 0, "tail_hash": None, "line_number": 0, "context_before": [], "pending": []}
+
+    def _save_checkpoint(self, state):
+        temp_path = self.checkpoint_path + ".tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, default=record_to_json)
+        os.replace(temp_path, self.checkpoint_path)
@@ -0,0 +1,148 @@
+# filepath: log-analysis-gemini/src/line_index.py
+
+import hashlib
+import json
+import os
+import sys
+from array import array
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+SAMPLE_SIZE = 64 * 1024  # Bytes hashed from the head and tail of the log file
+
+def default_index_path(log_file_path, index_dir=None):
+    """
+    Sidecar index path stored next to the log file, or in `index_dir`
+    (named after a hash of the log's absolute path) when one is given.
+    """
+    if index_dir is None:
+        return log_file_path + INDEX_SUFFIX
+    path_hash = hashlib.blake2b(os.path.abspath(log_file_path).encode('utf-8'), digest_size=8).hexdigest()
+    return os.path.join(index_dir, f"{os.path.basename(log_file_path)}.{path_hash}{INDEX_SUFFIX}")
+
+def file_fingerprint(log_file_path):
+    """Identify a log file version by size, mtime and a hash of its first and last 64 KB."""
+    stat = os.stat(log_file_path)
+    digest = hashlib.blake2b(digest_size=16)
+    with open(log_file_path, 'rb') as file:
+        digest.update(file.read(SAMPLE_SIZE))
+        if stat.st_size > SAMPLE_SIZE:
+            file.seek(max(SAMPLE_SIZE, stat.st_size - SAMPLE_SIZE))
+            digest.update(file.read(SAMPLE_SIZE))
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "content_hash": digest.hexdigest()
+    }
+
+class LineIndex:
+    """
+    Byte offsets of every `stride`-th line of a log file, plus the error line
+    numbers found for each pattern set, so context windows can be read by
+    seeking instead of rescanning the file.
+    """
+
+    def __init__(self, fingerprint, line_starts, line_count, stride, error_lines=None):
+        self.fingerprint = fingerprint
+        self.line_starts = line_starts  # array('Q'): offset of lines 1, 1 + stride, ...
+        self.line_count = line_count
+        self.stride = stride
+        self.error_lines = error_lines if error_lines is not None else {}  # pattern signature -> array('Q')
+
+    @classmethod
+    def build(cls, log_file_path, stride=32):
+        """Scan the file once and record the offset of every `stride`-th line."""
+        fingerprint = file_fingerprint(log_file_path)
+        line_starts = array('Q')
+        line_count = 0
+        position = 0
+
+        with open(log_file_path, 'rb') as file:
+            for line_count, raw_line in enumerate(file, 1):
+                if (line_count - 1) % stride == 0:
+                    line_starts.append(position)
+                position += len(raw_line)
+
+        return cls(fingerprint, line_starts, line_count, stride)
+
+    @classmethod
+    def load(cls, index_path):
+        """Load an index file, or return None if it is missing or unreadable."""
+        try:
+            with open(index_path, 'rb') as file:
+                header = json.loads(file.readline().decode('utf-8'))
+                if header.get("version") != INDEX_VERSION:
+                    return None
+
+                def read_array(length):
+                    values = array('Q')
+                    values.fromfile(file, length)
+                    if header["byteorder"] != sys.byteorder:
+                        values.byteswap()
+                    return values
+
+                line_starts = read_array(header["line_starts"])
+                error_lines = {
+                    signature: read_array(length)
+                    for signature, length in header["error_lines"].items()
+                }
+        except (OSError, ValueError, KeyError, EOFError):
+            return None
+
+        return cls(header["fingerprint"], line_starts, header["line_count"], header["stride"], error_lines)
+
+    def save(self, index_path):
+        """Write the index: one JSON header line followed by the raw offset arrays."""
+        header = {
+            "version": INDEX_VERSION,
+            "fingerprint": self.fingerprint,
+            "line_count": self.line_count,
+            "stride": self.stride,
+            "byteorder": sys.byteorder,
+            "line_starts": len(self.line_starts),
+            "error_lines": {signature: len(lines) for signature, lines in self.error_lines.items()}
+        }
+        temp_path = index_path + ".tmp"
+        with open(temp_path, 'wb') as file:
+            file.write(json.dumps(header).encode('utf-8') + b"\n")
+            self.line_starts.tofile(file)
+            for lines in self.error_lines.values():
+                lines.tofile(file)
+        os.replace(temp_path, index_path)
+
+    def is_current(self, log_file_path):
+        """Check the index still describes the file (size, mtime and content hash)."""
+        try:
+            return file_fingerprint(log_file_path) == self.fingerprint
+        except OSError:
+            return False
+
+    def read_raw_lines(self, file, first_line, last_line):
+        """Read lines first_line..last_line (1-based, inclusive) as bytes from an open binary file."""
+        first_line = max(first_line, 1)
+        last_line = min(last_line, self.line_count)
+        if first_line > last_line:
+            return []
+
+        checkpoint, skip = divmod(first_line - 1, self.stride)
+        file.seek(self.line_starts[checkpoint])
+        for _ in range(skip):
+            file.readline()
+        return [file.readline() for _ in range(last_line - first_line + 1)]
+
+def load_or_build_index(log_file_path, index_path=None, stride=32):
+    """
+    Return (index, index_path) for a log file, rebuilding the index when it is
+    missing or stale. A freshly built index is saved if the location is writable.
+    """
+    index_path = index_path or default_index_path(log_file_path)
+    index = LineIndex.load(index_path)
+    if index is not None and index.is_current(log_file_path):
+        return index, index_path
+
+    index = LineIndex.build(log_file_path, stride)
+    try:
+        index.save(index_path)
+    except OSError:
+        pass  # The index is only an optimization; keep going without a sidecar file
+    return index, index_path
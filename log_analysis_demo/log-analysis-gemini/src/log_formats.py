@@ -0,0 +1,282 @@
+# filepath: log-analysis-gemini/src/log_formats.py
+
+import json
+import re
+
+from log_sources import open_log_text
+from timestamps import detect_line_format, extract_timestamp
+
+ERROR_LEVELS = {"error", "err", "exception", "fail", "failure", "fatal", "critical", "crit", "alert", "emerg", "panic"}
+SYSLOG_SEVERITIES = ["emerg", "alert", "crit", "err", "warning", "notice", "info", "debug"]
+LEVEL_KEYS = ("level", "severity", "lvl", "loglevel", "log.level")
+TIMESTAMP_KEYS = ("timestamp", "time", "ts", "@timestamp", "date", "datetime")
+MESSAGE_KEYS = ("message", "msg", "log", "text")
+COMPONENT_KEYS = ("component", "nf", "service", "logger", "module", "app")
+SAMPLE_BYTES = 8192  # Read from the start of a file to detect its format
+MIN_DETECTED_SHARE = 0.5  # Share of sampled lines a format must parse to be chosen
+
+def normalize_timestamp(value):
+    """ISO 8601 / RFC 3339 timestamps become 'YYYY-MM-DD HH:MM:SS' (the layout timestamps.py parses)."""
+    if isinstance(value, str) and len(value) >= 19 and value[4] == '-' and value[10] in 'T ' and value[13] == ':':
+        return value[:10] + ' ' + value[11:19]
+    return value
+
+def _first(fields, keys):
+    for key in keys:
+        value = fields.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+def _level_of_matches(matches):
+    """The level among regex (key, value) matches, picked by LEVEL_KEYS priority as parse() does."""
+    return _first(dict(matches), LEVEL_KEYS)
+
+class LogFormat:
+    """
+    One log layout. parse(line) returns {"timestamp", "level", "component",
+    "message"} or None if the line does not have this layout. Formats whose
+    lines carry the level in "[LEVEL]" brackets set `uses_matcher` and are
+    classified by the analyzer's pattern matcher (and can use every
+    scanner); the others classify lines by their parsed level.
+    for_file(sample_lines) returns the instance to use for one file.
+    """
+
+    name = None
+    uses_matcher = False
+
+    def parse(self, line):
+        raise NotImplementedError
+
+    def for_file(self, sample_lines):
+        """This format set up for a file whose first lines are `sample_lines`; stateless formats return self."""
+        return self
+
+    def level(self, line):
+        fields = self.parse(line)
+        return fields["level"] if fields else None
+
+    def timestamp(self, line):
+        fields = self.parse(line)
+        return fields["timestamp"] if fields else None
+
+    def record_fields(self, line):
+        """(timestamp, level, component) stored on an error record, from a single parse."""
+        fields = self.parse(line)
+        if fields is None:
+            return self.timestamp(line), None, None
+        return fields["timestamp"], fields["level"], fields["component"]
+
+    def is_error_line(self, line, matcher):
+        """Classify by the parsed level; lines without one fall back to the pattern matcher."""
+        level = self.level(line)
+        if level is None:
+            return matcher.is_error_line(line)
+        return str(level).lower() in ERROR_LEVELS
+
+class BracketedFormat(LogFormat):
+    """
+    5G NF logs: 'YYYY-MM-DD HH:MM:SS [LEVEL] [COMPONENT] message' (component optional).
+    The fixed-width timestamp prefix is sliced directly; other lines fall back
+    to the first bracketed token as the level. Record timestamps are searched
+    with the one timestamp pattern detected for the file (all of them if it
+    is unknown), so lines in another timestamp layout get none.
+    """
+
+    name = "bracketed"
+    uses_matcher = True
+
+    def __init__(self, timestamp_format=None):
+        self.timestamp_format = timestamp_format
+
+    def for_file(self, sample_lines):
+        return type(self)(detect_line_format(sample_lines))
+
+    def parse(self, line):
+        if len(line) > 21 and line[19] == ' ' and line[20] == '[' and line[4] == '-' and line[13] == ':':
+            timestamp = line[:19]
+            start = 21
+        else:
+            start = line.find('[') + 1
+            if not start:
+                return None
+            timestamp = extract_timestamp(line, self.timestamp_format)
+        end = line.find(']', start)
+        if end == -1:
+            return None
+
+        message = line[end + 1:].lstrip()
+        component = None
+        if message.startswith('['):
+            close = message.find(']')
+            if close > 0:
+                component = message[1:close]
+                message = message[close + 1:].lstrip()
+        return {"timestamp": timestamp, "level": line[start:end], "component": component, "message": message}
+
+    def timestamp(self, line):
+        return extract_timestamp(line, self.timestamp_format)  # What error records have always used
+
+    def record_fields(self, line):
+        fields = self.parse(line)
+        timestamp = extract_timestamp(line, self.timestamp_format)
+        if fields is None:
+            return timestamp, None, None
+        return timestamp, fields["level"], fields["component"]
+
+class SyslogFormat(LogFormat):
+    """
+    Syslog lines, RFC 3164 ('<PRI>Mmm dd hh:mm:ss host tag[pid]: message', PRI
+    optional) and RFC 5424 ('<PRI>1 timestamp host app procid msgid sd message').
+    The level is the PRI severity, or a leading LEVEL word of the message.
+    """
+
+    name = "syslog"
+    _rfc3164 = re.compile(r'[A-Z][a-z]{2} [ \d]\d \d{2}:\d{2}:\d{2}$')
+    _message_level = re.compile(r'\[?([A-Za-z]+)\]?:?(?:\s|$)')
+
+    def parse(self, line):
+        severity = None
+        rest = line
+        if line.startswith('<'):
+            close = line.find('>', 1, 5)
+            if close == -1 or not line[1:close].isdigit():
+                return None
+            severity = SYSLOG_SEVERITIES[int(line[1:close]) & 7]
+            rest = line[close + 1:]
+
+        if rest.startswith('1 '):
+            parts = rest.split(' ', 6)
+            if len(parts) < 6:
+                return None
+            timestamp = normalize_timestamp(parts[1])
+            component = parts[3]
+            message = parts[6] if len(parts) > 6 else ""
+            if message.startswith('['):
+                close = message.find('] ')
+                message = message[close + 2:] if close != -1 else ""
+            elif message.startswith('- '):
+                message = message[2:]
+        else:
+            # RFC 3164: fixed-width 'Mmm dd hh:mm:ss' prefix
+            if len(rest) < 17 or not self._rfc3164.match(rest[:15]):
+                return None
+            timestamp = rest[:15]
+            host_end = rest.find(' ', 16)
+            if host_end == -1:
+                return None
+            tag_end = rest.find(': ', host_end + 1)
+            if tag_end == -1:
+                component, message = None, rest[host_end + 1:]
+            else:
+                component, message = rest[host_end + 1:tag_end].split('[')[0], rest[tag_end + 2:]
+
+        level = severity
+        if level is None:
+            match = self._message_level.match(message)
+            if match and match.group(1).lower() in ERROR_LEVELS | {"warning", "warn", "info", "debug", "notice"}:
+                level = match.group(1)
+        return {"timestamp": timestamp, "level": level, "component": component, "message": message}
+
+class JsonLinesFormat(LogFormat):
+    """One JSON object per line; the level is read with a regex before any full json.loads."""
+
+    name = "json"
+    _level = re.compile(r'"(%s)"\s*:\s*"([^"]*)"' % "|".join(re.escape(key) for key in LEVEL_KEYS))
+
+    def parse(self, line):
+        if not line.startswith('{'):
+            return None
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            return None
+        if not isinstance(fields, dict):
+            return None
+        return {
+            "timestamp": normalize_timestamp(_first(fields, TIMESTAMP_KEYS)),
+            "level": _first(fields, LEVEL_KEYS),
+            "component": _first(fields, COMPONENT_KEYS),
+            "message": _first(fields, MESSAGE_KEYS)
+        }
+
+    def level(self, line):
+        return _level_of_matches(self._level.findall(line))
+
+class KeyValueFormat(LogFormat):
+    """logfmt-style 'time=... level=error component=smf msg="quoted text"' lines."""
+
+    name = "keyvalue"
+    _pair = re.compile(r'([\w.@]+)=("(?:[^"\\]|\\.)*"|\S*)')
+    _level = re.compile(r'(?:^|\s)(%s)="?(\w+)' % "|".join(re.escape(key) for key in LEVEL_KEYS))
+
+    def parse(self, line):
+        fields = {}
+        for key, value in self._pair.findall(line):
+            if value.startswith('"'):
+                value = value[1:-1].replace('\\"', '"').replace('\\\\', '\\')
+            fields[key] = value
+        if len(fields) < 2 or not (_first(fields, LEVEL_KEYS) or _first(fields, MESSAGE_KEYS)):
+            return None
+        return {
+            "timestamp": normalize_timestamp(_first(fields, TIMESTAMP_KEYS)),
+            "level": _first(fields, LEVEL_KEYS),
+            "component": _first(fields, COMPONENT_KEYS),
+            "message": _first(fields, MESSAGE_KEYS)
+        }
+
+    def level(self, line):
+        return _level_of_matches(self._level.findall(line))
+
+# Tried in this order during detection; bracketed (the original layout) is the fallback
+LOG_FORMATS = {
+    "json": JsonLinesFormat(),
+    "syslog": SyslogFormat(),
+    "keyvalue": KeyValueFormat(),
+    "bracketed": BracketedFormat(),
+}
+
+def register_log_format(log_format):
+    """Add a LogFormat instance (a new layout) to detection and to get_log_format()."""
+    LOG_FORMATS[log_format.name] = log_format
+    # Keep the lenient bracketed fallback last
+    LOG_FORMATS["bracketed"] = LOG_FORMATS.pop("bracketed")
+
+def get_log_format(name):
+    if name not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format: {name} (available: auto, {', '.join(LOG_FORMATS)})")
+    return LOG_FORMATS[name]
+
+def detect_log_format(lines):
+    """Pick the format that parses the largest share of the (non-empty) sample lines."""
+    lines = [line for line in lines if line.strip()]
+    best, best_share = LOG_FORMATS["bracketed"], 0.0
+    for log_format in LOG_FORMATS.values():
+        if not lines:
+            break
+        share = sum(1 for line in lines if log_format.parse(line) is not None) / len(lines)
+        if share > best_share:
+            best, best_share = log_format, share
+    return best if best_share >= MIN_DETECTED_SHARE else LOG_FORMATS["bracketed"]
+
+def read_sample_lines(log_file_path, sample_bytes=SAMPLE_BYTES):
+    """The complete lines in the first few KB of a (plain or compressed) log file."""
+    with open_log_text(log_file_path) as file:
+        sample = file.read(sample_bytes)
+    lines = sample.splitlines()
+    if len(sample) == sample_bytes and len(lines) > 1:
+        lines = lines[:-1]  # The last line may be cut off
+    return lines
+
+def detect_file_format(log_file_path, sample_bytes=SAMPLE_BYTES):
+    """Detect the format of a (plain or compressed) log file from its first few KB, set up for that file."""
+    lines = read_sample_lines(log_file_path, sample_bytes)
+    return detect_log_format(lines).for_file(lines)
+
+def parse_log_line(line):
+    """Parse one line with the first format that accepts it (for lines whose file format is unknown)."""
+    for log_format in LOG_FORMATS.values():
+        fields = log_format.parse(line)
+        if fields is not None:
+            return fields
+    return None
@@ -0,0 +1,128 @@
+# filepath: log-analysis-gemini/src/log_sources.py
+
+import bz2
+import gzip
+import io
+import lzma
+import queue
+import threading
+
+# Detected from the first bytes of the file, so renamed or extension-less rotations work too
+COMPRESSION_MAGIC = (
+    (b'\x1f\x8b', "gzip"),
+    *((b'BZh%d' % block_size, "bz2") for block_size in range(1, 10)),  # "BZh" and the block size digit
+    (b'\x28\xb5\x2f\xfd', "zstd"),
+    (b'\xfd7zXZ\x00', "xz"),
+)
+CHUNK_SIZE = 1024 * 1024  # Decompressed bytes per queue item
+QUEUE_CHUNKS = 8  # At most this many chunks are decompressed ahead of the scanner
+
+def detect_compression(log_file_path):
+    """Return "gzip", "bz2", "zstd" or "xz" from the file's magic bytes, or None for plain text."""
+    with open(log_file_path, 'rb') as file:
+        head = file.read(6)
+    for magic, compression in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return compression
+    return None
+
+def is_compressed(log_file_path):
+    """True for log files that must be decompressed before scanning."""
+    return detect_compression(log_file_path) is not None
+
+def open_decompressed(log_file_path, compression):
+    """Open a compressed log file as a binary stream of decompressed bytes."""
+    if compression == "gzip":
+        return gzip.open(log_file_path, 'rb')
+    if compression == "bz2":
+        return bz2.open(log_file_path, 'rb')
+    if compression == "xz":
+        return lzma.open(log_file_path, 'rb')
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError("Reading zstd-compressed logs requires: pip install zstandard")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(open(log_file_path, 'rb'), closefd=True))
+    raise ValueError(f"Unsupported compression: {compression}")
+
+class DecompressingReader(io.RawIOBase):
+    """
+    Read a decompressing stream on a background thread.
+    The thread fills a bounded queue with decompressed chunks while the
+    caller classifies lines, so decompression overlaps with scanning (zlib,
+    bz2 and lzma release the GIL while they work). The bound keeps memory
+    flat when the scanner is the slower side.
+    """
+
+    def __init__(self, source, chunk_size=CHUNK_SIZE, queue_chunks=QUEUE_CHUNKS):
+        super().__init__()
+        self._source = source
+        self._queue = queue.Queue(maxsize=queue_chunks)
+        self._stop = threading.Event()
+        self._chunk = memoryview(b'')
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce, args=(chunk_size,), daemon=True)
+        self._thread.start()
+
+    def _produce(self, chunk_size):
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(chunk_size)
+                self._put(chunk)
+                if not chunk:
+                    return  # b'' tells the reader the stream has ended
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item):
+        # Give up if the reader is closed while the queue is full
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._chunk:
+            if self._eof:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._eof = True
+                raise item
+            if not item:
+                self._eof = True
+                return 0
+            self._chunk = memoryview(item)
+
+        size = min(len(buffer), len(self._chunk))
+        buffer[:size] = self._chunk[:size]
+        self._chunk = self._chunk[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+def open_log_text(log_file_path, threaded=True):
+    """
+    Open a plain or compressed (gzip, bz2, zstd, xz) log file for reading
+    text lines. Compressed files are decompressed while they are read, never
+    to disk; with `threaded`, decompression runs ahead on a background thread.
+    """
+    compression = detect_compression(log_file_path)
+    if compression is None:
+        return open(log_file_path, 'r', encoding='utf-8', errors='ignore')
+
+    stream = open_decompressed(log_file_path, compression)
+    if threaded:
+        stream = io.BufferedReader(DecompressingReader(stream), buffer_size=CHUNK_SIZE)
+    return io.TextIOWrapper(stream, encoding='utf-8', errors='ignore')
@@ -1,7 +1,50 @@
+import hashlib
+import json
 import os
-from config import load_config
+import re
+import sys
 from analyzer import LogAnalyzer
-from api.gemini_client import GeminiClient
+from clustering import cluster_errors
+from timestamps import error_timeline
+from metrics import Metrics, profile_run
+from records import record_to_json
+
+# The Gemini client (asyncio), batch mode (process pools) and follow mode are
+# imported inside the functions that use them, so a local-only run starts fast
+
+GEMINI_PROMPT_TEMPLATE = """You are an expert 5G Core Network engineer. You will analyze the following error data extracted from 5G network logs.
+
+Follow these rules strictly:
+
+1. Analyze each ERROR provided in the data below.
+2. For each ERROR:
+   - Print the error number and line information.
+   - Provide a concise explanation of what the error means.
+   - Use the context provided (lines before/after) to infer the possible root cause.
+3. Suggest practical next steps or troubleshooting actions an engineer should take.
+4. Output format must be structured like this:
+
+[ERROR #1]
+Line: <line number>
+Message: <exact error log>
+Explanation: <short explanation>
+Context Analysis: <reasoning from nearby logs>
+Suggested Fix: <practical step>
+
+[ERROR #2]
+...
+
+At the end, provide a short summary of recurring issues or patterns.
+
+ERROR DATA:
+{llm_formatted_data}
+
+"""
+
+# Parsing of the structured response, so each error's analysis can be cached by signature
+ERROR_SECTION_HEADER = re.compile(r'^\W*\[ERROR #(\d+)\]\W*$', re.MULTILINE)
+SUMMARY_HEADER = re.compile(r'^\W*(?:overall\s+|final\s+)?summary\b', re.IGNORECASE | re.MULTILINE)
+PER_OCCURRENCE_FIELDS = re.compile(r'^\W*(?:Line|Message)\s*:.*\n?', re.IGNORECASE | re.MULTILINE)
 
 def find_available_log_files(logs_dir):
     """Find all .txt files in the logs directory."""
@@ -15,8 +58,13 @@ def find_available_log_files(logs_dir):
     
     return sorted(txt_files, key=os.path.getmtime, reverse=True)  # Most recent first
 
-def select_log_file(logs_dir):
-    """Find and select a log file to analyze."""
+def select_log_file(logs_dir, interactive=None):
+    """
+    Find and select a log file to analyze.
+    Only prompts for a choice when interactive (by default: stdin is a terminal).
+    """
+    if interactive is None:
+        interactive = sys.stdin.isatty()
     available_files = find_available_log_files(logs_dir)
 
     if not available_files:
@@ -39,6 +87,8 @@ def select_log_file(logs_dir):
         print(f"\nAuto-selected most recent: {os.path.basename(selected_file)}")
 
         # Optional: Allow manual selection
+        if not interactive:
+            return selected_file
         try:
             choice = input("\nPress Enter to use auto-selected file, or enter file number: ").strip()
             if choice and choice.isdigit():
@@ -51,8 +101,8 @@ def select_log_file(logs_dir):
 
     return selected_file
 
-def print_analysis_summary(analysis_data):
-    """Print a summary of the analysis results."""
+def print_analysis_summary(analysis_data, clusters=None, timeline=None):
+    """Print a summary of the analysis results (and of the error clusters and timeline, if given)."""
     if not analysis_data or "error" in analysis_data:
         return
 
@@ -66,13 +116,11 @@ def print_analysis_summary(analysis_data):
     print(f"\n📊 Analysis Summary:")
     print(f"   • Total errors: {total_errors}")
 
-    # Count error types
+    # Count error types by the level the scanner parsed with the file's log format
     error_types = {}
     for error in errors:
-        error_line = error.get('error_line', '')
-        # Extract log level from error line
-        if '[' in error_line and ']' in error_line:
-            level = error_line.split('[')[1].split(']')[0]
+        level = error.get('level')
+        if level:
             error_types[level] = error_types.get(level, 0) + 1
 
     if error_types:
@@ -80,98 +128,389 @@ def print_analysis_summary(analysis_data):
         for level, count in error_types.items():
             print(f"     - {level}: {count}")
 
+    # Errors per network function (batch mode over several files)
+    network_functions = {}
+    for error in errors:
+        if 'source_file' in error:
+            network_function = error.get('network_function') or "unknown NF"
+            network_functions[network_function] = network_functions.get(network_function, 0) + 1
+
+    if network_functions:
+        print("   • Errors by network function:")
+        for network_function, count in network_functions.items():
+            print(f"     - {network_function}: {count}")
+
     # Show line number range
     if errors:
         line_numbers = [e.get('line_number', 0) for e in errors]
         print(f"   • Error lines: {min(line_numbers)} - {max(line_numbers)}")
 
-def run_analysis(config):
-    # Create the Gemini client with the API key
-    gemini_client = GeminiClient(api_key=config.get("GEMINI_API_KEY"))
-    
-    # Create the log analyzer
-    log_analyzer = LogAnalyzer()
+    if clusters:
+        print(f"   • Distinct error types: {len(clusters)}")
+        for cluster in sorted(clusters, key=lambda c: c.count, reverse=True)[:10]:
+            print(f"     - {cluster.count}x {cluster.template}")
+        if len(clusters) > 10:
+            print(f"     - ... and {len(clusters) - 10} more")
+
+    if timeline and timeline.get('errors_with_timestamp'):
+        print(f"   • First error: {timeline['first_error']}, last error: {timeline['last_error']}")
+        print(f"   • Peak minute: {timeline['peak_minute']['start']} ({timeline['peak_minute']['errors']} errors)")
+        for burst in timeline['bursts'][:5]:
+            print(f"     - Burst {burst['start']} - {burst['end']}: {burst['errors']} errors, "
+                  f"peak {burst['peak_per_second']}/s at {burst['peak_at']} "
+                  f"({burst['seconds_to_peak']}s after the first error)")
+
+def build_gemini_batches(log_analyzer, analysis_data, clusters, batch_tokens):
+    """
+    Split the error clusters into token-budgeted batches and build one Gemini prompt per batch.
+    Returns (start_number, clusters, prompt) tuples; clusters are numbered continuously.
+    Each batch's error data is also hard-capped, so one oversized cluster cannot break a request.
+    """
+    from api.async_gemini_client import estimate_tokens, split_into_batches
+
+    batches = split_into_batches(
+        clusters, batch_tokens,
+        lambda cluster: estimate_tokens(log_analyzer.prepare_clusters_for_llm(analysis_data, [cluster]))
+    )
+
+    prompt_batches = []
+    start_number = 1
+    for batch in batches:
+        llm_formatted_data = log_analyzer.prepare_clusters_for_llm(
+            analysis_data, batch, start_number=start_number, max_chars=batch_tokens * 4
+        )
+        prompt_batches.append((start_number, batch, GEMINI_PROMPT_TEMPLATE.format(llm_formatted_data=llm_formatted_data)))
+        start_number += len(batch)
+    return prompt_batches
+
+def split_error_sections(response_text):
+    """
+    Split a Gemini response into {error number: analysis} and the trailing summary.
+    Line/Message fields are dropped because they describe a single occurrence.
+    """
+    headers = list(ERROR_SECTION_HEADER.finditer(response_text))
+    if not headers:
+        return {}, response_text.strip()
+
+    sections = {}
+    summary = ""
+    for i, header in enumerate(headers):
+        end = headers[i + 1].start() if i + 1 < len(headers) else len(response_text)
+        body = response_text[header.end():end]
+        if i + 1 == len(headers):
+            summary_match = SUMMARY_HEADER.search(body)
+            if summary_match:
+                summary = body[summary_match.start():].strip()
+                body = body[:summary_match.start()]
+        sections[int(header.group(1))] = PER_OCCURRENCE_FIELDS.sub('', body).strip()
+    return sections, summary
+
+def save_gemini_results(clusters, analyses, summaries, failures, gemini_output_path):
+    """Write one analysis per error cluster, with its occurrences, then the batch summaries."""
+    with open(gemini_output_path, 'w', encoding='utf-8') as f:
+        f.write("Gemini AI Analysis:\n" + "="*50 + "\n\n")
+        for number, cluster in enumerate(clusters, 1):
+            line_info = str(cluster.first_line)
+            if cluster.count > 1:
+                line_info += f" ({cluster.count} occurrences, lines {cluster.first_line} - {cluster.last_line})"
+            f.write(f"[ERROR #{number}]\n")
+            f.write(f"Line: {line_info}\n")
+            f.write(f"Message: {cluster.samples[0]['error_line']}\n")
+            f.write(analyses.get(cluster.signature, "(no analysis returned for this error)") + "\n\n")
+
+        if summaries:
+            f.write("Summary:\n" + "\n\n".join(summaries) + "\n")
+        for result in failures:
+            f.write(f"\n[Batch failed after {result['attempts']} attempts: {result['error']}]\n")
+
+def run_gemini_analysis(config, log_analyzer, analysis_data, clusters, output_dir, gemini_client=None):
+    """
+    Send each error cluster to Gemini once.
+    Clusters are keyed in the on-disk response cache by the signature of their
+    first occurrence (IMSIs, TEIDs, IPs, session IDs and timestamps masked),
+    so only failure types not seen in earlier runs cost an API call.
+    A long-running caller can pass its own `gemini_client` to reuse it.
+    """
+    from api.async_gemini_client import DEFAULT_MODEL
+    from api.response_cache import ResponseCache
+
+    # The namespace ties cache entries to the model and the prompt wording
+    prompt_version = hashlib.blake2b(GEMINI_PROMPT_TEMPLATE.encode('utf-8'), digest_size=4).hexdigest()
+    cache = ResponseCache(
+        config.get("GEMINI_CACHE_DIR"),
+        max_entries=config.get("GEMINI_CACHE_MAX_ENTRIES", 5000),
+        ttl_seconds=config.get("GEMINI_CACHE_TTL_HOURS", 168) * 3600,
+        namespace=f"{DEFAULT_MODEL}:{prompt_version}"
+    )
+
+    metrics = log_analyzer.metrics
+    analyses = {}
+    for cluster in clusters:
+        cached = cache.get(cluster.signature)
+        if cached is not None:
+            analyses[cluster.signature] = cached
+    metrics.count("gemini_cache_hits", len(analyses))
+
+    new_clusters = [cluster for cluster in clusters if cluster.signature not in analyses]
+    print(f"{len(clusters)} distinct error types: {len(clusters) - len(new_clusters)} cached, "
+          f"{len(new_clusters)} to analyze")
+
+    summaries = []
+    failures = []
+    if new_clusters:
+        # Batch the new clusters so each request stays within the token budget
+        prompt_batches = build_gemini_batches(
+            log_analyzer, analysis_data, new_clusters, config.get("GEMINI_BATCH_TOKENS", 30000)
+        )
+        gemini_client = gemini_client or create_gemini_client(config)
+        print(f"Sending {len(prompt_batches)} batch(es), up to {gemini_client.max_concurrency} at a time...")
+        results = gemini_client.fetch_all_sync([prompt for _, _, prompt in prompt_batches])
+
+        for (start_number, batch, prompt), result in zip(prompt_batches, results):
+            metrics.count("gemini_requests")
+            metrics.count("gemini_prompt_chars", len(prompt))
+            metrics.count("gemini_retries", max(result['attempts'] - 1, 0))
+            metrics.observe("gemini_latency_seconds", result['latency'])
+            if result['text'] is None:
+                metrics.count("gemini_failures")
+                failures.append(result)
+                continue
+            sections, summary = split_error_sections(result['text'])
+            if summary:
+                summaries.append(summary)
+            for number, cluster in enumerate(batch, start_number):
+                if number in sections:
+                    analyses[cluster.signature] = sections[number]
+                    cache.put(cluster.signature, sections[number], template=cluster.template)
+        cache.prune()
+
+    if failures:
+        print(f"⚠️ {len(failures)} batches failed after retries: {failures[0]['error']}")
+    if not analyses and not summaries:
+        print("Failed to get response from Gemini API")
+        return None
+
+    gemini_output_path = os.path.join(output_dir, "gemini_analysis.txt")
+    save_gemini_results(clusters, analyses, summaries, failures, gemini_output_path)
+    print(f"Gemini analysis saved to: {gemini_output_path}")
+    return gemini_output_path
+
+def create_gemini_client(config):
+    from api.async_gemini_client import AsyncGeminiClient
+
+    return AsyncGeminiClient(
+        api_key=config.get("GEMINI_API_KEY"),
+        max_concurrency=config.get("GEMINI_MAX_CONCURRENCY", 4),
+        max_retries=config.get("GEMINI_MAX_RETRIES", 4)
+    )
+
+def run_analysis(config, log_file_path=None, context_lines=5):
+    # Create the log analyzer; it records stage timings and counters in `metrics`
+    metrics = Metrics()
+    log_analyzer = LogAnalyzer(metrics=metrics, log_format=config.get("LOG_FORMAT", "auto"),
+                               correlate=config.get("CORRELATE_ENTITIES", False))
     
-    # Find and select log file from logs directory
-    logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
-    log_file_path = select_log_file(logs_dir)
+    # Without a path, find and select log file from logs directory
+    if log_file_path is None:
+        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        log_file_path = select_log_file(logs_dir)
+    elif not os.path.isfile(log_file_path):
+        print(f"Log file not found: {log_file_path}")
+        return
     
     if not log_file_path:
         return
     
     print(f"Analyzing log file: {log_file_path}")
     
-    # Perform detailed error analysis with context
-    analysis_results = log_analyzer.analyze_large_log_file(
-        log_file_path=log_file_path,
-        context_lines=5,  # Extract 5 lines before/after each error
-        output_format="json"  # Save as JSON
-    )
-    
-    if "error" in analysis_results:
-        print(f"Analysis error: {analysis_results['error']}")
-        return
-    
-    print(f"Found {analysis_results['total_errors']} errors with context")
-    print(f"Results saved to: {analysis_results['output_file']}")
+    output_dir = os.path.dirname(config.get("ANALYSIS_OUTPUT_PATH"))
+    with profile_run(config.get("PROFILE_MODE"), output_dir), metrics.stage("total"):
+        # Perform detailed error analysis with context
+        analysis_results = log_analyzer.analyze_large_log_file(
+            log_file_path=log_file_path,
+            context_lines=context_lines,  # Lines kept before/after each error
+            output_format=config.get("ANALYSIS_OUTPUT_FORMAT", "json"),
+            output_dir=output_dir
+        )
+
+        if "error" in analysis_results:
+            print(f"Analysis error: {analysis_results['error']}")
+            return
+
+        print(f"Found {analysis_results['total_errors']} errors with context")
+        print(f"Results saved to: {analysis_results['output_file']}")
+
+        report_analysis(config, log_analyzer, analysis_results)
+    save_metrics(metrics, output_dir)
+    print("Analysis complete!")
+
+def run_batch_analysis(config, path=None, context_lines=5, workers=None):
+    """
+    Analyze every log file under a directory (default: logs/) in one
+    non-interactive run: files are scanned in a worker pool and their errors
+    merged into a single time-ordered result that records each error's file.
+    """
+    from batch import analyze_log_directory
+
+    metrics = Metrics()
+    log_analyzer = LogAnalyzer(metrics=metrics, log_format=config.get("LOG_FORMAT", "auto"),
+                               correlate=config.get("CORRELATE_ENTITIES", False))
+    path = path or os.path.join(os.path.dirname(__file__), "..", "logs")
+    print(f"Analyzing log files in: {path}")
+
+    output_dir = os.path.dirname(config.get("ANALYSIS_OUTPUT_PATH"))
+    with profile_run(config.get("PROFILE_MODE"), output_dir), metrics.stage("total"):
+        # Files are scanned in worker processes, so only the merge side is timed here
+        with metrics.stage("scan"):
+            analysis_results = analyze_log_directory(
+                log_analyzer, path,
+                context_lines=context_lines,
+                workers=workers or config.get("ANALYSIS_WORKERS"),
+                output_format=config.get("ANALYSIS_OUTPUT_FORMAT", "json"),
+                output_dir=output_dir
+            )
+
+        if "error" in analysis_results:
+            print(f"Analysis error: {analysis_results['error']}")
+            return
+
+        for log_file in analysis_results['data']['log_files']:
+            network_function = log_file['network_function'] or "unknown NF"
+            print(f"   • {os.path.basename(log_file['path'])} ({network_function}): {log_file['errors']} errors")
+        metrics.count("files_analyzed", len(analysis_results['data']['log_files']))
+        metrics.count("bytes_read", sum(os.path.getsize(log_file['path']) for log_file in analysis_results['data']['log_files']))
+        metrics.count("errors_matched", analysis_results['total_errors'])
+        print(f"Found {analysis_results['total_errors']} errors with context")
+        print(f"Results saved to: {analysis_results['output_file']}")
+
+        report_analysis(config, log_analyzer, analysis_results)
+    save_metrics(metrics, output_dir)
+    print("Analysis complete!")
+
+def save_metrics(metrics, output_dir):
+    """Write the run's timings and counters as metrics.json and metrics.prom (Prometheus text format)."""
+    json_path, prometheus_path = metrics.save(output_dir)
+    total = metrics.stages.get("total", {}).get("seconds", 0.0)
+    print(f"Run metrics saved to: {json_path} and {prometheus_path} ({total:.2f}s total)")
+
+def report_analysis(config, log_analyzer, analysis_results):
+    """Cluster and summarize analysis results, save the LLM input and timeline, and optionally ask Gemini."""
+    metrics = log_analyzer.metrics
+
+    # Group repeated errors by template so the LLM input grows with distinct failure types
+    with metrics.stage("cluster"):
+        clusters = cluster_errors(analysis_results['data']['errors'])
+    metrics.count("clusters", len(clusters))
+
+    # When the errors started, how fast they came and any bursts
+    with metrics.stage("timeline"):
+        timeline = error_timeline(analysis_results['data']['errors'])
 
     # Print summary
-    print_analysis_summary(analysis_results['data'])
+    print_analysis_summary(analysis_results['data'], clusters, timeline)
 
-    # Prepare data for LLM API - use in-memory data directly
-    llm_formatted_data = log_analyzer.prepare_for_llm_from_memory(analysis_results['data'])
+    # Prepare data for LLM API - use in-memory data directly, within the size budget
+    with metrics.stage("prompt_build"):
+        llm_input = log_analyzer.build_llm_input(
+            analysis_results['data'], clusters, max_chars=config.get("LLM_MAX_CHARS")
+        )
+    metrics.count("llm_input_chars", llm_input['chars'])
     
     # Save LLM-ready data
     output_dir = os.path.dirname(config.get("ANALYSIS_OUTPUT_PATH"))
     llm_output_path = os.path.join(output_dir, "llm_input.txt")
     with open(llm_output_path, 'w', encoding='utf-8') as f:
-        f.write(llm_formatted_data)
+        f.write(llm_input['text'])
     
-    print(f"LLM-ready data saved to: {llm_output_path}")
+    print(f"LLM-ready data saved to: {llm_output_path} ({llm_input['chars']} characters)")
+    if llm_input['dropped']:
+        print(f"⚠️ Omitted {len(llm_input['dropped'])} lower-priority error types to stay within "
+              f"{config.get('LLM_MAX_CHARS')} characters")
+
+    timeline_path = os.path.join(output_dir, "error_timeline.json")
+    with open(timeline_path, 'w', encoding='utf-8') as f:
+        json.dump(timeline, f, indent=2)
+    print(f"Error timeline saved to: {timeline_path}")
     
     # Optional: Send to Gemini for further analysis
     if config.get("GEMINI_API_KEY") and analysis_results['total_errors'] > 0:
         print("\nSending error analysis to Gemini for insights...")
-        
-        # Use the formatted error data from the analyzer instead of raw log file
-        prompt = f"""You are an expert 5G Core Network engineer. You will analyze the following error data extracted from 5G network logs.
+        with metrics.stage("gemini"):
+            run_gemini_analysis(config, log_analyzer, analysis_results['data'], clusters, output_dir)
 
-Follow these rules strictly:
+def run_triage(config, log_file_path=None, context_lines=0, **options):
+    """
+    Quick summary of a (possibly huge) log file for incident triage: see
+    triage.triage_log_file for the options (max_errors, tail_bytes,
+    sample_fraction, count_only, levels). Saves the summary as triage.json.
+    """
+    from triage import triage_log_file
 
-1. Analyze each ERROR provided in the data below.
-2. For each ERROR:
-   - Print the error number and line information.
-   - Provide a concise explanation of what the error means.
-   - Use the context provided (lines before/after) to infer the possible root cause.
-3. Suggest practical next steps or troubleshooting actions an engineer should take.
-4. Output format must be structured like this:
+    log_analyzer = LogAnalyzer(log_format=config.get("LOG_FORMAT", "auto"))
+    if log_file_path is None:
+        log_file_path = select_log_file(os.path.join(os.path.dirname(__file__), "..", "logs"))
+        if not log_file_path:
+            return
+    summary = triage_log_file(log_analyzer, log_file_path, context_lines=context_lines, **options)
+    if "error" in summary:
+        print(f"Triage error: {summary['error']}")
+        return
 
-[ERROR #1]
-Line: <line number>
-Message: <exact error log>
-Explanation: <short explanation>
-Context Analysis: <reasoning from nearby logs>
-Suggested Fix: <practical step>
+    if summary['bytes_scanned'] is None:
+        scanned = f"part of {summary['file_size'] / 1024 / 1024:.1f} MB"
+    else:
+        scanned = f"{summary['bytes_scanned'] / 1024 / 1024:.1f} of {summary['file_size'] / 1024 / 1024:.1f} MB"
+    print(f"\n🔎 Triage ({summary['mode']}, {scanned} scanned):")
+    print(f"   • Errors found: {summary['errors_found']}{' (stopped early)' if summary['stopped_early'] else ''}")
+    for level, count in summary['by_level'].items():
+        print(f"     - {level}: {count}")
+    if "estimate" in summary:
+        estimate = summary['estimate']
+        errors = estimate['errors']
+        print(f"   • Estimated in the whole file: {errors['count']} errors "
+              f"(95% bounds {errors['low']} - {errors['high']}, {estimate['chunks_sampled']}/{estimate['chunks_total']} chunks)")
+        for level, bounds in estimate['by_level'].items():
+            print(f"     - {level}: ~{bounds['count']} ({bounds['low']} - {bounds['high']})")
+    if summary['top_templates']:
+        print("   • Most frequent errors:")
+        for template in summary['top_templates'][:5]:
+            print(f"     - {template['count']}x {template['template'][:100]}")
 
-[ERROR #2]
-...
+    output_dir = os.path.dirname(config.get("ANALYSIS_OUTPUT_PATH"))
+    os.makedirs(output_dir, exist_ok=True)
+    triage_path = os.path.join(output_dir, "triage.json")
+    with open(triage_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, default=record_to_json)
+    print(f"Triage summary saved to: {triage_path}")
+    return summary
 
-At the end, provide a short summary of recurring issues or patterns.
+def run_follow(config, log_file_path=None, context_lines=5, interval=60.0, max_polls=None):
+    """
+    Follow a log file and report the errors in newly appended lines on every
+    poll; they are appended to follow_errors.ndjson in the output directory.
+    """
+    from follow import LogFollower
+    from result_writers import NdjsonWriter
 
-ERROR DATA:
-{llm_formatted_data}
+    log_analyzer = LogAnalyzer(log_format=config.get("LOG_FORMAT", "auto"),
+                               correlate=config.get("CORRELATE_ENTITIES", False))
 
-"""
-        
-        gemini_response = gemini_client.fetch_data(prompt)
-        
-        if gemini_response:
-            gemini_output_path = os.path.join(output_dir, "gemini_analysis.txt")
-            with open(gemini_output_path, 'w', encoding='utf-8') as f:
-                f.write("Gemini AI Analysis:\n" + "="*50 + "\n\n")
-                f.write("\n".join(gemini_response))
-            print(f"Gemini analysis saved to: {gemini_output_path}")
-        else:
-            print("Failed to get response from Gemini API")
-    
-    print("Analysis complete!")
\ No newline at end of file
+    if log_file_path is None:
+        logs_dir = os.path.join(os.path.dirname(__file__), "..", "logs")
+        log_file_path = select_log_file(logs_dir)
+        if not log_file_path:
+            return
+
+    output_dir = os.path.dirname(config.get("ANALYSIS_OUTPUT_PATH"))
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, "follow_errors.ndjson")
+
+    follower = LogFollower(log_analyzer, log_file_path, context_lines=context_lines)
+    print(f"Following log file: {log_file_path} (checkpoint: {follower.checkpoint_path})")
+    print(f"New errors are appended to: {output_path}")
+
+    for errors in follower.follow(interval=interval, max_polls=max_polls):
+        with NdjsonWriter(output_path, append=True) as writer:
+            writer.write_all(errors)
+        print(f"\nFound {len(errors)} new errors")
+        print_analysis_summary({"total_errors_found": len(errors), "errors": errors})
\ No newline at end of file
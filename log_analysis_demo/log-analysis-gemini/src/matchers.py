@@ -0,0 +1,88 @@
+import re
+
+try:
+    import ahocorasick  # Optional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class SubstringMatcher:
+    """Reference matcher: lowercase the line and scan each pattern in turn."""
+
+    def __init__(self, error_patterns, non_error_levels):
+        self.error_patterns = list(error_patterns)
+        self.non_error_levels = list(non_error_levels)
+
+    def is_error_line(self, line):
+        line_lower = line.lower()
+        has_error_level = any(pattern in line_lower for pattern in self.error_patterns)
+        has_non_error_level = any(level in line_lower for level in self.non_error_levels)
+        return has_error_level and not has_non_error_level
+
+
+class RegexMatcher:
+    """
+    Compile all patterns into a single case-insensitive regex so each line is
+    checked by one C-level match call instead of a lowercase copy plus one
+    substring scan per pattern.
+    """
+
+    def __init__(self, error_patterns, non_error_levels):
+        self.error_patterns = list(error_patterns)
+        self.non_error_levels = list(non_error_levels)
+        self._regex = self._compile(self.error_patterns, self.non_error_levels)
+
+    @staticmethod
+    def _compile(error_patterns, non_error_levels):
+        def alternation(patterns):
+            return "|".join(re.escape(p.lower()) for p in patterns) or "(?!)"
+
+        # Anchored lookaheads: no non-error level anywhere, and some error pattern somewhere.
+        # re.ASCII keeps case folding identical to str.lower() for these ASCII patterns.
+        return re.compile(
+            f"^(?!.*(?:{alternation(non_error_levels)}))(?=.*(?:{alternation(error_patterns)}))",
+            re.IGNORECASE | re.ASCII | re.DOTALL
+        )
+
+    def is_error_line(self, line):
+        return self._regex.match(line) is not None
+
+
+class AhoCorasickMatcher:
+    """Aho-Corasick automaton over all patterns (requires the optional pyahocorasick package)."""
+
+    def __init__(self, error_patterns, non_error_levels):
+        if ahocorasick is None:
+            raise ImportError("The 'aho-corasick' matcher requires: pip install pyahocorasick")
+        self.error_patterns = list(error_patterns)
+        self.non_error_levels = list(non_error_levels)
+
+        self._automaton = ahocorasick.Automaton()
+        for pattern in self.error_patterns:
+            self._automaton.add_word(pattern.lower(), False)
+        # Exclusions win if a pattern appears in both lists
+        for level in self.non_error_levels:
+            self._automaton.add_word(level.lower(), True)
+        self._automaton.make_automaton()
+
+    def is_error_line(self, line):
+        has_error_level = False
+        for _, is_exclusion in self._automaton.iter(line.lower()):
+            if is_exclusion:
+                return False
+            has_error_level = True
+        return has_error_level
+
+
+MATCHERS = {
+    "substring": SubstringMatcher,
+    "regex": RegexMatcher,
+    "aho-corasick": AhoCorasickMatcher,
+}
+
+
+def create_matcher(name, error_patterns, non_error_levels):
+    """Build the named matcher engine for the given pattern lists."""
+    if name not in MATCHERS:
+        raise ValueError(f"Unknown matcher: {name} (available: {', '.join(MATCHERS)})")
+    return MATCHERS[name](error_patterns, non_error_levels)
@@ -0,0 +1,184 @@
+# filepath: log-analysis-gemini/src/metrics.py
+
+import json
+import os
+import re
+import sys
+import time
+from contextlib import contextmanager
+
+PROFILE_MODES = ("cprofile", "tracemalloc")
+
+def peak_rss_bytes():
+    """Peak resident set size of this process so far, or None where unavailable."""
+    try:
+        import resource
+    except ImportError:
+        return None  # Not available on Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Linux reports KB
+
+class Metrics:
+    """
+    Timers, counters and peak memory for one analysis run.
+    `stage(name)` times a block and records the process peak RSS when it
+    ends, how far the block raised that peak (the largest growth over its
+    calls; 0 if an earlier stage had already used more memory) and, while
+    tracemalloc is running, the traced Python heap peak. Stages may nest: a
+    stage's traced peak includes those of the stages run inside it.
+    A disabled instance turns every call into a no-op.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.started = time.time()
+        self.stages = {}  # name -> {"seconds", "calls", "process_peak_rss_bytes", "peak_rss_growth_bytes", "traced_peak_bytes"}
+        self.counters = {}
+        self.observations = {}  # name -> {"count", "sum", "max"}
+        self._traced_peaks = []  # Traced peak seen so far by each open stage, innermost last
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        tracemalloc = sys.modules.get("tracemalloc")
+        tracing = tracemalloc is not None and tracemalloc.is_tracing()
+        if tracing:
+            # Resetting the peak for this stage would lose it for the stages around it, so save it first
+            peak_so_far = tracemalloc.get_traced_memory()[1]
+            self._traced_peaks = [max(peak, peak_so_far) for peak in self._traced_peaks]
+            self._traced_peaks.append(0)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()  # Python 3.9+; before that the peak covers the whole trace
+        peak_before = peak_rss_bytes()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats = self.stages.setdefault(
+                name, {"seconds": 0.0, "calls": 0, "process_peak_rss_bytes": None, "peak_rss_growth_bytes": None}
+            )
+            stats["seconds"] += time.perf_counter() - start
+            stats["calls"] += 1
+            peak_after = peak_rss_bytes()
+            stats["process_peak_rss_bytes"] = peak_after
+            if peak_after is not None:
+                stats["peak_rss_growth_bytes"] = max(stats["peak_rss_growth_bytes"] or 0, peak_after - peak_before)
+            if tracing:
+                traced_peak = max(self._traced_peaks.pop(), tracemalloc.get_traced_memory()[1])
+                stats["traced_peak_bytes"] = max(stats.get("traced_peak_bytes", 0), traced_peak)
+
+    def count(self, name, value=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, value):
+        """Record one sample (e.g. a request latency) as count, sum and max."""
+        if self.enabled:
+            stats = self.observations.setdefault(name, {"count": 0, "sum": 0.0, "max": value})
+            stats["count"] += 1
+            stats["sum"] += value
+            stats["max"] = max(stats["max"], value)
+
+    def to_dict(self):
+        return {
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started)),
+            "peak_rss_bytes": peak_rss_bytes(),
+            "stages": self.stages,
+            "counters": self.counters,
+            "observations": self.observations
+        }
+
+    def to_prometheus(self, prefix="log_analysis"):
+        """Render the metrics in the Prometheus text exposition format."""
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = "{" + ",".join(f'{key}="{val}"' for key, val in labels.items()) + "}" if labels else ""
+                lines.append(f"{prefix}_{name}{label_text} {value}")
+
+        metric("stage_seconds", "gauge", "Wall time spent in each stage.",
+               [({"stage": name}, round(stats["seconds"], 6)) for name, stats in self.stages.items()])
+        metric("stage_calls", "gauge", "Times each stage ran.",
+               [({"stage": name}, stats["calls"]) for name, stats in self.stages.items()])
+        metric("stage_process_peak_rss_bytes", "gauge", "Process peak RSS when each stage ended.",
+               [({"stage": name}, stats["process_peak_rss_bytes"]) for name, stats in self.stages.items()
+                if stats["process_peak_rss_bytes"] is not None])
+        metric("stage_peak_rss_growth_bytes", "gauge", "Largest rise of the process peak RSS during one run of each stage.",
+               [({"stage": name}, stats["peak_rss_growth_bytes"]) for name, stats in self.stages.items()
+                if stats["peak_rss_growth_bytes"] is not None])
+        for name, value in self.counters.items():
+            metric(f"{_metric_name(name)}_total", "counter", f"Total {name.replace('_', ' ')}.", [({}, value)])
+        for name, stats in self.observations.items():
+            base = _metric_name(name)
+            metric(base, "summary", f"Observed {name.replace('_', ' ')}.", [])
+            lines.append(f"{prefix}_{base}_count {stats['count']}")
+            lines.append(f"{prefix}_{base}_sum {round(stats['sum'], 6)}")
+            metric(f"{base}_max", "gauge", f"Largest observed {name.replace('_', ' ')}.", [({}, stats["max"])])
+        peak = peak_rss_bytes()
+        if peak is not None:
+            metric("peak_rss_bytes", "gauge", "Process peak RSS.", [({}, peak)])
+        return "\n".join(lines) + "\n"
+
+    def save(self, output_dir, name="metrics"):
+        """Write <name>.json and <name>.prom to output_dir; returns both paths."""
+        os.makedirs(output_dir, exist_ok=True)
+        json_path = os.path.join(output_dir, f"{name}.json")
+        prometheus_path = os.path.join(output_dir, f"{name}.prom")
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        with open(prometheus_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        return json_path, prometheus_path
+
+def _metric_name(name):
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+@contextmanager
+def profile_run(mode, output_dir):
+    """
+    Optional deep-dive capture around a block: mode "cprofile" writes
+    profile.prof and a cumulative-time profile.txt, "tracemalloc" writes the
+    top allocation sites to tracemalloc.txt; None/"" does nothing. Any other
+    mode prints a warning and the block runs without profiling.
+    """
+    if mode and mode not in PROFILE_MODES:
+        print(f"⚠️ Unsupported PROFILE_MODE {mode!r} (use {' or '.join(PROFILE_MODES)}); profiling is off")
+        mode = None
+    if not mode:
+        yield
+        return
+
+    os.makedirs(output_dir, exist_ok=True)
+    if mode == "cprofile":
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(os.path.join(output_dir, "profile.prof"))
+            with open(os.path.join(output_dir, "profile.txt"), 'w', encoding='utf-8') as f:
+                pstats.Stats(profiler, stream=f).sort_stats("cumulative").print_stats(40)
+    elif mode == "tracemalloc":
+        import tracemalloc
+
+        tracemalloc.start(25)
+        try:
+            yield
+        finally:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(os.path.join(output_dir, "tracemalloc.txt"), 'w', encoding='utf-8') as f:
+                f.write(f"Traced memory: current {current} bytes, peak {peak} bytes\n\n")
+                for stat in snapshot.statistics("lineno")[:30]:
+                    f.write(f"{stat}\n")
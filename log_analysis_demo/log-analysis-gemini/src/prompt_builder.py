@@ -0,0 +1,59 @@
+# filepath: log-analysis-gemini/src/prompt_builder.py
+
+# Higher rank = more important to keep when the prompt must be cut
+SEVERITY_LEVELS = (("fatal", 4), ("critical", 3), ("exception", 2), ("error", 1), ("fail", 1))
+NOTE_RESERVE = 300  # Characters kept free for the "omitted errors" note
+TRUNCATED_MARK = "\n[... truncated to fit the size budget]\n"
+
+def severity_of(line):
+    """Rank an error line by its most severe level keyword (0 if none)."""
+    line_lower = line.lower()
+    for level, rank in SEVERITY_LEVELS:
+        if level in line_lower:
+            return rank
+    return 0
+
+def assemble_prompt(header, blocks, max_chars=None, rank_key=None):
+    """
+    Join a header and (number, text) blocks into one string with a single join.
+    If the result would exceed max_chars, keep the most important blocks
+    (lowest rank_key(index) first) in their original order, drop the rest and
+    append a note listing what was omitted.
+    Returns {"text", "included", "dropped", "chars"}.
+    """
+    total_chars = len(header) + sum(len(text) for _, text in blocks)
+    if max_chars is None or total_chars <= max_chars:
+        text = "".join([header] + [text for _, text in blocks])
+        return {"text": text, "included": [number for number, _ in blocks], "dropped": [], "chars": len(text)}
+
+    budget = max_chars - len(header) - NOTE_RESERVE
+    order = sorted(range(len(blocks)), key=rank_key) if rank_key else list(range(len(blocks)))
+
+    selected = set()
+    used = 0
+    for index in order:
+        size = len(blocks[index][1])
+        if used + size <= budget:
+            selected.add(index)
+            used += size
+
+    parts = [header]
+    truncated = None
+    if not selected and blocks and budget > len(TRUNCATED_MARK):
+        # Not even one block fits: keep the most important one, cut short
+        truncated = order[0]
+        parts.append(blocks[truncated][1][:budget - len(TRUNCATED_MARK)] + TRUNCATED_MARK)
+    parts.extend(blocks[index][1] for index in sorted(selected))
+
+    included = [blocks[index][0] for index in range(len(blocks)) if index in selected or index == truncated]
+    dropped = [blocks[index][0] for index in range(len(blocks)) if index not in selected and index != truncated]
+    if dropped:
+        listed = ", ".join(f"#{number}" for number in dropped[:20])
+        more = ", ..." if len(dropped) > 20 else ""
+        parts.append(
+            f"\n[Omitted {len(dropped)} of {len(blocks)} errors to stay within the {max_chars}-character "
+            f"budget: {listed}{more}]\n"
+        )
+
+    text = "".join(parts)[:max_chars]  # Only cuts anything if the header alone is over budget
+    return {"text": text, "included": included, "dropped": dropped, "chars": len(text)}
@@ -0,0 +1,107 @@
+# filepath: log-analysis-gemini/src/records.py
+
+from collections.abc import MutableMapping
+
+FIELDS = ("error_line", "line_number", "context_before", "context_after", "timestamp")
+OPTIONAL_FIELDS = ("level", "component")  # Set by the scanner from the file's log format; keys only when not None
+CONTEXT_SLOTS = {"context_before": "before_lines", "context_after": "after_lines"}
+
+class ErrorRecord(MutableMapping):
+    """
+    Compact error record with the same keys as the original error dicts.
+    Context windows are lists of the scanner's (line_number, content)
+    tuples, so errors with overlapping windows share those lines instead of
+    each holding its own copies. Reading record['context_before'] (or
+    to_dict()) builds the usual [{'line_number', 'content'}, ...] list on
+    demand. The level and component parsed during the scan are keys only
+    when known. Keys added later (source_file, ...) are kept in `extra`.
+    """
+
+    __slots__ = ("error_line", "line_number", "before_lines", "after_lines", "timestamp", "level", "component", "extra")
+
+    def __init__(self, error_line, line_number, before_lines=(), after_lines=(), timestamp=None,
+                 level=None, component=None):
+        self.error_line = error_line
+        self.line_number = line_number
+        self.before_lines = list(before_lines)
+        self.after_lines = list(after_lines)
+        self.timestamp = timestamp
+        self.level = level
+        self.component = component
+        self.extra = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record from its dict form (e.g. a follow-mode checkpoint)."""
+        record = cls(data['error_line'], data['line_number'], timestamp=data.get('timestamp'))
+        for key, value in data.items():
+            if key not in ("error_line", "line_number", "timestamp"):
+                record[key] = value
+        return record
+
+    def to_dict(self):
+        data = {key: self[key] for key in FIELDS}
+        for key in OPTIONAL_FIELDS:
+            if getattr(self, key) is not None:
+                data[key] = getattr(self, key)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __getitem__(self, key):
+        if key in CONTEXT_SLOTS:
+            return [{'line_number': number, 'content': content} for number, content in getattr(self, CONTEXT_SLOTS[key])]
+        if key in FIELDS:
+            return getattr(self, key)
+        if key in OPTIONAL_FIELDS and getattr(self, key) is not None:
+            return getattr(self, key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in CONTEXT_SLOTS:
+            # Accept the dict form as well as (line_number, content) pairs
+            setattr(self, CONTEXT_SLOTS[key], [
+                (item['line_number'], item['content']) if isinstance(item, dict) else tuple(item) for item in value
+            ])
+        elif key in FIELDS or key in OPTIONAL_FIELDS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in OPTIONAL_FIELDS and getattr(self, key) is not None:
+            setattr(self, key, None)
+            return
+        if key in FIELDS or not self.extra or key not in self.extra:
+            raise KeyError(key)  # The standard keys are always present
+        del self.extra[key]
+
+    def __contains__(self, key):
+        if key in OPTIONAL_FIELDS:
+            return getattr(self, key) is not None
+        return key in FIELDS or bool(self.extra) and key in self.extra
+
+    def __iter__(self):
+        yield from FIELDS
+        for key in OPTIONAL_FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        optional = sum(1 for key in OPTIONAL_FIELDS if getattr(self, key) is not None)
+        return len(FIELDS) + optional + len(self.extra or ())
+
+    def __repr__(self):
+        return f"ErrorRecord({self.to_dict()!r})"
+
+def record_to_json(value):
+    """json.dump(..., default=record_to_json) hook: serializes records exactly like the dicts they replace."""
+    if isinstance(value, ErrorRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
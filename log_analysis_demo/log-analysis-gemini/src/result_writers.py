@@ -0,0 +1,98 @@
+# filepath: log-analysis-gemini/src/result_writers.py
+
+import csv
+import json
+
+from records import record_to_json
+
+CSV_FIELDS = ['line_number', 'error_line', 'timestamp', 'context_before', 'context_after']
+FLUSH_EVERY = 100  # Records between flushes, so readers can follow the file while it grows
+
+def _join_context(context):
+    return '; '.join([f"[{item['line_number']}] {item['content']}" for item in context])
+
+def csv_row(error):
+    """Flatten one error record into the CSV columns."""
+    return {
+        'line_number': error['line_number'],
+        'error_line': error['error_line'],
+        'timestamp': error.get('timestamp', ''),
+        'context_before': _join_context(error['context_before']),
+        'context_after': _join_context(error['context_after'])
+    }
+
+class StreamingWriter:
+    """
+    Base class for writers that append each error record to the output file
+    as soon as it is complete, instead of dumping the whole result at the end.
+    Use as a context manager; `count` holds the number of records written.
+    `extra_fields` name record keys beyond the standard ones that the output
+    must include (formats that keep whole records ignore it). With
+    append=True records are added to an existing file.
+    """
+
+    extension = None
+
+    def __init__(self, output_file, flush_every=FLUSH_EVERY, extra_fields=(), append=False):
+        self.output_file = output_file
+        self.flush_every = flush_every
+        self.extra_fields = list(extra_fields)
+        self.append = append
+        self.count = 0
+        self.file = None
+
+    def __enter__(self):
+        self.file = open(self.output_file, 'a' if self.append else 'w', newline='', encoding='utf-8')
+        self._start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.file.close()
+        return False
+
+    def write(self, error):
+        self._write(error)
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self.file.flush()
+
+    def write_all(self, errors):
+        for error in errors:
+            self.write(error)
+
+    def _start(self):
+        pass
+
+    def _write(self, error):
+        raise NotImplementedError
+
+class NdjsonWriter(StreamingWriter):
+    """One compact JSON object per line (JSON Lines)."""
+
+    extension = "ndjson"
+
+    def _write(self, error):
+        self.file.write(json.dumps(error, ensure_ascii=False, default=record_to_json))
+        self.file.write("\n")
+
+class CsvWriter(StreamingWriter):
+    """CSV rows with the context windows flattened into one column each, plus any extra fields."""
+
+    extension = "csv"
+
+    def _start(self):
+        self.writer = csv.DictWriter(self.file, fieldnames=CSV_FIELDS + self.extra_fields)
+        if self.file.tell() == 0:
+            self.writer.writeheader()
+
+    def _write(self, error):
+        row = csv_row(error)
+        for field in self.extra_fields:
+            row[field] = error.get(field, '')
+        self.writer.writerow(row)
+
+STREAMING_WRITERS = {
+    "ndjson": NdjsonWriter,
+    "jsonl": NdjsonWriter,
+    "csv": CsvWriter,
+}
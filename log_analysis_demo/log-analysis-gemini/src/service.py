@@ -0,0 +1,358 @@
+# filepath: log-analysis-gemini/src/service.py
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from analyzer import LogAnalyzer
+from clustering import cluster_errors
+from line_index import default_index_path
+from metrics import Metrics
+from records import record_to_json
+from timestamps import error_timeline
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_FINISHED_JOBS = 200  # Finished jobs kept for GET /jobs/<id>; older ones and their files are removed
+JOB_OPTIONS = {"context_lines": int, "output_format": str, "scanner": str, "llm": bool, "include_errors": bool}
+
+class AnalysisService:
+    """
+    Resident analyzer behind the HTTP API.
+    The LogAnalyzer (with its compiled matcher) is built once and the Gemini
+    client on the first LLM job, and both are reused by every later job.
+    At most `max_concurrent_jobs` jobs run at a time and up to
+    `max_queued_jobs` more wait for a slot; beyond that, submit() refuses.
+    scanner="index" keeps its line indexes under the service's own output
+    directory, never next to the analyzed files.
+    """
+
+    def __init__(self, config, max_concurrent_jobs=2, max_queued_jobs=32, matcher="regex"):
+        self.config = config
+        self.output_dir = os.path.join(os.path.dirname(config.get("ANALYSIS_OUTPUT_PATH")), "jobs")
+        self.analyzer = LogAnalyzer(matcher=matcher, log_format=config.get("LOG_FORMAT", "auto"),
+                                    correlate=config.get("CORRELATE_ENTITIES", False),
+                                    index_dir=os.path.join(self.output_dir, "indexes"))
+        self.metrics = Metrics()
+        self.gemini_client = None
+        self.max_concurrent_jobs = max(1, max_concurrent_jobs)
+        self.max_queued_jobs = max_queued_jobs
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent_jobs, thread_name_prefix="analysis-job")
+        self._lock = threading.Lock()
+        self._llm_lock = threading.Lock()  # One Gemini conversation at a time on the shared client
+        self._jobs = OrderedDict()  # job id -> job dict, oldest first
+        self._done = {}  # job id -> threading.Event set when the job finishes
+        self._unfinished = 0
+
+    def submit(self, log_file_path, options=None, upload=False):
+        """
+        Queue an analysis of `log_file_path` and return the job dict, or
+        {"error"} if the queue is full. An `upload` file is deleted after the job.
+        """
+        with self._lock:
+            if self._unfinished >= self.max_concurrent_jobs + self.max_queued_jobs:
+                self.metrics.count("jobs_rejected")
+                return {"error": "Too many queued jobs, retry later"}
+            self._unfinished += 1
+            job = {
+                "id": uuid.uuid4().hex[:16],
+                "status": "queued",
+                "log_file": "(uploaded)" if upload else log_file_path,
+                "submitted": time.time(),
+                "started": None,
+                "finished": None,
+                "result": None
+            }
+            self._jobs[job["id"]] = job
+            self._done[job["id"]] = threading.Event()
+        self.metrics.count("jobs_submitted")
+        self._executor.submit(self._run, job, log_file_path, dict(options or {}), upload)
+        return job
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job finishes (or `timeout` seconds pass) and return it."""
+        done = self._done.get(job_id)
+        if done is not None:
+            done.wait(timeout)
+        return self.get(job_id)
+
+    def get(self, job_id):
+        return self._jobs.get(job_id)
+
+    def status(self):
+        with self._lock:
+            running = sum(1 for job in self._jobs.values() if job["status"] == "running")
+            return {
+                "status": "ok",
+                "running": running,
+                "queued": self._unfinished - running,
+                "max_concurrent_jobs": self.max_concurrent_jobs,
+                "max_queued_jobs": self.max_queued_jobs
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        if self.gemini_client is not None:
+            self.gemini_client.close()
+
+    def _run(self, job, log_file_path, options, upload):
+        job["started"] = time.time()
+        job["status"] = "running"
+        self.metrics.observe("job_queue_seconds", job["started"] - job["submitted"])
+        try:
+            with self.metrics.stage("job"):
+                result = self.analyze(log_file_path, os.path.join(self.output_dir, job["id"]), **options)
+        except Exception as e:
+            result = {"error": f"Analysis failed: {str(e)}"}
+        finally:
+            if upload:
+                os.remove(log_file_path)
+                index_path = default_index_path(log_file_path, self.analyzer.index_dir)
+                if os.path.exists(index_path):
+                    os.remove(index_path)
+
+        job["result"] = result
+        job["status"] = "failed" if "error" in result else "done"
+        job["finished"] = time.time()
+        self.metrics.count("jobs_failed" if "error" in result else "jobs_completed")
+        self.metrics.observe("job_seconds", job["finished"] - job["started"])
+        with self._lock:
+            self._unfinished -= 1
+            self._done[job["id"]].set()
+            self._forget_old_jobs()
+
+    def analyze(self, log_file_path, output_dir, context_lines=5, output_format="json", scanner="stream",
+                llm=False, include_errors=True):
+        """Analyze one log file with the warm analyzer; returns the result of a job."""
+        results = self.analyzer.analyze_large_log_file(
+            log_file_path, context_lines, output_format=output_format, scanner=scanner, output_dir=output_dir
+        )
+        if "error" in results:
+            return results
+
+        errors = results['data']['errors']
+        clusters = cluster_errors(errors)
+        self.metrics.count("errors_matched", len(errors))
+        response = {
+            "total_errors": results['total_errors'],
+            "output_file": results['output_file'],
+            "clusters": [
+                {key: value for key, value in cluster.to_dict().items() if key != "samples"} for cluster in clusters
+            ],
+            "timeline": error_timeline(errors)
+        }
+        if include_errors:
+            response["errors"] = errors
+        if llm and errors:
+            response["gemini_analysis"] = self._ask_gemini(results['data'], clusters, output_dir)
+        return response
+
+    def _ask_gemini(self, analysis_data, clusters, output_dir):
+        if not self.config.get("GEMINI_API_KEY"):
+            return {"error": "GEMINI_API_KEY is not set"}
+
+        # Imported here so the service starts without google.generativeai when LLM jobs are not used
+        from main import create_gemini_client, run_gemini_analysis
+
+        with self._llm_lock:
+            if self.gemini_client is None:
+                self.gemini_client = create_gemini_client(self.config)
+            gemini_output_path = run_gemini_analysis(
+                self.config, self.analyzer, analysis_data, clusters, output_dir, gemini_client=self.gemini_client
+            )
+        if gemini_output_path is None:
+            return {"error": "Failed to get response from Gemini API"}
+        with open(gemini_output_path, encoding='utf-8') as f:
+            return {"text": f.read(), "output_file": gemini_output_path}
+
+    def _forget_old_jobs(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job["finished"] is not None]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+            del self._done[job_id]
+            shutil.rmtree(os.path.join(self.output_dir, job_id), ignore_errors=True)
+
+def read_request_body(rfile, headers):
+    """Yield the request body in chunks, for both Content-Length and chunked transfer encoding."""
+    if headers.get("Transfer-Encoding", "").lower() == "chunked":
+        while True:
+            size = int(rfile.readline().split(b';')[0].strip() or b'0', 16)
+            if size == 0:
+                while rfile.readline().strip():
+                    pass  # Trailer headers
+                return
+            yield from _read_exactly(rfile, size)
+            rfile.readline()  # CRLF after the chunk data
+    else:
+        yield from _read_exactly(rfile, int(headers.get("Content-Length") or 0))
+
+def _read_exactly(rfile, size):
+    while size > 0:
+        data = rfile.read(min(size, UPLOAD_CHUNK_SIZE))
+        if not data:
+            raise ValueError("Request body ended early")
+        size -= len(data)
+        yield data
+
+class AnalysisRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP API of the analysis service:
+      POST /analyze     analyze a log file: ?path=... or a JSON body {"path": ...} for a file the
+                        service can read, otherwise the body is the (optionally compressed) log itself.
+                        Options as query parameters or JSON keys: context_lines, output_format,
+                        scanner, llm, include_errors, wait (default true; false returns 202 + job id)
+      GET /jobs/<id>    job status and, when finished, its result
+      GET /health       running and queued job counts
+      GET /metrics      service metrics in the Prometheus text format
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so small jobs do not pay for a new connection
+    disable_nagle_algorithm = True  # Headers and body go out as separate writes; do not wait for the ACK
+    server_version = "LogAnalysisService"
+
+    @property
+    def service(self):
+        return self.server.service
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == "/health":
+            self._send_json(200, self.service.status())
+        elif path == "/metrics":
+            self._send(200, self.service.metrics.to_prometheus(prefix="log_analysis_service"),
+                       "text/plain; version=0.0.4")
+        elif path.startswith("/jobs/"):
+            job = self.service.get(path[len("/jobs/"):])
+            if job is None:
+                self._send_json(404, {"error": "Unknown job"})
+            else:
+                self._send_json(200, job)
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/analyze":
+            self.close_connection = True  # The body was not read
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        upload = False
+        try:
+            if self.headers.get("Content-Type", "").startswith("application/json"):
+                body = json.loads(b"".join(read_request_body(self.rfile, self.headers)) or b"{}")
+                if not isinstance(body, dict):
+                    raise ValueError("JSON body must be an object")
+                params.update(body)
+            elif "path" in params:
+                for _ in read_request_body(self.rfile, self.headers):
+                    pass
+            else:
+                upload = True
+            options = parse_job_options(params)
+            log_file_path = self._save_upload() if upload else params.get("path")
+        except ValueError as e:
+            self.close_connection = True
+            self._send_json(400, {"error": f"Invalid request: {str(e)}"})
+            return
+
+        if not upload and not (log_file_path and os.path.isfile(log_file_path)):
+            self._send_json(400, {"error": f"Log file not found: {log_file_path}"})
+            return
+
+        job = self.service.submit(log_file_path, options, upload=upload)
+        if "error" in job:
+            if upload:
+                os.remove(log_file_path)
+            self._send_json(503, job, {"Retry-After": "1"})
+            return
+
+        if str(params.get("wait", True)).lower() in ("0", "false", "no"):
+            self._send_json(202, job)
+        else:
+            self.service.wait(job["id"])
+            self._send_json(200, job)
+
+    def _save_upload(self):
+        """Stream the request body to a temporary file (never fully into memory) and return its path."""
+        upload_dir = os.path.join(self.service.output_dir, "uploads")
+        os.makedirs(upload_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=upload_dir, suffix=".log")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in read_request_body(self.rfile, self.headers):
+                    f.write(chunk)
+        except Exception:
+            os.remove(path)
+            raise
+        return path
+
+    def _send_json(self, status, data, headers=None):
+        self._send(status, json.dumps(data, default=record_to_json), "application/json", headers)
+
+    def _send(self, status, text, content_type, headers=None):
+        body = text.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Jobs are counted in /metrics instead of one stderr line per request
+
+def parse_job_options(params):
+    """
+    Pick the analysis options out of query/JSON parameters, converting query
+    strings to their types. Raises ValueError for a value that is not a
+    string, number or boolean (e.g. a JSON null).
+    """
+    options = {}
+    for name, kind in JOB_OPTIONS.items():
+        if name not in params:
+            continue
+        value = params[name]
+        if not isinstance(value, (str, int, float, bool)):
+            raise ValueError(f"{name} must be a string, number or boolean")
+        if kind is bool and isinstance(value, str):
+            value = value.lower() not in ("0", "false", "no")
+        options[name] = kind(value)
+    return options
+
+def create_server(config, host="127.0.0.1", port=8765, max_concurrent_jobs=2, max_queued_jobs=32):
+    """Build the HTTP server with a warm AnalysisService attached (port 0 picks a free port)."""
+    server = ThreadingHTTPServer((host, port), AnalysisRequestHandler)
+    server.daemon_threads = True
+    server.service = AnalysisService(config, max_concurrent_jobs, max_queued_jobs)
+    return server
+
+def run_service(config, host=None, port=None):
+    """Serve the analysis API until interrupted."""
+    server = create_server(
+        config,
+        host=host or config.get("SERVICE_HOST", "127.0.0.1"),
+        port=port if port is not None else config.get("SERVICE_PORT", 8765),
+        max_concurrent_jobs=config.get("SERVICE_MAX_JOBS", 2),
+        max_queued_jobs=config.get("SERVICE_MAX_QUEUED", 32)
+    )
+    host, port = server.server_address[:2]
+    print(f"🚀 Log analysis service listening on http://{host}:{port} (POST /analyze, GET /jobs/<id>, /health, /metrics)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping log analysis service")
+    finally:
+        server.server_close()
+        server.service.shutdown()
@@ -0,0 +1,31 @@
+# filepath: log-analysis-gemini/src/signatures.py
+
+import hashlib
+import re
+
+# Applied in order: timestamps first so their digits are not picked up as IDs or IPs
+MASKS = [
+    (re.compile(r'\d{4}[-/]\d{2}[-/]\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?'), '<TS>'),
+    (re.compile(r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}'), '<TS>'),
+    (re.compile(r'\bimsi-\d+', re.IGNORECASE), 'imsi-<IMSI>'),
+    (re.compile(r'\b(TEID\s*[=:]?\s*)(?:0x[0-9a-f]+|\d+)', re.IGNORECASE), r'\1<TEID>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?:/\d{1,2})?(?::\d+)?\b'), '<IP>'),
+    (re.compile(r'\b(?:[0-9a-f]{1,4}:){7}[0-9a-f]{1,4}\b'
+                r'|(?<![\w:])(?:[0-9a-f]{1,4}(?::[0-9a-f]{1,4})*)?::(?:[0-9a-f]{1,4}(?::[0-9a-f]{1,4})*)?(?![\w:])',
+                re.IGNORECASE), '<IP>'),
+    (re.compile(r'\b((?:PDU\s+)?session(?:\s+ID)?\s*[:=#]?\s*|\bID\s*[:=]\s*)\d+\b', re.IGNORECASE), r'\1<SID>'),
+    (re.compile(r'\b0x[0-9a-f]+\b', re.IGNORECASE), '<HEX>'),
+]
+
+def normalize_error(line):
+    """
+    Reduce an error line to its template by masking per-occurrence values
+    (timestamps, IMSIs, TEIDs, IPs, session IDs, hex IDs).
+    """
+    for pattern, replacement in MASKS:
+        line = pattern.sub(replacement, line)
+    return " ".join(line.split())
+
+def error_signature(line):
+    """Stable hash of the normalized error template."""
+    return hashlib.blake2b(normalize_error(line).encode('utf-8'), digest_size=16).hexdigest()
@@ -1,15 +1,86 @@
 # filepath: log-analysis-gemini/src/start.py
 
+import argparse
 import os
 from config import load_config
-from main import run_analysis
+from main import run_analysis, run_batch_analysis, run_follow, run_triage
+from log_formats import LOG_FORMATS
 
-def main():
-    # Load configuration settings
+OUTPUT_FORMATS = ["json", "ndjson", "jsonl", "csv", "columnar", "parquet"]
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Extract errors with context from 5G core logs and optionally analyze them with Gemini.",
+        epilog="'start.py serve [--port N]' runs the resident HTTP analysis service instead."
+    )
+    parser.add_argument("path", nargs="?",
+                        help="Log file, or a directory to analyze all of its logs (default: choose from logs/)")
+    parser.add_argument("-c", "--context-lines", type=int, default=5, help="Lines kept before and after each error")
+    parser.add_argument("-f", "--format", choices=OUTPUT_FORMATS, help="Output format (default: ANALYSIS_OUTPUT_FORMAT)")
+    parser.add_argument("--log-format", choices=["auto"] + list(LOG_FORMATS),
+                        help="Log layout (default: LOG_FORMAT, or detected per file)")
+    parser.add_argument("--correlate", action="store_true",
+                        help="Attach earlier lines for the same IMSI/session/TEID/IP to each error")
+    parser.add_argument("--workers", type=int, help="Worker processes for a directory (default: ANALYSIS_WORKERS)")
+    parser.add_argument("--follow", action="store_true",
+                        help="Keep polling the file and append new errors to follow_errors.ndjson")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between polls with --follow")
+    parser.add_argument("--no-llm", action="store_true", help="Skip the Gemini stage even if GEMINI_API_KEY is set")
+    triage = parser.add_argument_group("triage", "Quick error summary of one file instead of a full analysis (no LLM)")
+    triage.add_argument("--max-errors", type=int, help="Stop after this many errors")
+    triage.add_argument("--tail-mb", type=float, help="Scan only the last N MB of the file")
+    triage.add_argument("--sample", type=float, metavar="FRACTION",
+                        help="Scan this fraction of 1 MB chunks (e.g. 0.01) and estimate totals with 95%% bounds")
+    triage.add_argument("--count-only", action="store_true", help="Only count errors by level and template")
+    triage.add_argument("--levels", help="Comma-separated levels to count, e.g. FATAL,CRITICAL")
+    parser.add_argument("--port", type=int, help="Port for 'serve' (default: SERVICE_PORT)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Load configuration settings; command line options take precedence
     config = load_config()
-    
-    # Initialize the log analysis process
-    run_analysis(config)
+    if args.format:
+        config["ANALYSIS_OUTPUT_FORMAT"] = args.format
+    if args.log_format:
+        config["LOG_FORMAT"] = args.log_format
+    if args.correlate:
+        config["CORRELATE_ENTITIES"] = True
+    if args.no_llm:
+        config["GEMINI_API_KEY"] = None  # The Gemini client is then never imported
+
+    # "serve" keeps a warm analyzer running behind a local HTTP API
+    if args.path == "serve" and not os.path.exists(args.path):
+        from service import run_service
+        run_service(config, port=args.port)
+        return
+
+    # Follow mode analyzes only the lines appended since the last poll
+    if args.follow:
+        run_follow(config, args.path, context_lines=args.context_lines, interval=args.interval)
+        return
+
+    # Triage options give a quick summary of one file instead of a full analysis
+    if any(option is not None for option in (args.max_errors, args.tail_mb, args.sample, args.levels)) or args.count_only:
+        run_triage(
+            config, args.path,
+            context_lines=args.context_lines,
+            max_errors=args.max_errors,
+            tail_bytes=int(args.tail_mb * 1024 * 1024) if args.tail_mb is not None else None,
+            sample_fraction=args.sample,
+            count_only=args.count_only,
+            levels=args.levels.split(",") if args.levels else None
+        )
+        return
+
+    # A directory argument analyzes all of its log files in one batch
+    if args.path and os.path.isdir(args.path):
+        run_batch_analysis(config, args.path, context_lines=args.context_lines, workers=args.workers)
+        return
+
+    # Initialize the log analysis process (interactive file selection without a path)
+    run_analysis(config, args.path, context_lines=args.context_lines)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,210 @@
+# filepath: log-analysis-gemini/src/timestamps.py
+
+import re
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import date, datetime, timezone
+
+NO_TIMESTAMP = -(2 ** 63)  # int64 sentinel for errors without a timestamp
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+class TimestampFormat:
+    """
+    One supported timestamp layout. All of them are 19 characters with the
+    time in the last 8, so after detection a timestamp is parsed by slicing
+    instead of a regex or strptime.
+    """
+
+    def __init__(self, name, pattern, separator_position, separator, year, month, day):
+        self.name = name
+        self.regex = re.compile(pattern)
+        self.separator_position = separator_position
+        self.separator = separator
+        self.year, self.month, self.day = year, month, day
+
+    def fits(self, timestamp):
+        return len(timestamp) == 19 and timestamp[self.separator_position] == self.separator
+
+    def day_start(self, timestamp):
+        """Epoch seconds at midnight (UTC) of the timestamp's date."""
+        year = int(timestamp[self.year[0]:self.year[1]])
+        month = int(timestamp[self.month[0]:self.month[1]])
+        day = int(timestamp[self.day[0]:self.day[1]])
+        return (date(year, month, day).toordinal() - EPOCH_ORDINAL) * 86400
+
+# In the order _extract_timestamp has always tried them
+TIMESTAMP_FORMATS = [
+    TimestampFormat("YYYY-MM-DD HH:MM:SS", r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', 4, '-', (0, 4), (5, 7), (8, 10)),
+    TimestampFormat("MM/DD/YYYY HH:MM:SS", r'\d{2}/\d{2}/\d{4} \d{2}:\d{2}:\d{2}', 2, '/', (6, 10), (0, 2), (3, 5)),
+    TimestampFormat("YYYY/MM/DD HH:MM:SS", r'\d{4}/\d{2}/\d{2} \d{2}:\d{2}:\d{2}', 4, '/', (0, 4), (5, 7), (8, 10)),
+]
+
+def extract_timestamp(line, timestamp_format=None):
+    """
+    Return the first timestamp found in a log line, or None. With a
+    `timestamp_format` (see detect_line_format) only its pattern is tried;
+    otherwise the formats are tried in order.
+    """
+    if timestamp_format is not None:
+        match = timestamp_format.regex.search(line)
+        return match.group() if match else None
+    for timestamp_format in TIMESTAMP_FORMATS:
+        match = timestamp_format.regex.search(line)
+        if match:
+            return match.group()
+    return None
+
+def detect_line_format(lines):
+    """Return the format of the first timestamp found in the lines (formats tried in order), or None."""
+    for line in lines:
+        for timestamp_format in TIMESTAMP_FORMATS:
+            if timestamp_format.regex.search(line):
+                return timestamp_format
+    return None
+
+def detect_format(timestamps):
+    """Return the format of the first non-empty timestamp string, or None."""
+    for timestamp in timestamps:
+        if timestamp:
+            for timestamp_format in TIMESTAMP_FORMATS:
+                if timestamp_format.fits(timestamp) and timestamp_format.regex.fullmatch(timestamp):
+                    return timestamp_format
+    return None
+
+def parse_epochs(timestamps, timestamp_format=None):
+    """
+    Parse a batch of timestamp strings (read as UTC) into an array('q') of
+    epoch seconds, with NO_TIMESTAMP for missing or unparsable values.
+    The format is detected once for the batch and the start of each distinct
+    minute is computed once, so most timestamps cost one dict lookup, a slice
+    and an int() call.
+    """
+    timestamps = list(timestamps)
+    timestamp_format = timestamp_format or detect_format(timestamps)
+    epochs = array('q')
+    append = epochs.append
+    minute_starts = {}
+
+    for timestamp in timestamps:
+        minute_start = minute_starts.get(timestamp[:16]) if timestamp else None
+        if minute_start is not None:
+            # Fast path: minute seen before, only the seconds are new
+            try:
+                append(minute_start + int(timestamp[17:19]))
+                continue
+            except ValueError:
+                pass
+
+        if not timestamp:
+            append(NO_TIMESTAMP)
+            continue
+
+        current_format = timestamp_format
+        if current_format is None or not current_format.fits(timestamp):
+            # A line in another layout than the rest of the batch
+            current_format = detect_format([timestamp])
+            if current_format is None:
+                append(NO_TIMESTAMP)
+                continue
+
+        try:
+            minute_start = current_format.day_start(timestamp) + int(timestamp[11:13]) * 3600 + int(timestamp[14:16]) * 60
+            append(minute_start + int(timestamp[17:19]))
+        except ValueError:
+            append(NO_TIMESTAMP)
+            continue
+        minute_starts[timestamp[:16]] = minute_start
+    return epochs
+
+def timestamp_to_epoch(timestamp):
+    """Epoch seconds for a single timestamp string (NO_TIMESTAMP if missing)."""
+    return parse_epochs([timestamp])[0]
+
+def format_epoch(epoch):
+    """Format epoch seconds back into a YYYY-MM-DD HH:MM:SS string (UTC)."""
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+
+def rate_histogram(epochs, bucket_seconds=60):
+    """Sorted [(bucket_start, errors)] for the non-empty buckets of `bucket_seconds` width."""
+    counts = Counter(epoch - epoch % bucket_seconds for epoch in epochs if epoch != NO_TIMESTAMP)
+    return sorted(counts.items())
+
+def detect_bursts(epochs, bucket_seconds=60, factor=3.0, min_count=5):
+    """
+    Find runs of buckets whose error count is at least `factor` times the
+    median bucket (empty buckets between the first and last error included)
+    and at least `min_count`. Each burst reports its window, error count,
+    peak per-second rate and how long it took to reach that peak.
+    """
+    histogram = rate_histogram(epochs, bucket_seconds)
+    if not histogram:
+        return []
+
+    first_bucket, last_bucket = histogram[0][0], histogram[-1][0]
+    bucket_count = (last_bucket - first_bucket) // bucket_seconds + 1
+    counts = dict(histogram)
+    non_empty = sorted(counts.values())
+    # Median over all buckets without materializing the empty ones
+    empty = bucket_count - len(non_empty)
+    middle = bucket_count // 2
+    baseline = 0 if middle < empty else non_empty[middle - empty]
+    threshold = max(min_count, factor * baseline)
+
+    bursts = []
+    for bucket, count in histogram:
+        if count < threshold:
+            continue
+        if bursts and bursts[-1]["end"] == bucket:
+            bursts[-1]["end"] = bucket + bucket_seconds
+            bursts[-1]["errors"] += count
+        else:
+            bursts.append({"start": bucket, "end": bucket + bucket_seconds, "errors": count})
+
+    per_second = rate_histogram(epochs, 1)
+    seconds = [second for second, _ in per_second]
+    for burst in bursts:
+        inside = per_second[bisect_left(seconds, burst["start"]):bisect_left(seconds, burst["end"])]
+        peak_second, peak_count = max(inside, key=lambda item: item[1])
+        first_second = inside[0][0]
+        burst.update({
+            "baseline_per_bucket": baseline,
+            "first_error": first_second,
+            "peak_at": peak_second,
+            "peak_per_second": peak_count,
+            "seconds_to_peak": peak_second - first_second,
+            "average_per_second": round(burst["errors"] / (burst["end"] - burst["start"]), 3)
+        })
+    return bursts
+
+def error_timeline(errors, burst_bucket_seconds=60, burst_factor=3.0, burst_min_count=5):
+    """
+    Time profile of a list of error records: first and last error, per-minute
+    and per-second error-rate histograms and detected bursts, with times as
+    YYYY-MM-DD HH:MM:SS strings.
+    """
+    epochs = parse_epochs(error.get('timestamp') for error in errors)
+    timed = [epoch for epoch in epochs if epoch != NO_TIMESTAMP]
+    if not timed:
+        return {"errors_with_timestamp": 0, "per_minute": [], "per_second": [], "bursts": []}
+
+    per_minute = rate_histogram(timed, 60)
+    per_second = rate_histogram(timed, 1)
+    peak_minute = max(per_minute, key=lambda item: item[1])
+    peak_second = max(per_second, key=lambda item: item[1])
+
+    bursts = detect_bursts(timed, burst_bucket_seconds, burst_factor, burst_min_count)
+    for burst in bursts:
+        for key in ("start", "end", "first_error", "peak_at"):
+            burst[key] = format_epoch(burst[key])
+
+    return {
+        "errors_with_timestamp": len(timed),
+        "first_error": format_epoch(min(timed)),
+        "last_error": format_epoch(max(timed)),
+        "peak_minute": {"start": format_epoch(peak_minute[0]), "errors": peak_minute[1]},
+        "peak_second": {"at": format_epoch(peak_second[0]), "errors": peak_second[1]},
+        "per_minute": [[format_epoch(bucket), count] for bucket, count in per_minute],
+        "per_second": [[format_epoch(bucket), count] for bucket, count in per_second],
+        "bursts": bursts
+    }
@@ -0,0 +1,195 @@
+# filepath: log-analysis-gemini/src/triage.py
+
+import math
+import os
+from collections import Counter
+
+from analyzer import _analyze_chunk
+from log_sources import is_compressed
+from signatures import normalize_error
+
+SAMPLE_CHUNK_SIZE = 1024 * 1024  # Bytes per sampled chunk
+CONFIDENCE_Z = 1.96  # 95% confidence bounds for sampled estimates
+TOP_TEMPLATES = 20  # Error templates listed in a triage summary
+
+def _line_start(file, offset):
+    """First line start at or after byte `offset`."""
+    if offset <= 0:
+        return 0
+    file.seek(offset - 1)
+    file.readline()  # Finish the line that `offset - 1` falls in
+    return file.tell()
+
+def _offset_after_lines(log_file_path, start, line_count):
+    """Byte offset just past the first `line_count` lines that begin at `start`."""
+    with open(log_file_path, 'rb') as file:
+        file.seek(start)
+        for _ in range(line_count):
+            if not file.readline():
+                break
+        return file.tell()
+
+def _scan_ranges(log_file_path, file_size, tail_bytes, sample_fraction, chunk_size):
+    """
+    Byte ranges to scan, each starting on a line: the whole file, its last
+    `tail_bytes`, or every k-th `chunk_size` chunk for sample_fraction = 1/k.
+    Also returns the number of chunks the file has (for sampled estimates).
+    """
+    if sample_fraction is None:
+        start = 0 if tail_bytes is None else max(0, file_size - tail_bytes)
+        with open(log_file_path, 'rb') as file:
+            return [(_line_start(file, start), file_size)], 1
+
+    total_chunks = max(1, math.ceil(file_size / chunk_size))
+    stride = max(1, round(1 / sample_fraction))
+    ranges = []
+    with open(log_file_path, 'rb') as file:
+        for chunk in range(0, total_chunks, stride):
+            start = _line_start(file, chunk * chunk_size)
+            end = _line_start(file, (chunk + 1) * chunk_size) if chunk + 1 < total_chunks else file_size
+            if start < end:
+                ranges.append((start, end))
+    return ranges, total_chunks
+
+def estimate_total(counts, sizes, total_bytes, total_chunks, z=CONFIDENCE_Z):
+    """
+    Ratio estimate of a file-wide count from per-chunk counts and chunk
+    sizes (bytes), with a normal-approximation confidence interval that
+    uses the spread of the chunk counts and the finite population
+    correction. Returns {"count", "low", "high"}; the bounds never go
+    below what was actually seen.
+    """
+    observed = sum(counts)
+    sampled_bytes = sum(sizes)
+    n = len(counts)
+    if not sampled_bytes:
+        return {"count": 0, "low": 0, "high": 0}
+    ratio = observed / sampled_bytes
+    estimate = ratio * total_bytes
+    if n >= total_chunks:
+        return {"count": observed, "low": observed, "high": observed}  # Every chunk was scanned
+
+    if n > 1:
+        residuals = [count - ratio * size for count, size in zip(counts, sizes)]
+        variance = sum(r * r for r in residuals) / (n - 1)
+        margin = z * total_chunks * math.sqrt((1 - n / total_chunks) * variance / n)
+    else:
+        margin = estimate  # A single chunk says nothing about the spread
+    return {
+        "count": round(estimate),
+        "low": max(observed, math.floor(estimate - margin)),
+        "high": max(observed, math.ceil(estimate + margin))
+    }
+
+def triage_log_file(analyzer, log_file_path, max_errors=None, tail_bytes=None, sample_fraction=None,
+                    count_only=False, context_lines=0, levels=None, chunk_size=SAMPLE_CHUNK_SIZE):
+    """
+    Quick error summary of a (possibly huge) log file without a full analysis.
+    - max_errors: stop after that many errors (with levels={"FATAL", "CRITICAL"}
+      and max_errors=1 this answers "is there any fatal error?").
+    - tail_bytes: scan only the end of the file.
+    - sample_fraction: scan every k-th chunk (k = 1/sample_fraction) and
+      estimate file-wide counts with 95% confidence bounds.
+    - count_only: count errors by level and template, keep no records.
+    Bracketed logs use the memory-mapped scanner. Line numbers of the
+    returned errors count from the start of the range they were found in
+    (recorded as 'range_start', a byte offset) unless the whole file is scanned.
+    'bytes_scanned' ends at the line where an early stop happened (None for
+    a compressed file, whose decompressed position is not tracked).
+    """
+    if not os.path.exists(log_file_path):
+        return {"error": f"Log file not found: {log_file_path}"}
+    if sample_fraction is not None and not 0 < sample_fraction <= 1:
+        return {"error": f"sample_fraction must be in (0, 1]: {sample_fraction}"}
+    if sample_fraction is not None and tail_bytes is not None:
+        return {"error": "Choose either tail_bytes or sample_fraction"}
+    if (sample_fraction is not None or tail_bytes is not None) and is_compressed(log_file_path):
+        return {"error": "Tail and sampled scans need an uncompressed file (compressed logs can only be read front to back)"}
+
+    try:
+        log_format = analyzer.resolve_log_format(log_file_path)
+        file_size = os.path.getsize(log_file_path)
+        levels = {level.upper() for level in levels} if levels else None
+        if count_only:
+            context_lines = 0
+
+        ranges, total_chunks = _scan_ranges(log_file_path, file_size, tail_bytes, sample_fraction, chunk_size)
+        whole_file = ranges == [(0, file_size)]
+
+        by_level = Counter()
+        by_template = Counter()
+        chunk_counts = []
+        chunk_level_counts = []
+        errors = []
+        found = 0
+        bytes_scanned = 0
+        stopped_early = False
+
+        for start, end in ranges:
+            if is_compressed(log_file_path) or (whole_file and not log_format.uses_matcher):
+                range_errors = analyzer.iter_errors(log_file_path, context_lines)
+            elif log_format.uses_matcher:
+                range_errors = analyzer.iter_errors_mmap(log_file_path, context_lines, start=start, end=end)
+            else:
+                range_errors = iter(_analyze_chunk(analyzer, log_file_path, start, end, context_lines, log_format)[0])
+
+            range_levels = Counter()
+            for error in range_errors:
+                level = str(error.level or "unknown").upper()
+                if levels is not None and level not in levels:
+                    continue
+                found += 1
+                range_levels[level] += 1
+                by_template[normalize_error(error.error_line)] += 1
+                if not count_only:
+                    if not whole_file:
+                        error['range_start'] = start
+                    errors.append(error)
+                if max_errors is not None and found >= max_errors:
+                    stopped_early = True
+                    break
+
+            by_level.update(range_levels)
+            chunk_counts.append(sum(range_levels.values()))
+            chunk_level_counts.append(range_levels)
+            if stopped_early:
+                if is_compressed(log_file_path):
+                    bytes_scanned = None
+                else:
+                    bytes_scanned += _offset_after_lines(log_file_path, start, error.line_number) - start
+                break
+            bytes_scanned += end - start
+
+        summary = {
+            "log_file": log_file_path,
+            "log_format": log_format.name,
+            "file_size": file_size,
+            "bytes_scanned": bytes_scanned,
+            "mode": "sample" if sample_fraction is not None else "tail" if tail_bytes is not None else "full",
+            "stopped_early": stopped_early,
+            "errors_found": found,
+            "by_level": dict(by_level.most_common()),
+            "top_templates": [
+                {"template": template, "count": count} for template, count in by_template.most_common(TOP_TEMPLATES)
+            ]
+        }
+
+        if sample_fraction is not None and not stopped_early:
+            sizes = [end - start for start, end in ranges]
+            summary["estimate"] = {
+                "chunks_sampled": len(ranges),
+                "chunks_total": total_chunks,
+                "confidence": 0.95,
+                "errors": estimate_total(chunk_counts, sizes, file_size, total_chunks),
+                "by_level": {
+                    level: estimate_total([counts[level] for counts in chunk_level_counts], sizes, file_size, total_chunks)
+                    for level in summary["by_level"]
+                }
+            }
+
+        if not count_only:
+            summary["errors"] = errors
+        return summary
+
+    except Exception as e:
+        return {"error": f"Error triaging log file: {str(e)}"}
@@ -1,3 +1,5 @@
+import csv
+import json
 import unittest
 import os
 import sys
@@ -68,6 +70,82 @@ class TestLogAnalyzer(unittest.TestCase):
             # Clean up
             os.unlink(temp_file_path)
 
+    def test_iter_errors_streams_overlapping_context(self):
+        # Errors closer together than context_lines share context lines
+        log_content = """2023-10-01 12:00:00 [INFO] System started
+2023-10-01 12:01:00 [ERROR] First failure
+2023-10-01 12:02:00 [ERROR] Second failure
+2023-10-01 12:03:00 [INFO] System recovered
+2023-10-01 12:04:00 [INFO] Process completed"""
+
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.log', delete=False) as temp_file:
+            temp_file.write(log_content)
+            temp_file_path = temp_file.name
+
+        try:
+            errors = self.analyzer.iter_errors(temp_file_path, context_lines=2)
+            first_error = next(errors)
+            self.assertEqual(first_error['line_number'], 2)
+            self.assertEqual([c['line_number'] for c in first_error['context_before']], [1])
+            self.assertEqual([c['line_number'] for c in first_error['context_after']], [3, 4])
+
+            second_error = next(errors)
+            self.assertEqual(second_error['line_number'], 3)
+            self.assertEqual([c['line_number'] for c in second_error['context_before']], [1, 2])
+            # Trailing context is cut short by the end of the file
+            self.assertEqual([c['line_number'] for c in second_error['context_after']], [4, 5])
+            self.assertIsNone(next(errors, None))
+
+            no_context = list(self.analyzer.iter_errors(temp_file_path, context_lines=0))
+            self.assertEqual([e['line_number'] for e in no_context], [2, 3])
+            self.assertEqual(no_context[0]['context_before'], [])
+            self.assertEqual(no_context[0]['context_after'], [])
+
+        finally:
+            os.unlink(temp_file_path)
+
+    def test_iter_errors_parallel_matches_serial(self):
+        # Tiny chunks force context windows to cross chunk boundaries
+        log_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+        for context_lines in (0, 3, 40):
+            serial = list(self.analyzer.iter_errors(log_file, context_lines))
+            parallel = list(self.analyzer.iter_errors_parallel(
+                log_file, context_lines, workers=2, min_chunk_size=1024
+            ))
+            self.assertEqual(parallel, serial)
+
+    def test_iter_errors_mmap_matches_stream(self):
+        # Small blocks make error lines and context straddle block boundaries
+        log_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+        for context_lines in (0, 3, 40):
+            streamed = list(self.analyzer.iter_errors(log_file, context_lines))
+            mapped = list(self.analyzer.iter_errors_mmap(log_file, context_lines, block_size=512))
+            self.assertEqual(mapped, streamed)
+
+    def test_streaming_output_formats(self):
+        log_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+        expected = list(self.analyzer.iter_errors(log_file, 3))
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = self.analyzer.analyze_large_log_file(
+                log_file, context_lines=3, output_format="ndjson", output_dir=output_dir
+            )
+            self.assertEqual(result['data']['errors'], expected)
+            self.assertEqual(result['output_file'], os.path.join(output_dir, "error_analysis.ndjson"))
+            with open(result['output_file'], encoding='utf-8') as f:
+                self.assertEqual([json.loads(line) for line in f], expected)
+
+            result = self.analyzer.stream_log_file(
+                log_file, context_lines=3, output_format="csv", output_dir=output_dir
+            )
+            self.assertEqual(result['total_errors'], len(expected))
+            with open(result['output_file'], newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual([int(row['line_number']) for row in rows], [e['line_number'] for e in expected])
+
+            result = self.analyzer.stream_log_file(log_file, output_format="json", output_dir=output_dir)
+            self.assertIn('error', result)
+
     def test_prepare_for_llm_from_memory(self):
         # Test LLM data preparation
         test_data = {
@@ -92,5 +170,37 @@ class TestLogAnalyzer(unittest.TestCase):
         self.assertIn('Context Before:', result)
         self.assertIn('Context After:', result)
 
+    def test_build_llm_input_enforces_budget(self):
+        def error(line_number, level, message):
+            return {
+                'line_number': line_number,
+                'error_line': f"2023-10-01 12:00:00 [{level}] {message}",
+                'context_before': [{'line_number': line_number - 1, 'content': 'x' * 200}],
+                'context_after': []
+            }
+
+        test_data = {
+            'total_errors_found': 4,
+            'log_file': 'test.log',
+            'errors': [
+                error(10, 'ERROR', 'Database connection timeout'),
+                error(20, 'ERROR', 'Database connection timeout'),
+                error(30, 'FATAL', 'SMF process crashed'),
+                error(40, 'ERROR', 'PCF unreachable'),
+            ]
+        }
+
+        unlimited = self.analyzer.build_llm_input(test_data)
+        self.assertEqual(unlimited['dropped'], [])
+        self.assertEqual(unlimited['text'], self.analyzer.prepare_for_llm_from_memory(test_data))
+
+        result = self.analyzer.build_llm_input(test_data, max_chars=1100)
+        self.assertLessEqual(len(result['text']), 1100)
+        # FATAL first, then the rare error, and the repeated ones are cut
+        self.assertEqual(result['included'], [3, 4])
+        self.assertEqual(result['dropped'], [1, 2])
+        self.assertIn("[Omitted 2 of 4 errors", result['text'])
+        self.assertLess(result['text'].index('Error #3'), result['text'].index('Error #4'))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
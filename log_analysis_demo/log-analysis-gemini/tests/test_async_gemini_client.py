@@ -0,0 +1,140 @@
+import unittest
+import asyncio
+import os
+import sys
+import time
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from api.async_gemini_client import AsyncGeminiClient, split_into_batches
+
+class RateLimited(Exception):
+    code = 429
+
+class ServiceUnavailable(Exception):
+    code = 503
+
+class PermissionDenied(Exception):
+    code = 403
+
+class StubTransport:
+    """Fake model: echoes prompts, fails the first `failures` calls, tracks concurrency."""
+
+    def __init__(self, failures=0, error=RateLimited, message="Resource has been exhausted"):
+        self.failures = failures
+        self.error = error
+        self.message = message
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def generate(self, prompt):
+        self.calls += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if self.failures > 0:
+                self.failures -= 1
+                raise self.error(self.message)
+            return f"analysis of {prompt}"
+        finally:
+            self.in_flight -= 1
+
+class TestAsyncGeminiClient(unittest.TestCase):
+
+    def test_split_into_batches(self):
+        batches = split_into_batches([3, 3, 3, 5, 1], 6, lambda item: item)
+        self.assertEqual(batches, [[3, 3], [3], [5, 1]])
+        # An item larger than the budget still gets its own batch
+        self.assertEqual(split_into_batches([10, 1], 6, lambda item: item), [[10], [1]])
+
+    def test_concurrency_limit_and_order(self):
+        transport = StubTransport()
+        client = AsyncGeminiClient(transport=transport, max_concurrency=3)
+        results = client.fetch_all_sync([f"p{i}" for i in range(10)])
+
+        self.assertEqual([r['text'] for r in results], [f"analysis of p{i}" for i in range(10)])
+        self.assertEqual([r['batch'] for r in results], list(range(1, 11)))
+        self.assertLessEqual(transport.max_in_flight, 3)
+
+    def test_retries_after_rate_limit(self):
+        transport = StubTransport(failures=2)
+        client = AsyncGeminiClient(transport=transport, max_concurrency=1, base_delay=0, rate_limit_delay=0.01)
+        results = client.fetch_all_sync(["p"])
+
+        self.assertEqual(results[0]['text'], "analysis of p")
+        self.assertEqual(results[0]['attempts'], 3)
+
+    def test_cooldown_outlives_a_new_call(self):
+        # A 429 in one job keeps later calls on the shared client waiting too
+        transport = StubTransport(failures=1)
+        client = AsyncGeminiClient(transport=transport, base_delay=0, rate_limit_delay=0.2)
+
+        async def two_jobs():
+            first = asyncio.ensure_future(client.fetch_all(["p"]))
+            await asyncio.sleep(0.05)  # The first call has hit the rate limit
+            started = time.monotonic()
+            second = await client.fetch_all(["q"])
+            waited = time.monotonic() - started
+            return await first, second, waited
+
+        first, second, waited = asyncio.run(two_jobs())
+        self.assertEqual((first[0]['text'], second[0]['text']), ("analysis of p", "analysis of q"))
+        self.assertGreaterEqual(waited, 0.1)
+
+    def test_gives_up_after_max_retries(self):
+        transport = StubTransport(failures=10, error=ServiceUnavailable, message="model overloaded")
+        client = AsyncGeminiClient(transport=transport, max_retries=2, base_delay=0)
+        results = client.fetch_all_sync(["p"])
+
+        self.assertIsNone(results[0]['text'])
+        self.assertEqual(results[0]['error'], "model overloaded")
+        self.assertEqual(transport.calls, 3)
+
+    def test_only_transient_errors_are_retried(self):
+        for error in (PermissionDenied, ValueError):
+            transport = StubTransport(failures=1, error=error, message="API key not valid (code 429 in docs)")
+            results = AsyncGeminiClient(transport=transport, base_delay=0).fetch_all_sync(["p"])
+            self.assertIsNone(results[0]['text'])
+            self.assertEqual(transport.calls, 1)
+
+        transport = StubTransport(failures=1, error=TimeoutError, message="deadline")
+        results = AsyncGeminiClient(transport=transport, base_delay=0).fetch_all_sync(["p"])
+        self.assertEqual(results[0]['attempts'], 2)
+
+    def test_backoff_releases_the_slot(self):
+        # While one batch backs off, the other one runs instead of waiting for the slot
+        class FailFirstPrompt(StubTransport):
+            async def generate(self, prompt):
+                if prompt == "slow" and self.failures:
+                    self.failures -= 1
+                    raise ServiceUnavailable("unavailable")
+                self.order.append(prompt)
+                return prompt
+
+        transport = FailFirstPrompt(failures=1)
+        transport.order = []
+        client = AsyncGeminiClient(transport=transport, max_concurrency=1, base_delay=0.2)
+        client.fetch_all_sync(["slow", "fast"])
+        self.assertEqual(transport.order, ["fast", "slow"])
+
+    def test_sync_calls_share_one_event_loop(self):
+        # The real SDK caches its async channel on the first loop, so later jobs must reuse it
+        loops = []
+
+        class LoopRecorder(StubTransport):
+            async def generate(self, prompt):
+                loops.append(asyncio.get_running_loop())
+                return await super().generate(prompt)
+
+        client = AsyncGeminiClient(transport=LoopRecorder())
+        client.fetch_all_sync(["a"])
+        client.fetch_all_sync(["b", "c"])
+        client.close()
+        self.assertEqual(len(set(map(id, loops))), 1)
+        self.assertEqual(len(loops), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import csv
+import gzip
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from batch import analyze_log_directory, find_log_files, iter_merged_errors, network_function_of
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.logs_dir = os.path.join(self.temp_dir.name, "logs")
+        os.makedirs(os.path.join(self.logs_dir, "amf"))
+
+        self.write(os.path.join(self.logs_dir, "smf.log"), [
+            "2025-09-04 08:00:01 [INFO] SMF started",
+            "2025-09-04 08:00:03 [ERROR] SMF session setup failed",
+            "2025-09-04 08:00:06 [ERROR] SMF PFCP timeout",
+        ])
+        self.write(os.path.join(self.logs_dir, "amf", "amf.log.1.gz"), [
+            "2025-09-04 08:00:02 [ERROR] AMF lost N2 connection",
+            "2025-09-04 08:00:05 [CRITICAL] AMF registration storm",
+        ])
+        self.write(os.path.join(self.logs_dir, "upf.txt"), [
+            "2025-09-04 08:00:02 [ERROR] UPF tunnel down",  # Same time as the AMF error
+        ])
+        self.write(os.path.join(self.logs_dir, "upf.txt.idx"), ["not a log"])
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, path, lines):
+        opener = gzip.open if path.endswith(".gz") else open
+        with opener(path, 'wt', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+
+    def test_find_log_files(self):
+        names = [os.path.relpath(path, self.logs_dir) for path in find_log_files(self.logs_dir)]
+        self.assertEqual(names, [os.path.join("amf", "amf.log.1.gz"), "smf.log", "upf.txt"])
+        self.assertEqual(network_function_of("logs/amf.log.1.gz"), "AMF")
+        self.assertEqual(network_function_of("logs/core-smf_2.log"), "SMF")
+        self.assertIsNone(network_function_of("logs/simulator_test.txt"))
+
+    def test_merged_errors_are_time_ordered(self):
+        analyzer = LogAnalyzer()
+        log_files = find_log_files(self.logs_dir)
+
+        serial = list(iter_merged_errors(analyzer, log_files, context_lines=1, workers=1))
+        self.assertEqual([e['timestamp'][-2:] for e in serial], ["02", "02", "03", "05", "06"])
+        self.assertEqual([e['network_function'] for e in serial], ["AMF", "UPF", "SMF", "AMF", "SMF"])
+        self.assertTrue(serial[0]['source_file'].endswith("amf.log.1.gz"))
+        self.assertEqual(serial[2]['context_before'][0]['content'], "2025-09-04 08:00:01 [INFO] SMF started")
+
+        parallel = list(iter_merged_errors(analyzer, log_files, context_lines=1, workers=2))
+        self.assertEqual(parallel, serial)
+
+    def test_analyze_log_directory(self):
+        output_dir = os.path.join(self.temp_dir.name, "output")
+        result = analyze_log_directory(
+            LogAnalyzer(), self.logs_dir, context_lines=1, workers=1, output_format="csv", output_dir=output_dir
+        )
+        self.assertEqual(result['total_errors'], 5)
+        self.assertEqual([f['errors'] for f in result['data']['log_files']], [2, 2, 1])
+
+        with open(result['output_file'], newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['network_function'] for row in rows], ["AMF", "UPF", "SMF", "AMF", "SMF"])
+
+        self.assertIn('error', analyze_log_directory(LogAnalyzer(), os.path.join(self.temp_dir.name, "missing")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from clustering import cluster_errors
+
+def make_error(line_number, message, second=0):
+    timestamp = f"2025-09-04 08:{line_number % 60:02d}:{second:02d}"
+    return {
+        "error_line": f"{timestamp} [ERROR] {message}",
+        "line_number": line_number,
+        "context_before": [{"line_number": line_number - 1, "content": "previous"}],
+        "context_after": [],
+        "timestamp": timestamp
+    }
+
+class TestClustering(unittest.TestCase):
+
+    def test_repeated_faults_collapse_into_clusters(self):
+        errors = []
+        for i in range(1, 1001):
+            errors.append(make_error(i * 2, f"GTP tunnel establishment failed for UE: imsi-00101000{i:07d}, TEID allocation timeout"))
+            errors.append(make_error(i * 2 + 1, f"UPF node upf{i % 3} unresponsive, connection timeout"))
+        errors.append(make_error(5000, "Failed to update QoS profile due to UPF timeout"))
+
+        clusters = cluster_errors(errors, max_samples=3)
+        self.assertEqual([c.count for c in clusters], [1000, 1000, 1])
+        self.assertEqual(clusters[0].first_line, 2)
+        self.assertEqual(clusters[0].last_line, 2000)
+        self.assertEqual(clusters[1].template, "<TS> [ERROR] UPF node <*> unresponsive, connection timeout")
+
+        # First occurrences plus the most recent one
+        self.assertEqual([e['line_number'] for e in clusters[0].samples], [2, 4, 2000])
+        self.assertEqual(clusters[0].first_timestamp, "2025-09-04 08:00:00")
+        self.assertEqual(clusters[0].last_timestamp, "2025-09-04 08:58:00")
+
+    def test_prompt_grows_with_distinct_types_only(self):
+        analyzer = LogAnalyzer()
+        few = [make_error(i, "Database connection timeout") for i in range(1, 11)]
+        many = [make_error(i, "Database connection timeout") for i in range(1, 10001)]
+
+        few_text = analyzer.prepare_clusters_for_llm({"total_errors_found": 10}, cluster_errors(few))
+        many_text = analyzer.prepare_clusters_for_llm({"total_errors_found": 10000}, cluster_errors(many))
+        self.assertIn("Error #1 (Line 1, 10000 occurrences):", many_text)
+        self.assertLess(abs(len(many_text) - len(few_text)), 40)
+
+if __name__ == '__main__':
+    unittest.main()
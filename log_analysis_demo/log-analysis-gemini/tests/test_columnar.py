@@ -0,0 +1,50 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from columnar import LEVELS, ColumnarReader, level_code
+from timestamps import timestamp_to_epoch
+
+class TestColumnar(unittest.TestCase):
+
+    def test_round_trip(self):
+        log_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+        analyzer = LogAnalyzer()
+
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = analyzer.analyze_large_log_file(
+                log_file, context_lines=3, output_format="columnar", output_dir=output_dir
+            )
+            errors = result['data']['errors']
+            reader = ColumnarReader(result['output_file'])
+
+            self.assertEqual(reader.rows, len(errors))
+            self.assertEqual(list(reader.column("line_number")), [e['line_number'] for e in errors])
+            self.assertEqual(list(reader.column("timestamp")), [timestamp_to_epoch(e['timestamp']) for e in errors])
+            self.assertEqual(reader.column("error_line"), [e['error_line'] for e in errors])
+            self.assertEqual(reader.column("context_before"), [e['context_before'] for e in errors])
+            self.assertEqual(reader.column("context_after"), [e['context_after'] for e in errors])
+            self.assertTrue(all(LEVELS[code] in line.lower()
+                                for code, line in zip(reader.column("level"), reader.column("error_line"))))
+
+    def test_level_code_prefers_parsed_level(self):
+        line = 'time=2025-09-04T08:00:01Z level=err msg="critical path failed"'
+        self.assertEqual(LEVELS[level_code(line, "err")], "error")
+        self.assertEqual(LEVELS[level_code(line, "EMERG")], "fatal")
+        # Without a parsed (or known) level the line's keywords decide
+        self.assertEqual(LEVELS[level_code(line)], "critical")
+        self.assertEqual(LEVELS[level_code(line, "SMF")], "critical")
+
+    def test_save_error_is_reported(self):
+        log_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = LogAnalyzer().analyze_large_log_file(log_file, output_format="xml", output_dir=output_dir)
+        self.assertEqual(result, {"error": "Error saving results: Unsupported output format: xml"})
+
+if __name__ == '__main__':
+    unittest.main()
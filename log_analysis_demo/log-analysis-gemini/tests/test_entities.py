@@ -0,0 +1,74 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from entities import EntityIndex, extract_entities
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+LINES = [
+    "2025-09-04 08:00:00 [INFO] [AMF] UE imsi-001010000000034 registered",
+    "2025-09-04 08:00:01 [INFO] [SMF] PDU session ID: 7 created for imsi-001010000000034",
+    "2025-09-04 08:00:02 [INFO] [UPF] Allocated TEID=0x1A2B for session ID: 7, UE IP: 10.45.0.3",
+    "2025-09-04 08:00:03 [INFO] [AMF] UE imsi-001010000000099 registered",
+    "2025-09-04 08:00:04 [INFO] [SMF] Heartbeat from 10.0.0.10:8805",
+    "2025-09-04 08:00:05 [INFO] [SMF] Heartbeat from 10.0.0.10:8805",
+    "2025-09-04 08:00:06 [ERROR] [UPF] GTP-U tunnel TEID=0x1a2b failed for imsi-001010000000034",
+    "2025-09-04 08:00:07 [INFO] [AMF] UE imsi-001010000000099 deregistered",
+]
+
+class TestEntities(unittest.TestCase):
+
+    def test_extract_entities(self):
+        self.assertEqual(extract_entities(LINES[2]), [("session", "7"), ("teid", "0x1a2b"), ("ip", "10.45.0.3")])
+        self.assertEqual(extract_entities(LINES[4]), [("ip", "10.0.0.10")])
+        # Timestamps and versions are not IPs, session words without an ID are not sessions
+        self.assertEqual(extract_entities("2025-09-04 08:00:00 [INFO] v1.2.3 Session created"), [])
+        self.assertEqual(extract_entities("2025-09-04 08:00:00 [INFO] Retry 3 of 5. Next in 10.5 s."), [])
+
+    def test_bounded_eviction(self):
+        index = EntityIndex(max_entities=2, lines_per_entity=2)
+        for line_number, imsi in enumerate(["1", "2", "1", "1", "3"], 1):
+            index.add((line_number, f"imsi-0010100000000{imsi}"))
+
+        # imsi 2 was seen least recently and made room for imsi 3; imsi 1 keeps its last 2 lines
+        self.assertEqual(len(index), 2)
+        self.assertEqual(index.evicted, 1)
+        self.assertEqual(index.related([("imsi", "00101000000002")], 10), [])
+        self.assertEqual([n for n, _ in index.related([("imsi", "00101000000001")], 10)], [3, 4])
+
+    def test_correlated_context(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.log', delete=False) as f:
+            f.write("\n".join(LINES) + "\n")
+            temp_file_path = f.name
+        try:
+            plain, = LogAnalyzer().iter_errors(temp_file_path, context_lines=1)
+            error, = LogAnalyzer(correlate=True).iter_errors(temp_file_path, context_lines=1)
+        finally:
+            os.unlink(temp_file_path)
+
+        self.assertNotIn('correlated_context', plain)
+        self.assertEqual(error['entities'], {"imsi": ["001010000000034"], "teid": ["0x1a2b"]})
+        # Setup lines for the same UE and tunnel, not the other UE or the context_before line
+        self.assertEqual([ctx['line_number'] for ctx in error['correlated_context']], [1, 2, 3])
+        self.assertEqual(error['context_before'], plain['context_before'])
+
+        llm_input = LogAnalyzer().prepare_for_llm_from_memory({"errors": [error]})
+        self.assertIn("Earlier Lines for imsi 001010000000034, teid 0x1a2b:\n  [1] ", llm_input)
+
+    def test_same_errors_with_correlation(self):
+        # Every scanner falls back to the streaming scan; the error set does not change
+        plain = LogAnalyzer().iter_errors(LOG_FILE, context_lines=2)
+        with tempfile.TemporaryDirectory() as output_dir:
+            result = LogAnalyzer(correlate=True).analyze_large_log_file(
+                LOG_FILE, 2, scanner="mmap", output_dir=output_dir
+            )
+        self.assertEqual([e['line_number'] for e in result['data']['errors']], [e['line_number'] for e in plain])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from follow import LogFollower
+
+LINES = [f"2023-10-01 12:00:{i:02d} [{'ERROR' if i % 7 == 3 else 'INFO'}] event {i}\n" for i in range(40)]
+
+class TestLogFollower(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file_path = os.path.join(self.temp_dir.name, "smf.log")
+        self.analyzer = LogAnalyzer()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _append(self, text):
+        with open(self.log_file_path, 'a') as f:
+            f.write(text)
+
+    def test_incremental_polls_match_full_scan(self):
+        follower = LogFollower(self.analyzer, self.log_file_path, context_lines=2)
+        found = []
+        # Append in uneven pieces, including a partial line split across polls
+        text = "".join(LINES)
+        for start, end in [(0, 150), (150, 400), (400, 401), (401, len(text))]:
+            self._append(text[start:end])
+            # A new follower each time: all state must come from the checkpoint
+            found.extend(LogFollower(self.analyzer, self.log_file_path, context_lines=2).poll())
+
+        expected = list(self.analyzer.iter_errors(self.log_file_path, context_lines=2))
+        # The last error is still waiting for trailing context
+        self.assertEqual(found, expected[:-1])
+
+        self._append("2023-10-01 12:01:00 [INFO] more\n2023-10-01 12:01:01 [INFO] more\n")
+        found.extend(follower.poll())
+        self.assertEqual(found, list(self.analyzer.iter_errors(self.log_file_path, context_lines=2)))
+
+    def test_truncation_and_rotation(self):
+        follower = LogFollower(self.analyzer, self.log_file_path, context_lines=1)
+        self._append("".join(LINES[:5]))
+        self.assertEqual([e['line_number'] for e in follower.poll()], [4])
+
+        # Truncate in place: start again from the beginning of the file
+        with open(self.log_file_path, 'w') as f:
+            f.write("".join(LINES[:4]) + LINES[10])
+        self.assertEqual([e['line_number'] for e in follower.poll()], [4])
+
+        # Rotate: lines appended to the old file before the rename are still reported
+        self._append(LINES[24] + LINES[25])
+        os.rename(self.log_file_path, self.log_file_path + ".1")
+        self._append(LINES[0] + LINES[3] + LINES[1])
+        errors = follower.poll()
+        self.assertEqual([(e['line_number'], e['error_line']) for e in errors],
+                         [(5, LINES[10].strip()), (6, LINES[24].strip()), (2, LINES[3].strip())])
+
+    def test_quiet_log_flushes_pending_errors(self):
+        # A FATAL on the last line of a log that stopped growing
+        self._append("".join(LINES[:2]) + "2023-10-01 12:00:02 [FATAL] SMF crashed\n")
+        waiting = LogFollower(self.analyzer, self.log_file_path, context_lines=3, flush_after=3600)
+        self.assertEqual(waiting.poll(), [])
+        self.assertEqual(waiting.poll(), [])
+
+        # Once the error has waited long enough it is reported with the context it has
+        errors = LogFollower(self.analyzer, self.log_file_path, context_lines=3, flush_after=0).poll()
+        self.assertEqual([(e['line_number'], e['context_after']) for e in errors], [(3, [])])
+        self.assertEqual(waiting.poll(), [])
+
+if __name__ == '__main__':
+    unittest.main()
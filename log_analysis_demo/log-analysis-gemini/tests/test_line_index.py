@@ -0,0 +1,54 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from line_index import LineIndex, load_or_build_index
+
+class TestLineIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.log_file_path = os.path.join(self.temp_dir.name, "test.log")
+        with open(self.log_file_path, 'w') as f:
+            for i in range(1, 101):
+                level = "ERROR" if i % 25 == 0 else "INFO"
+                f.write(f"2023-10-01 12:00:{i % 60:02d} [{level}] line {i}\n")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_read_raw_lines_and_round_trip(self):
+        index, index_path = load_or_build_index(self.log_file_path, stride=8)
+        self.assertEqual(index.line_count, 100)
+        self.assertTrue(os.path.exists(index_path))
+
+        loaded = LineIndex.load(index_path)
+        self.assertTrue(loaded.is_current(self.log_file_path))
+        self.assertEqual(list(loaded.line_starts), list(index.line_starts))
+
+        with open(self.log_file_path, 'rb') as f:
+            lines = loaded.read_raw_lines(f, 9, 11)
+        self.assertEqual([line.split()[-1] for line in lines], [b'9', b'10', b'11'])
+
+    def test_stale_index_is_rebuilt(self):
+        index, index_path = load_or_build_index(self.log_file_path)
+        with open(self.log_file_path, 'a') as f:
+            f.write("2023-10-01 12:02:00 [ERROR] appended line\n")
+
+        self.assertFalse(LineIndex.load(index_path).is_current(self.log_file_path))
+        rebuilt, _ = load_or_build_index(self.log_file_path)
+        self.assertEqual(rebuilt.line_count, 101)
+
+    def test_indexed_analysis_matches_stream(self):
+        analyzer = LogAnalyzer()
+        for context_lines in (0, 2, 30):
+            expected = list(analyzer.iter_errors(self.log_file_path, context_lines))
+            self.assertEqual(list(analyzer.iter_errors_indexed(self.log_file_path, context_lines)), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+import unittest
+import gzip
+import json
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from log_formats import detect_file_format, get_log_format, parse_log_line
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+SAMPLES = {
+    "json": [
+        json.dumps({"ts": "2025-09-04T08:00:00.120Z", "level": "info", "nf": "SMF", "msg": "Session created"}),
+        json.dumps({"ts": "2025-09-04T08:00:01.500Z", "level": "error", "nf": "SMF", "msg": "PFCP association lost"}),
+        json.dumps({"ts": "2025-09-04T08:00:02.000Z", "level": "debug", "nf": "SMF", "msg": "error counter reset"}),
+    ],
+    "keyvalue": [
+        'time=2025-09-04T08:00:00Z level=info component=amf msg="Registration accepted"',
+        'time=2025-09-04T08:00:01Z level=error component=amf msg="N2 decode failure"',
+        'time=2025-09-04T08:00:02Z level=warn component=amf msg="error rate high"',
+    ],
+    "syslog": [
+        "<30>Sep  4 08:00:00 core1 smf[412]: Session created",
+        "<27>Sep  4 08:00:01 core1 smf[412]: PFCP association lost",
+        "<28>Sep  4 08:00:02 core1 smf[412]: error rate high on N4",
+    ],
+}
+
+class TestLogFormats(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, lines, opener=open):
+        path = os.path.join(self.temp_dir.name, name)
+        with opener(path, 'wt', encoding='utf-8') as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def test_parse_fields(self):
+        self.assertEqual(get_log_format("bracketed").parse("2025-09-04 08:00:05 [ERROR] [SMF] PFCP association lost"), {
+            "timestamp": "2025-09-04 08:00:05", "level": "ERROR", "component": "SMF", "message": "PFCP association lost"
+        })
+        self.assertEqual(parse_log_line(SAMPLES["json"][1]), {
+            "timestamp": "2025-09-04 08:00:01", "level": "error", "component": "SMF", "message": "PFCP association lost"
+        })
+        self.assertEqual(parse_log_line(SAMPLES["keyvalue"][1])["message"], "N2 decode failure")
+        self.assertEqual(parse_log_line(SAMPLES["syslog"][1]), {
+            "timestamp": "Sep  4 08:00:01", "level": "err", "component": "smf", "message": "PFCP association lost"
+        })
+        rfc5424 = "<11>1 2025-09-04T08:00:01Z core1 upf 77 - - GTP-U echo timeout"
+        self.assertEqual(parse_log_line(rfc5424)["timestamp"], "2025-09-04 08:00:01")
+        self.assertEqual(parse_log_line(rfc5424)["message"], "GTP-U echo timeout")
+
+    def test_detect_and_analyze(self):
+        # Only the line with an error level counts, not "error" in a debug/warning message
+        for name, lines in SAMPLES.items():
+            path = self.write(name, lines, gzip.open if name == "json" else open)
+            self.assertEqual(detect_file_format(path).name, name)
+            errors = LogAnalyzer().analyze_large_log_file(path, 1, scanner="mmap", output_dir=self.temp_dir.name)['data']['errors']
+            self.assertEqual([error['line_number'] for error in errors], [2], name)
+            self.assertEqual(errors[0]['context_after'][0]['content'], lines[2])
+            if name != "syslog":
+                self.assertEqual(errors[0]['timestamp'], "2025-09-04 08:00:01")
+
+        self.assertEqual(detect_file_format(LOG_FILE).name, "bracketed")
+
+    def test_level_stored_during_scan(self):
+        # key=value pairs in a bracketed message do not make the line a keyvalue line
+        path = self.write("smf.log", [
+            "2025-09-04 08:00:00 [INFO] [SMF] PDU session created",
+            "2025-09-04 08:00:01 [ERROR] [SMF] PDU session failed cause=timeout msg=abc",
+        ])
+        error, = LogAnalyzer().iter_errors(path, 1)
+        self.assertEqual((error['level'], error['component']), ("ERROR", "SMF"))
+
+        path = self.write("amf.log", SAMPLES["keyvalue"])
+        for scanner in ("stream", "mmap"):
+            errors = LogAnalyzer().analyze_large_log_file(path, 1, scanner=scanner, output_dir=self.temp_dir.name)
+            self.assertEqual([(e['level'], e['component']) for e in errors['data']['errors']], [("error", "amf")])
+
+    def test_timestamp_format_detected_per_file(self):
+        path = self.write("upf.log", [
+            "[INFO] 2025/09/04 08:00:00 [UPF] GTP-U path up",
+            "[ERROR] 2025/09/04 08:00:01 [UPF] GTP-U echo timeout",
+        ])
+        log_format = LogAnalyzer(log_format="bracketed").resolve_log_format(path)
+        self.assertEqual(log_format.timestamp_format.name, "YYYY/MM/DD HH:MM:SS")
+        self.assertIsNone(get_log_format("bracketed").timestamp_format)
+        for workers in (1, 2):
+            error, = LogAnalyzer().iter_errors_parallel(path, 1, workers=workers, min_chunk_size=16)
+            self.assertEqual(error['timestamp'], "2025/09/04 08:00:01")
+
+    def test_level_key_priority(self):
+        # The level fast path picks the same key as parse() when a line has several
+        lines = {
+            "json": json.dumps({"severity": "info", "level": "error", "msg": "PFCP association lost"}),
+            "keyvalue": 'severity=info level=error msg="PFCP association lost"',
+        }
+        for name, line in lines.items():
+            log_format = get_log_format(name)
+            self.assertEqual(log_format.level(line), "error", name)
+            self.assertEqual(log_format.parse(line)["level"], "error", name)
+
+    def test_fixed_format(self):
+        path = self.write("json", SAMPLES["json"])
+        # Read as bracketed logs, the JSON lines match no "[LEVEL]" pattern
+        self.assertEqual(list(LogAnalyzer(log_format="bracketed").iter_errors(path, 1)), [])
+        with self.assertRaises(ValueError):
+            LogAnalyzer(log_format="xml")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import bz2
+import gzip
+import lzma
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from log_sources import DecompressingReader, detect_compression, open_log_text
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+class TestLogSources(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        with open(LOG_FILE, 'rb') as f:
+            self.data = f.read()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write(self, name, compress):
+        # No extension: the format must be detected from the content
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, 'wb') as f:
+            f.write(compress(self.data))
+        return path
+
+    def test_compressed_logs_match_plain(self):
+        analyzer = LogAnalyzer()
+        expected = list(analyzer.iter_errors(LOG_FILE, 3))
+        compressors = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+        if zstandard is not None:
+            compressors["zstd"] = zstandard.ZstdCompressor().compress
+
+        for compression, compress in compressors.items():
+            path = self.write(compression, compress)
+            self.assertEqual(detect_compression(path), compression)
+            self.assertEqual(list(analyzer.iter_errors(path, 3)), expected)
+            self.assertEqual(analyzer.analyze_large_log_file(
+                path, 3, scanner="mmap", output_dir=self.temp_dir.name
+            )['data']['errors'], expected)
+
+        self.assertIsNone(detect_compression(LOG_FILE))
+        # Plain text that happens to start with "BZh" is not bzip2 (no block size digit)
+        path = self.write("BZhost", lambda data: b"BZhost1 [ERROR] boot failed\n")
+        self.assertIsNone(detect_compression(path))
+        self.assertEqual(len(list(analyzer.iter_errors(path, 3))), 1)
+
+    def test_small_chunks_and_early_close(self):
+        path = self.write("log.gz", gzip.compress)
+        with open(LOG_FILE, encoding='utf-8') as f:
+            expected = f.readlines()
+
+        reader = DecompressingReader(gzip.open(path, 'rb'), chunk_size=100, queue_chunks=2)
+        self.assertEqual(reader.read(), self.data)
+        reader.close()
+
+        # Closing mid-file stops the background thread instead of blocking on the full queue
+        with open_log_text(path) as f:
+            self.assertEqual(f.readline(), expected[0])
+        with open_log_text(path, threaded=False) as f:
+            self.assertEqual(f.readlines(), expected)
+
+    def test_corrupt_file_raises_in_reader(self):
+        path = os.path.join(self.temp_dir.name, "broken.gz")
+        with open(path, 'wb') as f:
+            f.write(gzip.compress(self.data)[:500])
+
+        with self.assertRaises(EOFError):
+            with open_log_text(path) as f:
+                f.read()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from matchers import RegexMatcher, SubstringMatcher, create_matcher
+
+class TestMatchers(unittest.TestCase):
+
+    def setUp(self):
+        analyzer = LogAnalyzer()
+        self.error_patterns = analyzer.error_patterns
+        self.non_error_levels = analyzer.non_error_levels
+
+    def test_regex_matches_substring_results(self):
+        substring = SubstringMatcher(self.error_patterns, self.non_error_levels)
+        regex = RegexMatcher(self.error_patterns, self.non_error_levels)
+
+        lines = [
+            "2023-10-01 [ERROR] Database connection failed",
+            "2023-10-01 [error] lowercase level",
+            "2023-10-01 ERROR Network timeout occurred",
+            "2023-10-01 [Critical] System crash",
+            "2023-10-01 [WARNING] High error rate detected",
+            "2023-10-01 [INFO] Normal operation",
+            "2023-10-01 [ERROR] retry scheduled [info]",
+            "2023-10-01 Operation failed",
+            "2023-10-01 [FATAL]",
+            "",
+        ]
+        log_file = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+        with open(log_file, 'r', encoding='utf-8', errors='ignore') as file:
+            lines.extend(line.rstrip('\n\r') for line in file)
+
+        for line in lines:
+            self.assertEqual(regex.is_error_line(line), substring.is_error_line(line), line)
+
+    def test_create_matcher(self):
+        self.assertIsInstance(create_matcher("regex", ["[error]"], []), RegexMatcher)
+        self.assertFalse(create_matcher("regex", [], ["[info]"]).is_error_line("[ERROR] x"))
+        with self.assertRaises(ValueError):
+            create_matcher("unknown", [], [])
+
+if __name__ == '__main__':
+    unittest.main()
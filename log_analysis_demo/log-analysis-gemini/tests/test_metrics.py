@@ -0,0 +1,106 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from metrics import Metrics, profile_run
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_stages_counters_and_export(self):
+        metrics = Metrics()
+        for _ in range(2):
+            with metrics.stage("scan"):
+                pass
+        metrics.count("lines_scanned", 10)
+        metrics.count("lines_scanned", 5)
+        metrics.observe("gemini_latency_seconds", 0.5)
+        metrics.observe("gemini_latency_seconds", 1.5)
+
+        self.assertEqual(metrics.stages["scan"]["calls"], 2)
+        self.assertGreaterEqual(metrics.stages["scan"]["peak_rss_growth_bytes"], 0)
+        self.assertGreaterEqual(metrics.stages["scan"]["process_peak_rss_bytes"], metrics.stages["scan"]["peak_rss_growth_bytes"])
+        self.assertEqual(metrics.counters["lines_scanned"], 15)
+        self.assertEqual(metrics.observations["gemini_latency_seconds"], {"count": 2, "sum": 2.0, "max": 1.5})
+
+        text = metrics.to_prometheus()
+        self.assertIn('log_analysis_stage_calls{stage="scan"} 2', text)
+        self.assertIn("log_analysis_lines_scanned_total 15", text)
+        self.assertIn("log_analysis_gemini_latency_seconds_sum 2.0", text)
+
+        json_path, prometheus_path = metrics.save(self.temp_dir.name)
+        with open(json_path, encoding='utf-8') as f:
+            self.assertEqual(json.load(f)["counters"], {"lines_scanned": 15})
+        self.assertTrue(os.path.exists(prometheus_path))
+
+    def test_disabled_metrics_record_nothing(self):
+        metrics = Metrics(enabled=False)
+        with metrics.stage("scan"):
+            metrics.count("lines_scanned")
+            metrics.observe("gemini_latency_seconds", 1.0)
+        self.assertEqual((metrics.stages, metrics.counters, metrics.observations), ({}, {}, {}))
+
+    def test_analyzer_counters(self):
+        with open(LOG_FILE, encoding='utf-8') as f:
+            line_count = len(f.readlines())
+
+        # The index scanner reads only context windows, so it is not counted here
+        for scanner in ("stream", "mmap"):
+            metrics = Metrics()
+            analyzer = LogAnalyzer(metrics=metrics)
+            results = analyzer.analyze_large_log_file(LOG_FILE, 3, scanner=scanner, output_dir=self.temp_dir.name)
+            self.assertEqual(metrics.counters["lines_scanned"], line_count, scanner)
+            self.assertEqual(metrics.counters["errors_matched"], results['total_errors'])
+            self.assertEqual(metrics.counters["bytes_read"], os.path.getsize(LOG_FILE))
+            self.assertIn("scan", metrics.stages)
+            self.assertIn("save", metrics.stages)
+
+    def test_nested_stage_keeps_outer_traced_peak(self):
+        metrics = Metrics()
+        tracemalloc.start()
+        try:
+            with metrics.stage("total"):
+                block = bytearray(4 * 1024 * 1024)
+                del block
+                with metrics.stage("scan"):
+                    small = bytearray(1024)
+                    del small
+        finally:
+            tracemalloc.stop()
+        self.assertLess(metrics.stages["scan"]["traced_peak_bytes"], 1024 * 1024)
+        self.assertGreaterEqual(metrics.stages["total"]["traced_peak_bytes"], 4 * 1024 * 1024)
+
+    def test_profile_run(self):
+        with profile_run("cprofile", self.temp_dir.name):
+            sum(range(1000))
+        with profile_run("tracemalloc", self.temp_dir.name):
+            [str(i) for i in range(1000)]
+        for name in ("profile.prof", "profile.txt", "tracemalloc.txt"):
+            self.assertTrue(os.path.exists(os.path.join(self.temp_dir.name, name)), name)
+
+        # An unknown mode only warns; the block still runs, unprofiled
+        ran = []
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            with profile_run("perf", self.temp_dir.name):
+                ran.append(True)
+        self.assertEqual(ran, [True])
+        self.assertIn("Unsupported PROFILE_MODE 'perf'", output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import json
+import os
+import pickle
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from records import ErrorRecord, record_to_json
+
+class TestErrorRecord(unittest.TestCase):
+
+    def setUp(self):
+        self.record = ErrorRecord("ERROR boom", 10, [(9, "INFO before")], [(11, "INFO after")], "2025-09-04 08:00:00")
+        self.as_dict = {
+            "error_line": "ERROR boom",
+            "line_number": 10,
+            "context_before": [{"line_number": 9, "content": "INFO before"}],
+            "context_after": [{"line_number": 11, "content": "INFO after"}],
+            "timestamp": "2025-09-04 08:00:00"
+        }
+
+    def test_dict_interface_and_serialization(self):
+        self.assertEqual(self.record, self.as_dict)
+        self.assertEqual(self.record['context_after'][0]['content'], "INFO after")
+        self.assertIsNone(self.record.get('source_file'))
+
+        self.record['source_file'] = "smf.log"
+        self.as_dict['source_file'] = "smf.log"
+        self.assertIn('source_file', self.record)
+        self.assertEqual(list(self.record), list(self.as_dict))
+        self.assertEqual(json.dumps(self.record, default=record_to_json), json.dumps(self.as_dict))
+
+        self.assertEqual(ErrorRecord.from_dict(self.as_dict), self.record)
+        self.assertEqual(pickle.loads(pickle.dumps(self.record)), self.record)
+
+    def test_overlapping_windows_are_shared(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.log', delete=False) as f:
+            f.write("INFO a\n[ERROR] b\n[ERROR] c\nINFO d\n")
+            temp_file_path = f.name
+        try:
+            first, second = LogAnalyzer().iter_errors(temp_file_path, context_lines=2)
+        finally:
+            os.unlink(temp_file_path)
+
+        # Line 1 sits in both errors' context_before, line 4 in both context_after
+        self.assertIs(first.before_lines[0], second.before_lines[0])
+        self.assertIs(first.after_lines[1], second.after_lines[0])
+        self.assertEqual(second['context_before'], [
+            {'line_number': 1, 'content': "INFO a"}, {'line_number': 2, 'content': "[ERROR] b"}
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
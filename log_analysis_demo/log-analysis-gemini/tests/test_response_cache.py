@@ -0,0 +1,71 @@
+import unittest
+import os
+import sys
+import tempfile
+import time
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from signatures import error_signature, normalize_error
+from api.response_cache import ResponseCache
+
+class TestErrorSignatures(unittest.TestCase):
+
+    def test_masks_per_occurrence_values(self):
+        first = "2025-09-04 08:01:48 [ERROR] GTP tunnel establishment failed for UE: imsi-001010000000034, TEID=0x12345 timeout"
+        second = "2025-09-04 09:15:02 [ERROR] GTP tunnel establishment failed for UE: imsi-001010000000081, TEID=0x99 timeout"
+        self.assertEqual(error_signature(first), error_signature(second))
+        self.assertEqual(
+            normalize_error(first),
+            "<TS> [ERROR] GTP tunnel establishment failed for UE: imsi-<IMSI>, TEID=<TEID> timeout"
+        )
+        self.assertEqual(
+            normalize_error("[ERROR] Pool 10.1.0.0/16 exhausted for PDU session ID: 7 via fe80::1"),
+            "[ERROR] Pool <IP> exhausted for PDU session ID: <SID> via <IP>"
+        )
+
+    def test_different_templates_differ(self):
+        self.assertNotEqual(
+            error_signature("[ERROR] Failed to allocate IP address"),
+            error_signature("[ERROR] Failed to update QoS profile")
+        )
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_get_put_and_namespace(self):
+        cache = ResponseCache(self.temp_dir.name, namespace="model-a")
+        self.assertIsNone(cache.get("sig"))
+        cache.put("sig", "analysis", template="<TS> [ERROR] x")
+        self.assertEqual(cache.get("sig"), "analysis")
+        self.assertIsNone(ResponseCache(self.temp_dir.name, namespace="model-b").get("sig"))
+
+    def test_ttl_expiry(self):
+        cache = ResponseCache(self.temp_dir.name, ttl_seconds=60)
+        cache.put("sig", "analysis")
+        path = cache._path("sig")
+        old = time.time() - 120
+        os.utime(path, (old, old))
+        self.assertEqual(cache.prune(), 1)
+        self.assertFalse(os.path.exists(path))
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(self.temp_dir.name, max_entries=2)
+        for i, signature in enumerate(["a", "b", "c"]):
+            cache.put(signature, signature)
+            os.utime(cache._path(signature), (1000 + i, time.time() - 10 + i))
+        cache.get("a")  # Most recently used now
+
+        self.assertEqual(cache.prune(), 1)
+        self.assertEqual(cache.get("a"), "a")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "c")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+import gzip
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from service import create_server
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+class TestService(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        config = {"ANALYSIS_OUTPUT_PATH": os.path.join(self.temp_dir.name, "report.txt")}
+        self.server = create_server(config, port=0, max_concurrent_jobs=1, max_queued_jobs=1)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.connection = http.client.HTTPConnection(*self.server.server_address[:2])
+        self.expected = list(LogAnalyzer().iter_errors(LOG_FILE, 3))
+
+    def tearDown(self):
+        self.connection.close()
+        self.server.shutdown()
+        self.server.server_close()
+        self.server.service.shutdown()
+        self.temp_dir.cleanup()
+
+    def request(self, method, path, body=None, headers=None):
+        self.connection.request(method, path, body=body, headers=headers or {})
+        response = self.connection.getresponse()
+        data = response.read()
+        if response.getheader("Content-Type") == "application/json":
+            data = json.loads(data)
+        return response.status, data
+
+    def test_analyze_path_and_upload(self):
+        # Same keep-alive connection for every request
+        status, job = self.request("POST", "/analyze", json.dumps({"path": LOG_FILE, "context_lines": 3}),
+                                   {"Content-Type": "application/json"})
+        self.assertEqual(status, 200)
+        self.assertEqual(job["status"], "done")
+        self.assertEqual(job["result"]["errors"], self.expected)
+        self.assertEqual(sum(cluster["count"] for cluster in job["result"]["clusters"]), len(self.expected))
+
+        with open(LOG_FILE, 'rb') as f:
+            compressed = gzip.compress(f.read())
+        status, job = self.request("POST", "/analyze?context_lines=3", compressed)
+        self.assertEqual(status, 200)
+        self.assertEqual(job["log_file"], "(uploaded)")
+        self.assertEqual(job["result"]["errors"], self.expected)
+
+        # Streamed (chunked) body, answered later through /jobs/<id>
+        def chunks():
+            with open(LOG_FILE, 'rb') as f:
+                while True:
+                    data = f.read(4096)
+                    if not data:
+                        return
+                    yield data
+
+        self.connection.request("POST", "/analyze?context_lines=3&wait=0&include_errors=0",
+                                body=chunks(), encode_chunked=True)
+        response = self.connection.getresponse()
+        self.assertEqual(response.status, 202)
+        job_id = json.loads(response.read())["id"]
+        job = self.server.service.wait(job_id, timeout=30)
+        self.assertEqual(job["result"]["total_errors"], len(self.expected))
+        self.assertNotIn("errors", job["result"])
+        status, polled = self.request("GET", f"/jobs/{job_id}")
+        self.assertEqual((status, polled["status"]), (200, "done"))
+        self.assertEqual(os.listdir(os.path.join(self.server.service.output_dir, "uploads")), [])
+
+        status, metrics = self.request("GET", "/metrics")
+        self.assertIn(b"log_analysis_service_jobs_completed_total 3", metrics)
+
+    def test_index_scanner_writes_no_sidecars(self):
+        # Indexes of client-named files go to the service's own directory, not next to the files
+        log_dir = os.path.join(self.temp_dir.name, "logs")
+        os.makedirs(log_dir)
+        log_path = os.path.join(log_dir, "smf.log")
+        with open(LOG_FILE, 'rb') as source, open(log_path, 'wb') as f:
+            f.write(source.read())
+        index_dir = self.server.service.analyzer.index_dir
+
+        status, job = self.request("POST", "/analyze", json.dumps({"path": log_path, "scanner": "index", "context_lines": 3}),
+                                   {"Content-Type": "application/json"})
+        self.assertEqual((status, job["result"]["errors"]), (200, self.expected))
+        self.assertEqual(os.listdir(log_dir), ["smf.log"])
+        self.assertEqual(len(os.listdir(index_dir)), 1)
+
+        with open(LOG_FILE, 'rb') as f:
+            status, job = self.request("POST", "/analyze?scanner=index&context_lines=3", f.read())
+        self.assertEqual((status, job["result"]["errors"]), (200, self.expected))
+        self.assertEqual(len(os.listdir(index_dir)), 1)  # The upload's index went with the upload
+
+    def test_errors_and_queue_limit(self):
+        self.assertEqual(self.request("POST", "/analyze?path=/no/such/file.log")[0], 400)
+        self.assertEqual(self.request("GET", "/jobs/unknown")[0], 404)
+        self.assertEqual(self.request("POST", "/analyze?context_lines=abc", b"x")[0], 400)
+        status, error = self.request("POST", "/analyze", json.dumps({"path": LOG_FILE, "context_lines": None}),
+                                     {"Content-Type": "application/json"})
+        self.assertEqual(status, 400)
+        self.assertIn("context_lines", error["error"])
+
+        service = self.server.service
+        release = threading.Event()
+        analyze = service.analyze
+        service.analyze = lambda *args, **kwargs: release.wait() and analyze(*args, **kwargs)
+        try:
+            first = service.submit(LOG_FILE)
+            second = service.submit(LOG_FILE)
+            self.assertIn("id", first)
+            self.assertIn("id", second)
+            status, health = self.request("GET", "/health")
+            self.assertEqual(health["running"] + health["queued"], 2)
+            status, rejected = self.request("POST", f"/analyze?path={LOG_FILE}")
+            self.assertEqual(status, 503)
+        finally:
+            release.set()
+        self.assertEqual(service.wait(second["id"], timeout=30)["status"], "done")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from main import run_analysis
+from start import parse_args
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+class TestStart(unittest.TestCase):
+
+    def test_parse_args(self):
+        args = parse_args(["logs/smf.log", "-c", "3", "--format", "csv", "--no-llm"])
+        self.assertEqual((args.path, args.context_lines, args.format, args.no_llm), ("logs/smf.log", 3, "csv", True))
+
+        args = parse_args(["huge.log", "--sample", "0.01", "--count-only", "--levels", "FATAL,CRITICAL"])
+        self.assertEqual((args.sample, args.count_only, args.levels, args.max_errors), (0.01, True, "FATAL,CRITICAL", None))
+
+        args = parse_args([])
+        self.assertEqual((args.path, args.context_lines, args.format, args.no_llm), (None, 5, None, False))
+
+    def test_cli_import_skips_heavy_modules(self):
+        # The LLM stack, process pools and .env loading are only imported when a run needs them
+        heavy = ["asyncio", "concurrent.futures.process", "dotenv", "google.generativeai"]
+        code = f"import sys; sys.path.insert(0, {SRC_DIR!r}); import start; print([m for m in {heavy!r} if m in sys.modules])"
+        completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(completed.stdout.strip(), "[]")
+
+    def test_run_writes_to_configured_output_dir(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            config = {"ANALYSIS_OUTPUT_PATH": os.path.join(output_dir, "report.txt")}
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_analysis(config, LOG_FILE, context_lines=2)
+            for name in ("error_analysis.json", "llm_input.txt", "error_timeline.json", "metrics.json"):
+                self.assertTrue(os.path.exists(os.path.join(output_dir, name)), name)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+import os
+import sys
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from timestamps import (
+    NO_TIMESTAMP, detect_bursts, detect_line_format, error_timeline, extract_timestamp, parse_epochs, rate_histogram
+)
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_parse_epochs(self):
+        epochs = parse_epochs([
+            "1970-01-02 00:00:01",
+            None,
+            "01/02/1970 00:01:00",  # Different layout from the rest of the batch
+            "1970/01/03 00:00:00",
+            "2023-13-45 00:00:00",  # Not a real date
+        ])
+        self.assertEqual(list(epochs), [86401, NO_TIMESTAMP, 86460, 172800, NO_TIMESTAMP])
+
+    def test_detect_line_format(self):
+        lines = ["starting up", "[ERROR] 09/04/2025 08:00:01 PFCP association lost"]
+        timestamp_format = detect_line_format(lines)
+        self.assertEqual(timestamp_format.name, "MM/DD/YYYY HH:MM:SS")
+        self.assertIsNone(detect_line_format(["no timestamps here"]))
+
+        # Once the file's format is known only its pattern is searched
+        line = "2025-09-04 08:00:02 [ERROR] retry at 09/04/2025 08:00:05"
+        self.assertEqual(extract_timestamp(line), "2025-09-04 08:00:02")
+        self.assertEqual(extract_timestamp(line, timestamp_format), "09/04/2025 08:00:05")
+
+    def test_histograms_and_bursts(self):
+        # One error a minute for an hour, then 40 errors within 20 seconds
+        epochs = [minute * 60 for minute in range(60)]
+        epochs += [3600 + second // 2 for second in range(40)]
+
+        per_minute = dict(rate_histogram(epochs, 60))
+        self.assertEqual(per_minute[0], 1)
+        self.assertEqual(per_minute[3600], 40)
+        self.assertEqual(dict(rate_histogram(epochs, 1))[3600], 2)
+
+        bursts = detect_bursts(epochs, bucket_seconds=60)
+        self.assertEqual(len(bursts), 1)
+        self.assertEqual((bursts[0]['start'], bursts[0]['end'], bursts[0]['errors']), (3600, 3660, 40))
+        self.assertEqual(bursts[0]['first_error'], 3600)
+        self.assertEqual(bursts[0]['peak_per_second'], 2)
+
+    def test_error_timeline(self):
+        errors = [{'timestamp': "2025-09-04 08:00:00"}, {'timestamp': None}, {'timestamp': "2025-09-04 08:02:30"}]
+        timeline = error_timeline(errors)
+        self.assertEqual(timeline['errors_with_timestamp'], 2)
+        self.assertEqual(timeline['first_error'], "2025-09-04 08:00:00")
+        self.assertEqual(timeline['last_error'], "2025-09-04 08:02:30")
+        self.assertEqual(timeline['per_minute'], [["2025-09-04 08:00:00", 1], ["2025-09-04 08:02:00", 1]])
+        self.assertEqual(timeline['bursts'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import gzip
+import os
+import sys
+import tempfile
+
+# Add the src directory to the path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from analyzer import LogAnalyzer
+from triage import estimate_total, triage_log_file
+
+LOG_FILE = os.path.join(os.path.dirname(__file__), '..', 'logs', 'simulator_test.txt')
+
+class TestTriage(unittest.TestCase):
+
+    def setUp(self):
+        self.analyzer = LogAnalyzer()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.all_errors = list(self.analyzer.iter_errors(LOG_FILE, context_lines=2))
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def write_uniform_log(self, blocks):
+        # Every 100-line block has 9 ERROR lines, one FATAL line and 90 INFO lines
+        path = os.path.join(self.temp_dir.name, "uniform.log")
+        with open(path, 'w') as f:
+            for block in range(blocks):
+                for i in range(100):
+                    level = "FATAL" if i == 50 else "ERROR" if i % 10 == 0 else "INFO"
+                    f.write(f"2025-09-04 08:00:{i % 60:02d} [{level}] [SMF] event {block}-{i:03d}\n")
+        return path
+
+    def test_count_only(self):
+        summary = triage_log_file(self.analyzer, LOG_FILE, count_only=True)
+        self.assertEqual(summary['errors_found'], len(self.all_errors))
+        self.assertEqual(summary['by_level'], {"ERROR": len(self.all_errors)})
+        self.assertEqual(sum(t['count'] for t in summary['top_templates']), len(self.all_errors))
+        self.assertEqual(summary['bytes_scanned'], os.path.getsize(LOG_FILE))
+        self.assertNotIn('errors', summary)
+        self.assertNotIn('estimate', summary)
+
+    def test_stop_after_first_errors(self):
+        summary = triage_log_file(self.analyzer, LOG_FILE, max_errors=3, context_lines=2)
+        self.assertTrue(summary['stopped_early'])
+        self.assertEqual(summary['errors'], self.all_errors[:3])
+        # The scan stopped at the third error line, not at the end of the file
+        with open(LOG_FILE, 'rb') as f:
+            head = b"".join(f.readline() for _ in range(self.all_errors[2]['line_number']))
+        self.assertEqual(summary['bytes_scanned'], len(head))
+
+        result = self.analyzer.analyze_large_log_file(LOG_FILE, 2, max_errors=3, output_dir=self.temp_dir.name)
+        self.assertEqual(result['data']['errors'], self.all_errors[:3])
+
+        # A parallel scan stops early too (the remaining chunks are cancelled)
+        parallel = self.analyzer.iter_errors_parallel(LOG_FILE, 2, workers=2, min_chunk_size=4096)
+        self.assertEqual(list(LogAnalyzer._limit(parallel, 3)), self.all_errors[:3])
+
+        path = self.write_uniform_log(5)
+        summary = triage_log_file(self.analyzer, path, max_errors=1, levels=["fatal"])
+        self.assertEqual(summary['by_level'], {"FATAL": 1})
+        self.assertEqual(summary['errors'][0]['line_number'], 51)
+
+    def test_tail(self):
+        with open(LOG_FILE, 'rb') as f:
+            data = f.read()
+        tail_bytes = len(data) // 4
+        # The scan starts at the first line that begins inside the tail
+        lines_skipped = data.count(b'\n', 0, len(data) - tail_bytes) + (data[len(data) - tail_bytes - 1:][:1] != b'\n')
+        summary = triage_log_file(self.analyzer, LOG_FILE, tail_bytes=tail_bytes, context_lines=2)
+        expected = [e for e in self.all_errors if e['line_number'] > lines_skipped]
+        self.assertTrue(expected)
+        self.assertEqual([e['error_line'] for e in summary['errors']], [e['error_line'] for e in expected])
+        self.assertLessEqual(summary['bytes_scanned'], tail_bytes)
+
+        # Line numbers count from the range start; the context is complete
+        with open(LOG_FILE, 'rb') as f:
+            f.seek(summary['errors'][0]['range_start'])
+            lines = f.read().decode('utf-8').splitlines()
+        self.assertEqual(lines[summary['errors'][0]['line_number'] - 1], expected[0]['error_line'])
+        self.assertEqual(summary['errors'][0]['context_before'][-1]['content'], expected[0]['context_before'][-1]['content'])
+
+    def test_sample_estimate(self):
+        path = self.write_uniform_log(400)  # ~2 MB, 4000 errors
+        summary = triage_log_file(self.analyzer, path, sample_fraction=0.1, count_only=True, chunk_size=64 * 1024)
+        estimate = summary['estimate']
+        self.assertEqual(estimate['chunks_sampled'], (estimate['chunks_total'] + 9) // 10)
+        self.assertLess(summary['bytes_scanned'], os.path.getsize(path) // 8)
+        self.assertLessEqual(estimate['errors']['low'], 4000)
+        self.assertGreaterEqual(estimate['errors']['high'], 4000)
+        self.assertAlmostEqual(estimate['errors']['count'], 4000, delta=100)
+        self.assertAlmostEqual(estimate['by_level']['FATAL']['count'], 400, delta=20)
+
+        # Sampling every chunk is exact
+        summary = triage_log_file(self.analyzer, path, sample_fraction=1, count_only=True, chunk_size=64 * 1024)
+        self.assertEqual(summary['estimate']['errors'], {"count": 4000, "low": 4000, "high": 4000})
+
+    def test_estimate_total(self):
+        estimate = estimate_total([10, 12, 8, 10], [100, 100, 100, 100], 4000, 40)
+        self.assertEqual(estimate['count'], 400)
+        self.assertLess(estimate['low'], 400)
+        self.assertGreater(estimate['high'], 400)
+        self.assertEqual(estimate_total([5], [100], 1000, 10)['low'], 5)
+
+    def test_invalid_options(self):
+        self.assertIn("error", triage_log_file(self.analyzer, "missing.log"))
+        self.assertIn("error", triage_log_file(self.analyzer, LOG_FILE, sample_fraction=2))
+        self.assertIn("error", triage_log_file(self.analyzer, LOG_FILE, sample_fraction=0.5, tail_bytes=100))
+
+        path = os.path.join(self.temp_dir.name, "smf.log.gz")
+        with gzip.open(path, 'wt') as f, open(LOG_FILE) as source:
+            f.write(source.read())
+        self.assertIn("error", triage_log_file(self.analyzer, path, tail_bytes=100))
+        self.assertEqual(triage_log_file(self.analyzer, path, count_only=True)['errors_found'], len(self.all_errors))
+
+if __name__ == '__main__':
+    unittest.main()